@@ -0,0 +1,90 @@
+"""
+Benchmark of pending channel accumulations.
+
+Compares timeouts of :class:`ChannelsAccumulator` (one shared timer, see :class:`TimeoutQueue`)
+with a sleeping task per channel (how the timeouts were done before). For each count of pending accumulations
+reports memory held by the timeouts, time to start and to abort all of them
+and the loop overhead - average latency of `asyncio.sleep(0)` while they are pending.
+
+Usage:
+    python -m benchmarks.accumulation_timeouts [--counts 1000 10000 50000]
+"""
+import argparse
+import asyncio
+import tracemalloc
+from time import perf_counter
+from typing import Dict, Iterable
+
+from ttv.irc import TimeoutQueue
+
+TIMEOUT = 3600  # no timeout expires during the benchmark
+LOOP_ITERATIONS = 1000
+
+
+class TaskTimeouts:
+    """A timeout is a task sleeping until the deadline"""
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def add(self, key: str) -> None:
+        self._tasks[key] = asyncio.create_task(self._timeout())
+
+    def remove(self, key: str) -> None:
+        if (task := self._tasks.pop(key, None)) is not None:
+            task.cancel()
+
+    @staticmethod
+    async def _timeout() -> None:
+        await asyncio.sleep(TIMEOUT)
+
+
+async def measure_loop_overhead() -> float:
+    """Returns average microseconds of a loop iteration"""
+    start = perf_counter()
+    for _ in range(LOOP_ITERATIONS):
+        await asyncio.sleep(0)
+    return (perf_counter() - start) / LOOP_ITERATIONS * 1e6
+
+
+async def run(name: str, timeouts, count: int) -> None:
+    channels = [f'channel{number}' for number in range(count)]
+    # memory is measured apart, tracing slows down the rest
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for channel in channels:
+        timeouts.add(channel)
+    await asyncio.sleep(0)  # new tasks start sleeping
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for channel in channels:
+        timeouts.remove(channel)
+    await asyncio.sleep(0)
+
+    start = perf_counter()
+    for channel in channels:
+        timeouts.add(channel)
+    await asyncio.sleep(0)
+    added = perf_counter() - start
+    loop_overhead = await measure_loop_overhead()
+    start = perf_counter()
+    for channel in channels:
+        timeouts.remove(channel)
+    await asyncio.sleep(0)  # cancelled tasks finish
+    removed = perf_counter() - start
+    print(f'{name:<14} {count:>7,} pending {(after - before) / 2 ** 20:>8.2f} MiB {added * 1e3:>8.1f} ms to add '
+          f'{removed * 1e3:>8.1f} ms to abort {loop_overhead:>8.1f} us/loop iteration')
+
+
+async def main(counts: Iterable[int]) -> None:
+    for count in counts:
+        await run('tasks', TaskTimeouts(), count)
+        await run('TimeoutQueue', TimeoutQueue(TIMEOUT, lambda _: None), count)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1_000, 10_000, 50_000],
+                        help='counts of pending accumulations')
+    args = parser.parse_args()
+    asyncio.run(main(args.counts))
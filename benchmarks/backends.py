@@ -0,0 +1,97 @@
+"""
+Benchmark of the optional backends, see :mod:`ttv.backends`.
+
+Event loop: starts :class:`FakeIRCServer` in a separate process and measures how fast :class:`Client` parses
+and dispatches the streamed PRIVMSGs (by :class:`ChannelLanesDispatcher`) on the default asyncio loop and on uvloop.
+JSON: measures decoding of Helix pages (`--page` streams each, like `get_streams` yields them) by json and orjson.
+A backend that isn't installed is skipped.
+
+Usage:
+    python -m benchmarks.backends [--channels 4] [--messages 20000] [--pages 2000] [--page 100]
+"""
+import argparse
+import asyncio
+import multiprocessing
+from time import perf_counter, sleep
+from typing import List
+
+from benchmarks.fake_irc_server import run_server
+from benchmarks.ingestion_scaling import make_counting_client, measure, _free_port
+from ttv.backends import get_json_backend, install_event_loop_policy
+from ttv.irc import Client
+
+
+def helix_page(streams: int) -> str:
+    stream = {
+        'id': '40952121085', 'user_id': '101051819', 'user_login': 'afro', 'user_name': 'Afro',
+        'game_id': '32982', 'game_name': 'Grand Theft Auto V', 'type': 'live',
+        'title': 'Jacob - Paleto Bay Sheriff Deputy #nopixel', 'viewer_count': 1490,
+        'started_at': '2021-03-10T03:18:11Z', 'language': 'en',
+        'thumbnail_url': 'https://static-cdn.jtvnw.net/previews-ttv/live_user_afro-{width}x{height}.jpg',
+        'tag_ids': ['6ea6bca4-4712-4ab9-a906-e3336a9d8039'], 'tags': ['English', 'RolePlay'], 'is_mature': False
+    }
+    return get_json_backend('json').dumps({
+        'data': [dict(stream, id=str(index)) for index in range(streams)],
+        'pagination': {'cursor': 'eyJiIjp7IkN1cnNvciI6ImV5SnpJam8zT0RNMk5TNDBORFF4TlRjMU1UY3hOU3dpWkNJNlpt'}
+    })
+
+
+def bench_json(pages: int, page_size: int) -> None:
+    page = helix_page(page_size)
+    base_speed = None
+    for name in ('json', 'orjson'):
+        backend = get_json_backend(name)
+        if backend.name != name:
+            print(f'{name:<10} is not installed, skipped')
+            continue
+        start = perf_counter()
+        for _ in range(pages):
+            backend.loads(page)
+        speed = pages / (perf_counter() - start)
+        base_speed = base_speed or speed
+        print(f'{name:<10} {speed:>10,.0f} pages/sec ({len(page):,} symbols each)  x{speed / base_speed:.2f}')
+
+
+async def measure_client(uri: str, channels: List[str], total: int) -> float:
+    # the client is created in the running loop, uvloop's policy doesn't create a loop on demand
+    return await measure(make_counting_client(Client, uri, total), channels)
+
+
+def bench_event_loop(channels: int, messages: int) -> None:
+    port = _free_port()
+    uri = f'ws://localhost:{port}'
+    server_process = multiprocessing.get_context('spawn').Process(
+        target=run_server, kwargs={'port': port, 'messages': messages}, daemon=True
+    )
+    server_process.start()
+    logins = [f'channel{index}' for index in range(channels)]
+    try:
+        sleep(1)  # the server is starting
+        base_speed = None
+        for name in ('asyncio', 'uvloop'):
+            if install_event_loop_policy(name) != name:
+                print(f'{name:<10} is not installed, skipped')
+                continue
+            speed = asyncio.run(measure_client(uri, logins, channels * messages))
+            base_speed = base_speed or speed
+            print(f'{name:<10} {speed:>10,.0f} msgs/sec  x{speed / base_speed:.2f}')
+    finally:
+        install_event_loop_policy('asyncio')
+        server_process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', type=int, default=4, help='count of joined channels')
+    parser.add_argument('--messages', type=int, default=20_000, help='count of PRIVMSGs streamed into a channel')
+    parser.add_argument('--pages', type=int, default=2000, help='count of decoded Helix pages')
+    parser.add_argument('--page', type=int, default=100, help='count of streams in a Helix page')
+    args = parser.parse_args()
+    print('IRC parse/dispatch loop:')
+    bench_event_loop(args.channels, args.messages)
+    print('Helix pages decoding:')
+    bench_json(args.pages, args.page)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Local fake Twitch IRC server for benchmarks.
+
+Accepts websocket connections, answers CAP REQ, NICK and JOIN like Twitch does (an anon login gets no
+GLOBALUSERSTATE) and streams `--messages` PRIVMSGs into each joined channel right after the channel's
+ROOMSTATE and NAMES, `--frame` messages per websocket frame, as fast as the client reads them.
+With `--replay` sends frames of a recording (see :class:`FrameRecorder`) instead, see :class:`ReplayIRCServer`.
+
+Usage:
+    python -m benchmarks.fake_irc_server [--port 6667] [--messages 10000] [--frame 50]
+    python -m benchmarks.fake_irc_server --replay traffic.rec.gz [--speed 1]
+"""
+import argparse
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+import websockets
+
+from ttv.irc import read_frames
+from ttv.irc.line_filters import read_command
+
+PRIVMSG = (
+    '@badge-info=;badges=moderator/1,partner/1;color=#1E90FF;display-name={login};emotes=25:0-4,12-16/1902:6-10;'
+    'first-msg=0;flags=;id=885196de-cb67-427a-baa8-82f9b0fcd05f;mod=1;room-id=12345;subscriber=0;'
+    'tmi-sent-ts=1642715697000;turbo=0;user-id=12345;user-type=mod :{login}!{login}@{login}.tmi.twitch.tv '
+    'PRIVMSG #{channel} :Kappa Keepo Kappa'
+)
+
+
+class FakeIRCServer:
+    """
+    Fake Twitch IRC server, see the module's docstring
+
+    Args:
+        host: `str`
+            host to listen on. Default: localhost.
+        port: `int`
+            port to listen on, 0 - any free port. Default: 0.
+        messages: `int`
+            count of PRIVMSGs streamed into each joined channel. Default: 10000.
+        frame: `int`
+            count of messages in one websocket frame. Default: 50.
+
+    Examples:
+        >>> async with FakeIRCServer(messages=1000) as server:
+        >>>     client = TTVIRCClient('justinfan0', '', uri=server.uri)
+    """
+
+    def __init__(
+            self,
+            *,
+            host: str = 'localhost',
+            port: int = 0,
+            messages: int = 10_000,
+            frame: int = 50
+    ):
+        self.host: str = host
+        self.port: int = port
+        self.messages: int = messages
+        self.frame: int = frame
+        self._server: Optional[websockets.Server] = None
+
+    @property
+    def uri(self) -> str:
+        return f'ws://{self.host}:{self.port}'
+
+    async def start(self) -> None:
+        self._server = await websockets.serve(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> 'FakeIRCServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    async def _serve(self, ws) -> None:
+        login = 'justinfan0'
+        streams: List[asyncio.Task] = []
+        try:
+            async for frame in ws:
+                for line in frame.split('\r\n'):
+                    if line.startswith('CAP REQ'):
+                        await ws.send(f':tmi.twitch.tv CAP * ACK {line.split(" ", 2)[2]}\r\n')
+                    elif line.startswith('NICK'):
+                        login = line.split(' ', 1)[1]
+                        await ws.send(self._welcome(login))
+                    elif line.startswith('JOIN'):
+                        for channel in line.split(' ', 1)[1].split(','):
+                            channel = channel.removeprefix('#')
+                            await ws.send(self._join(login, channel))
+                            streams.append(asyncio.create_task(self._stream(ws, channel)))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for stream in streams:
+                stream.cancel()
+
+    @staticmethod
+    def _welcome(login: str) -> str:
+        lines = [f':tmi.twitch.tv 00{number} {login} :Welcome, GLHF!' for number in range(1, 5)]
+        lines += [f':tmi.twitch.tv 375 {login} :-', f':tmi.twitch.tv 372 {login} :You are in a maze',
+                  f':tmi.twitch.tv 376 {login} :>']
+        if not login.startswith('justinfan'):
+            lines.append(
+                f'@badge-info=;badges=;color=;display-name={login};emote-sets=0;user-id=12345;user-type= '
+                f':tmi.twitch.tv GLOBALUSERSTATE'
+            )
+        return '\r\n'.join(lines) + '\r\n'
+
+    @staticmethod
+    def _join(login: str, channel: str) -> str:
+        lines = (
+            f':{login}!{login}@{login}.tmi.twitch.tv JOIN #{channel}',
+            f'@emote-only=0;followers-only=-1;r9k=0;rituals=0;room-id=12345;slow=0;subs-only=0 '
+            f':tmi.twitch.tv ROOMSTATE #{channel}',
+            f':{login}.tmi.twitch.tv 353 {login} = #{channel} :{login}',
+            f':{login}.tmi.twitch.tv 366 {login} #{channel} :End of /NAMES list',
+        )
+        return '\r\n'.join(lines) + '\r\n'
+
+    async def _stream(self, ws, channel: str) -> None:
+        # frames are built once, so the server isn't the bottleneck
+        full_frame = ''.join(PRIVMSG.format(login='username', channel=channel) + '\r\n' for _ in range(self.frame))
+        for sent in range(0, self.messages, self.frame):
+            count = min(self.frame, self.messages - sent)
+            await ws.send(full_frame if count == self.frame else full_frame[:full_frame.index('\r\n') + 2] * count)
+
+
+class ReplayIRCServer(FakeIRCServer):
+    """
+    :class:`FakeIRCServer` that replays a recording written by :class:`FrameRecorder`.
+
+    Joins are answered the same way. Once a connection has joined all the channels of the recording,
+    all the recorded frames are sent into it at the recorded pace multiplied by `speed`,
+    or as fast as the client reads them if `speed` is None.
+
+    Args:
+        path: `str`
+            path of the recording
+        speed: Optional[`float`]
+            1 - real time, 2 - twice as fast and so on. Default: None (max speed).
+        host: `str`
+            host to listen on. Default: localhost.
+        port: `int`
+            port to listen on, 0 - any free port. Default: 0.
+
+    Examples:
+        >>> async with ReplayIRCServer('traffic.rec.gz', speed=1) as server:
+        >>>     client = TTVIRCClient('justinfan0', '', uri=server.uri)
+        >>>     await client.join_channels(*server.channels)
+    """
+
+    def __init__(
+            self,
+            path: str,
+            *,
+            speed: Optional[float] = None,
+            host: str = 'localhost',
+            port: int = 0
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError(f'speed must be positive, got {speed}')
+        super().__init__(host=host, port=port, messages=0)
+        self.speed: Optional[float] = speed
+        self.frames: List[Tuple[float, str]] = list(read_frames(path))  # reading mustn't slow down replaying
+        self.channels: Set[str] = recorded_channels(self.frames)
+        self._joined: Dict[object, Set[str]] = {}  # channels joined by each connection
+
+    async def _stream(self, ws, channel: str) -> None:
+        joined = self._joined.setdefault(ws, set())
+        if self.channels <= joined:  # is being replayed already
+            return
+        joined.add(channel)
+        if self.channels <= joined:
+            try:
+                await self._replay(ws)
+            finally:
+                del self._joined[ws]
+
+    async def _replay(self, ws) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        for offset, frame in self.frames:
+            if self.speed is not None and (delay := started_at + offset / self.speed - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            await ws.send(frame)
+
+
+def recorded_channels(frames: List[Tuple[float, str]]) -> Set[str]:
+    """Returns logins of channels messages of the recorded frames come from"""
+    channels = set()
+    for _, frame in frames:
+        for line in frame.split('\r\n'):
+            _, tags_end = read_command(line)  # tags may contain ' #', e.g. in system-msg
+            params_end = line.find(' :', tags_end + 1)  # the trailing may contain ' #' too
+            if (start := line.find(' #', tags_end, params_end if params_end != -1 else len(line))) != -1:
+                end = line.find(' ', start + 2)
+                channels.add(line[start + 2:end if end != -1 else len(line)])
+    return channels
+
+
+async def serve_forever(server: FakeIRCServer) -> None:
+    async with server:
+        print(f'Serving on {server.uri}')
+        await asyncio.Future()
+
+
+def positive_float(value: str) -> float:
+    """argparse type of `--speed`"""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'must be positive, got {value}')
+    return number
+
+
+def run_server(replay: Optional[str] = None, **kwargs) -> None:
+    """
+    Runs :class:`FakeIRCServer` with given kwargs until the process is killed, e.g. in a separate process.
+    If `replay` is the path of a recording, runs :class:`ReplayIRCServer` of the recording.
+    """
+    server = FakeIRCServer(**kwargs) if replay is None else ReplayIRCServer(replay, **kwargs)
+    try:
+        asyncio.run(serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=6667, help='port to listen on')
+    parser.add_argument('--messages', type=int, default=10_000, help='count of PRIVMSGs streamed into a channel')
+    parser.add_argument('--frame', type=int, default=50, help='count of messages in a frame')
+    parser.add_argument('--replay', help='path of a recording to replay')
+    parser.add_argument('--speed', type=positive_float, help='pace of the replay, 1 - real time. Default: max speed')
+    args = parser.parse_args()
+    if args.replay is None:
+        run_server(port=args.port, messages=args.messages, frame=args.frame)
+    else:
+        run_server(args.replay, port=args.port, speed=args.speed)
+
+
+if __name__ == '__main__':
+    main()
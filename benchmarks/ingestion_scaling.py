@@ -0,0 +1,91 @@
+"""
+Benchmark of chat ingestion throughput by the count of worker processes.
+
+Starts :class:`FakeIRCServer` in a separate process, joins `--channels` channels and measures how fast
+all the streamed PRIVMSGs reach `on_message`: by :class:`Client` (in one process) and by :class:`MultiProcessClient`
+with each of `--processes` worker counts. Messages are dispatched by :class:`ChannelLanesDispatcher`.
+Worker processes take CPU cores of their own, the speed can't grow beyond the count of available cores.
+
+Usage:
+    python -m benchmarks.ingestion_scaling [--channels 8] [--messages 20000] [--processes 1 2 4]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+from time import perf_counter, sleep
+from typing import List, Optional
+
+from benchmarks.fake_irc_server import run_server
+from ttv.irc import Client, MultiProcessClient, ChannelLanesDispatcher, ChannelMessage
+
+
+def make_counting_client(base: type, uri: str, total: int, **kwargs) -> Client:
+    class CountingClient(base):
+        def __init__(self):
+            super().__init__('', 'justinfan12345', dispatcher=ChannelLanesDispatcher(), **kwargs)
+            self.count = 0
+            self.started_at = 0.0
+            self.done = asyncio.Event()
+
+        def _create_irc_conn(self, login: str, token: str, **conn_kwargs):
+            return super()._create_irc_conn(login, token, uri=uri, **conn_kwargs)
+
+        async def on_message(self, message: ChannelMessage):
+            self.count += 1
+            if self.count == 1:
+                self.started_at = perf_counter()
+            elif self.count == total:
+                self.done.set()
+
+    return CountingClient()
+
+
+async def measure(client: Client, channels: List[str]) -> float:
+    """Returns messages/sec from the first handled message to the last one, starting of workers isn't counted"""
+    running = asyncio.create_task(client.start(channels))
+    await client.done.wait()
+    speed = (client.count - 1) / (perf_counter() - client.started_at)
+    await client.stop()
+    running.cancel()
+    return speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', type=int, default=8, help='count of joined channels')
+    parser.add_argument('--messages', type=int, default=20_000, help='count of PRIVMSGs streamed into a channel')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4], help='counts of worker processes')
+    args = parser.parse_args()
+
+    port = _free_port()
+    uri = f'ws://localhost:{port}'
+    server_process = multiprocessing.get_context('spawn').Process(
+        target=run_server, kwargs={'port': port, 'messages': args.messages}, daemon=True
+    )
+    server_process.start()
+    channels = [f'channel{index}' for index in range(args.channels)]
+    total = args.channels * args.messages
+    try:
+        modes = [('Client', Client, {})] + [
+            (f'MultiProcessClient x{processes}', MultiProcessClient, {'processes': processes})
+            for processes in args.processes
+        ]
+        sleep(1)  # the server is starting
+        base_speed: Optional[float] = None
+        for name, base, kwargs in modes:
+            speed = asyncio.run(measure(make_counting_client(base, uri, total, **kwargs), channels))
+            base_speed = base_speed or speed
+            print(f'{name:<30} {speed:>12,.0f} msgs/sec  x{speed / base_speed:.2f}')
+    finally:
+        server_process.kill()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Memory benchmark of objects created for a chat line.
+
+Reports bytes per message held in memory for a PRIVMSG with full tags (including the raw line):
+the parsed message alone and the whole :class:`ChannelMessage` (message, author, parsed badges, emotes and flags).
+
+Usage:
+    python -m benchmarks.irc_memory [--messages 20000]
+    TTV_USE_SLOTS=1 python -m benchmarks.irc_memory  # the objects declare `__slots__`
+"""
+import argparse
+import tracemalloc
+from typing import Callable, Type
+
+from ttv.irc import Channel, ChannelMessage, ChannelUser, LocalState
+from ttv.irc import TwitchIRCMsg, FastTwitchIRCMsg, LazyTwitchIRCMsg
+from ttv.utils import USE_SLOTS
+
+RAW_PRIVMSG = (
+    '@badge-info=subscriber/14;badges=subscriber/12,premium/1;client-nonce=3f58e4f3107d580b8a29626738823a5c;'
+    'color=#FF69B4;display-name=fernandx_z;emotes=25:0-4,12-16/1902:6-10;first-msg=0;flags=18-23:P.3;'
+    'id=aa3b5987-1929-414c-bc55-10f9e6c1723e;mod=0;reply-parent-display-name=MaYidRaMaS;'
+    'reply-parent-msg-body=axozerTem\\sato\\saxozerPium\\saxozerPium_HF;'
+    'reply-parent-msg-id=2f06b2b8-d33d-4e65-a0c4-82d1894c7b63;reply-parent-user-id=612074199;'
+    'reply-parent-user-login=mayidramas;returning-chatter=0;room-id=133528221;subscriber=1;'
+    'tmi-sent-ts=1622471612333;turbo=0;user-id=602696060;user-type= '
+    ':fernandx_z!fernandx_z@fernandx_z.tmi.twitch.tv PRIVMSG #axozer :Kappa Keepo Kappa shit happens'
+)
+CHANNEL = Channel(
+    TwitchIRCMsg('@room-id=133528221 ROOMSTATE #axozer'),
+    LocalState(TwitchIRCMsg.create_empty()),
+    (), (), (), (), None
+)
+
+
+def measure(create: Callable[[], object], count: int) -> float:
+    """Returns count of bytes allocated and held per one created object"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [create() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def receive_raw_privmsg() -> str:
+    """Returns a new copy of the raw line as if it's received from the socket"""
+    return RAW_PRIVMSG[:-1] + RAW_PRIVMSG[-1]
+
+
+def create_channel_message(irc_msg_class: Type[TwitchIRCMsg]) -> ChannelMessage:
+    irc_msg = irc_msg_class(receive_raw_privmsg())
+    author = ChannelUser(irc_msg, CHANNEL, None)
+    message = ChannelMessage(irc_msg, CHANNEL, author)
+    # cached parts a handler usually reads
+    author.badges, message.emotes, message.flags  # noqa
+    return message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=20_000, help='count of messages to hold')
+    args = parser.parse_args()
+
+    print(f'raw line: {len(RAW_PRIVMSG)} symbols, slots: {USE_SLOTS}')
+    for irc_msg_class in (TwitchIRCMsg, FastTwitchIRCMsg, LazyTwitchIRCMsg):
+        name = irc_msg_class.__name__
+        irc_msg_size = measure(lambda: irc_msg_class(receive_raw_privmsg()), args.messages)
+        message_size = measure(lambda: create_channel_message(irc_msg_class), args.messages)
+        print(f'{name:<20} {irc_msg_size:>8,.0f} bytes/irc_msg {message_size:>8,.0f} bytes/ChannelMessage')
+
+
+if __name__ == '__main__':
+    main()
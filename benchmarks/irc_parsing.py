@@ -0,0 +1,72 @@
+"""
+Microbenchmark of IRC message parsing backends.
+
+Reports parsed lines per second for each of :class:`TwitchIRCMsg`, :class:`FastTwitchIRCMsg`
+and :class:`LazyTwitchIRCMsg` (only `command` and `channel` are read from the lazy one).
+
+Usage:
+    python -m benchmarks.irc_parsing [--lines 100000] [--rounds 5]
+"""
+import argparse
+from time import perf_counter
+from typing import Callable, List
+
+from ttv.irc import TwitchIRCMsg, FastTwitchIRCMsg, LazyTwitchIRCMsg
+
+RAW_IRC_MSGS = (
+    '@badge-info=subscriber/1;badges=subscriber/0;client-nonce=3f58e4f3107d580b8a29626738823a5c;color=#FF69B4;'
+    'display-name=fernandx_z;emotes=;flags=;id=aa3b5987-1929-414c-bc55-10f9e6c1723e;mod=0;'
+    'reply-parent-display-name=MaYidRaMaS;reply-parent-msg-body=axozerTem\\sato\\saxozerPium\\saxozerPium_HF;'
+    'reply-parent-msg-id=2f06b2b8-d33d-4e65-a0c4-82d1894c7b63;reply-parent-user-id=612074199;'
+    'reply-parent-user-login=mayidramas;room-id=133528221;subscriber=1;tmi-sent-ts=1622471612333;turbo=0;'
+    'user-id=602696060;user-type= :fernandx_z!fernandx_z@fernandx_z.tmi.twitch.tv PRIVMSG #axozer '
+    ':@MaYidRaMaS PERO JAJSJAJSJASJASJA',
+    '@badge-info=;badges=moderator/1,partner/1;color=#1E90FF;display-name=Target;emotes=25:0-4,12-16/1902:6-10;'
+    'first-msg=0;flags=;id=885196de-cb67-427a-baa8-82f9b0fcd05f;mod=1;room-id=12345;subscriber=0;'
+    'tmi-sent-ts=1642715697000;turbo=0;user-id=12345;user-type=mod :target!target@target.tmi.twitch.tv '
+    'PRIVMSG #target :Kappa Keepo Kappa',
+    '@emote-only=0;followers-only=-1;r9k=0;rituals=0;room-id=12345;slow=0;subs-only=0 :tmi.twitch.tv ROOMSTATE #target',
+    '@ban-duration=600;room-id=12345;target-user-id=012345;tmi-sent-ts=1629011347771 :tmi.twitch.tv '
+    'CLEARCHAT #target :username',
+    ':username!username@username.tmi.twitch.tv JOIN #target',
+    ':target.tmi.twitch.tv 353 target = #target :username1 username2 username3 username4 username5',
+)
+
+
+def read_lazy(raw_irc_msg: str):
+    irc_msg = LazyTwitchIRCMsg(raw_irc_msg)
+    return irc_msg.command, irc_msg.channel
+
+
+def bench(parse: Callable[[str], object], raw_irc_msgs: List[str], rounds: int) -> float:
+    """Returns the best speed (lines/sec) among `rounds` rounds"""
+    best_time = float('inf')
+    for _ in range(rounds):
+        start = perf_counter()
+        for raw_irc_msg in raw_irc_msgs:
+            parse(raw_irc_msg)
+        best_time = min(best_time, perf_counter() - start)
+    return len(raw_irc_msgs) / best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=100_000, help='count of lines to parse in a round')
+    parser.add_argument('--rounds', type=int, default=5, help='count of rounds, the best one is reported')
+    args = parser.parse_args()
+
+    raw_irc_msgs = [RAW_IRC_MSGS[index % len(RAW_IRC_MSGS)] for index in range(args.lines)]
+    backends = (
+        ('TwitchIRCMsg', TwitchIRCMsg),
+        ('FastTwitchIRCMsg', FastTwitchIRCMsg),
+        ('LazyTwitchIRCMsg (command, channel)', read_lazy),
+    )
+    base_speed = None
+    for name, parse in backends:
+        speed = bench(parse, raw_irc_msgs, args.rounds)
+        base_speed = base_speed or speed
+        print(f'{name:<40} {speed:>12,.0f} lines/sec  x{speed / base_speed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
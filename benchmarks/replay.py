@@ -0,0 +1,180 @@
+"""
+Record and replay of raw IRC traffic.
+
+record:
+    joins channels anonymously and writes received frames by :class:`FrameRecorder` for `--duration` seconds
+synthesize:
+    writes a recording of `--messages` PRIVMSGs spread across `--channels` channels at `--rate` messages/sec,
+    for runs without access to real traffic
+bench:
+    replays the recording by :class:`ReplayIRCServer` in a separate process into the full :class:`Client`
+    pipeline (parsing, accumulation of channels, dispatching, `on_message`), reports handled messages/sec,
+    p50/p99 of time from receiving of a message to its handling and peak memory of the process
+
+Usage:
+    python -m benchmarks.replay record traffic.rec.gz --channels xqc shroud [--duration 60]
+    python -m benchmarks.replay synthesize traffic.rec.gz [--channels 20] [--messages 100000] [--rate 5000]
+    python -m benchmarks.replay bench traffic.rec.gz [--speed 1] [--dispatcher task|batch|lanes]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import socket
+from time import perf_counter, sleep, monotonic
+from typing import List, Optional
+
+from benchmarks.fake_irc_server import PRIVMSG, run_server, recorded_channels, positive_float
+from benchmarks.ingestion_scaling import _free_port
+from ttv.irc import Client, TTVIRCClient, FrameRecorder, Metrics, Histogram, RateLimits, read_frames, \
+    TaskDispatcher, BatchDispatcher, ChannelLanesDispatcher
+from ttv.irc.line_filters import read_command
+
+DISPATCHERS = {'task': TaskDispatcher, 'batch': BatchDispatcher, 'lanes': ChannelLanesDispatcher}
+# from 1us to ~17s, each bucket is 10% wider than the previous one
+LATENCY_BUCKETS = tuple(0.000001 * 1.1 ** power for power in range(175))
+IDLE_TIMEOUT = 5  # seconds without handled messages the replay is considered finished after
+
+
+async def record(path: str, channels: List[str], duration: float) -> None:
+    irc_conn = TTVIRCClient('justinfan12345', '', keep_alive=False)
+    await irc_conn.connect()
+    with FrameRecorder(path) as recorder:
+        irc_conn.set_recorder(recorder)
+        await irc_conn.join_channels(*channels)
+        try:
+            await asyncio.wait_for(_drain(irc_conn), duration)
+        except asyncio.TimeoutError:
+            pass
+        await irc_conn.stop()
+    print(f'Recorded {recorder.frames:,} frames into {path}')
+
+
+async def _drain(irc_conn: TTVIRCClient) -> None:
+    async for _ in irc_conn.iter_batches():
+        pass
+
+
+def synthesize(path: str, channels: int, messages: int, rate: float, frame: int) -> None:
+    logins = [f'channel{index}' for index in range(channels)]
+    started_at = monotonic()
+    with FrameRecorder(path) as recorder:
+        for sent in range(0, messages, frame):
+            channel = logins[sent // frame % channels]
+            lines = [
+                PRIVMSG.format(login=f'user{(sent + index) % 1000}', channel=channel)
+                for index in range(min(frame, messages - sent))
+            ]
+            recorder.record('\r\n'.join(lines) + '\r\n', started_at + sent / rate)
+    print(f'Synthesized {messages:,} messages in {recorder.frames:,} frames into {path}')
+
+
+def percentile(histogram: Histogram, fraction: float) -> float:
+    """Returns the upper bound of the bucket the percentile falls into"""
+    rank = fraction * histogram.count
+    cumulative = 0
+    for upper_bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        if cumulative >= rank:
+            return upper_bound
+    return float('inf')
+
+
+class ReplayedClient(Client):
+    def __init__(self, uri: str, **kwargs):
+        self._uri = uri
+        super().__init__('', 'justinfan12345', rate_limits=RateLimits.verified(), **kwargs)
+        self.count = 0
+        self.started_at = 0.0
+        self.last_at = 0.0
+
+    def _create_irc_conn(self, login: str, token: str, **conn_kwargs):
+        return super()._create_irc_conn(login, token, uri=self._uri, **conn_kwargs)
+
+    async def on_message(self, message):
+        self.last_at = perf_counter()
+        self.count += 1
+        if self.count == 1:
+            self.started_at = self.last_at
+
+
+async def measure(uri: str, channels: List[str], total: int, dispatcher: str) -> None:
+    metrics = Metrics(buckets=LATENCY_BUCKETS)
+    client = ReplayedClient(uri, dispatcher=DISPATCHERS[dispatcher](), metrics=metrics)
+    running = asyncio.create_task(client.start(channels))
+    last_count = -1
+    while client.count < total and client.count != last_count:
+        last_count = client.count
+        await asyncio.sleep(IDLE_TIMEOUT if client.count else IDLE_TIMEOUT * 6)  # joining takes a while
+    await client.stop()
+    running.cancel()
+    if client.count < 2:
+        print(f'Handled {client.count} messages, nothing to measure')
+        return
+    latency = metrics.get(Metrics.DISPATCH_SECONDS)
+    print(f'{client.count:,}/{total:,} messages handled')
+    print(f'{(client.count - 1) / (client.last_at - client.started_at):>12,.0f} msgs/sec')
+    print(f'{percentile(latency, 0.5) * 1e3:>12.3f} ms p50 dispatch latency')
+    print(f'{percentile(latency, 0.99) * 1e3:>12.3f} ms p99 dispatch latency')
+    print(f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>12.1f} MiB peak memory (RSS)')
+
+
+def bench(path: str, speed: Optional[float], dispatcher: str) -> None:
+    frames = list(read_frames(path))
+    channels = sorted(recorded_channels(frames))
+    total = sum(
+        1 for _, frame in frames for line in frame.split('\r\n') if line and read_command(line)[0] == 'PRIVMSG'
+    )
+    port = _free_port()
+    server_process = multiprocessing.get_context('spawn').Process(
+        target=run_server, kwargs={'replay': path, 'port': port, 'speed': speed}, daemon=True
+    )
+    server_process.start()
+    try:
+        _wait_listening(port)  # the server is loading the recording
+        print(f'Replaying {len(frames):,} frames of {len(channels)} channels, dispatcher: {dispatcher}')
+        asyncio.run(measure(f'ws://localhost:{port}', channels, total, dispatcher))
+    finally:
+        server_process.kill()
+
+
+def _wait_listening(port: int, timeout: float = 60) -> None:
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(('localhost', port)).close()
+            return
+        except ConnectionRefusedError:
+            if monotonic() > deadline:
+                raise
+            sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    record_parser = commands.add_parser('record', help='record live traffic')
+    record_parser.add_argument('path', help='path of the recording')
+    record_parser.add_argument('--channels', nargs='+', required=True, help='logins of channels to join')
+    record_parser.add_argument('--duration', type=float, default=60, help='seconds to record')
+    synthesize_parser = commands.add_parser('synthesize', help='write a synthetic recording')
+    synthesize_parser.add_argument('path', help='path of the recording')
+    synthesize_parser.add_argument('--channels', type=int, default=20, help='count of channels')
+    synthesize_parser.add_argument('--messages', type=int, default=100_000, help='count of PRIVMSGs')
+    synthesize_parser.add_argument('--rate', type=float, default=5000, help='messages/sec of the recording')
+    synthesize_parser.add_argument('--frame', type=int, default=20, help='count of messages in a frame')
+    bench_parser = commands.add_parser('bench', help='replay a recording into Client')
+    bench_parser.add_argument('path', help='path of the recording')
+    bench_parser.add_argument('--speed', type=positive_float, help='pace of the replay, 1 - real time. Default: max speed')
+    bench_parser.add_argument('--dispatcher', choices=DISPATCHERS, default='task', help='dispatcher of Client')
+    args = parser.parse_args()
+    if args.command == 'record':
+        asyncio.run(record(args.path, args.channels, args.duration))
+    elif args.command == 'synthesize':
+        synthesize(args.path, args.channels, args.messages, args.rate, args.frame)
+    else:
+        bench(args.path, args.speed, args.dispatcher)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+import asyncio
+from time import monotonic
+
+import aiohttp
+import pytest
+
+from ttv.api import Api
+from ttv.api.cache import ResponseCache
+from ttv.api.exceptions import HTTPError
+from ttv.api.rate_limits import RequestScheduler
+from ttv.api.session import SessionOptions
+
+
+class FakeApi(Api):
+    """Answers requests of paginated pages of `page` items each, keeps the log of requests and handled items"""
+    def __init__(self, pages: int, page: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = pages
+        self.page = page
+        self.log = []
+
+    async def _http_get(self, url: str, data: dict = None, params: dict = None):
+        number = int(params.get('after', 0))
+        self.log.append(('request', number))
+        await asyncio.sleep(0.01)
+        json = {'data': [{'id': number * self.page + index} for index in range(self.page)], 'pagination': {}}
+        if number + 1 < self.pages:
+            json['pagination']['cursor'] = str(number + 1)
+        return json
+
+
+class LookupApi(Api):
+    """Answers lookups of users by ids, ids starting with 'bad' are invalid, keeps the log of requested ids"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.log = []
+        self.status = None  # of the error all requests fail with
+
+    async def _http_get(self, url: str, data: dict = None, params: dict = None):
+        ids = params['id'] if isinstance(params['id'], list) else [params['id']]
+        self.log.append(ids)
+        await asyncio.sleep(0.01)
+        if self.status is not None:
+            raise HTTPError({'status': self.status})
+        if len(ids) > 100 or any(user_id.startswith('bad') for user_id in ids):
+            raise HTTPError({'status': 400})
+        return {'data': [{'id': user_id} for user_id in ids if not user_id.startswith('missing')]}
+
+
+async def consume(api: FakeApi, limit: int, **kwargs):
+    items = []
+    async for stream in api.get_streams(limit, **kwargs):
+        api.log.append(('item', stream['id']))
+        items.append(stream['id'])
+        await asyncio.sleep(0.001)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_pagination():
+    api = FakeApi(pages=3)
+    assert await consume(api, 0) == list(range(9))
+    assert api.log.index(('request', 1)) > api.log.index(('item', 2))  # the page is requested after the items
+    assert await consume(FakeApi(pages=3), 4) == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_pagination_prefetch():
+    api = FakeApi(pages=3, prefetch=2)
+    assert await consume(api, 0) == list(range(9))
+    assert api.log.index(('request', 1)) < api.log.index(('item', 1))  # is requested while the items are handled
+    # requesting stops at the limit
+    api = FakeApi(pages=10, prefetch=4)
+    assert await consume(api, 4) == [0, 1, 2, 3]
+    assert [entry for entry in api.log if entry[0] == 'request'] == [('request', 0), ('request', 1)]
+    # a single request's depth, the prefetched items are limited
+    api = FakeApi(pages=10, page=3, max_prefetched_items=3)
+    generator = api.get_streams(0, prefetch=8)
+    assert (await generator.__anext__())['id'] == 0
+    await asyncio.sleep(0.1)
+    assert len([entry for entry in api.log if entry[0] == 'request']) == 2  # the current page and 3 items ahead
+    await generator.aclose()
+
+
+async def get_user_ids(api: Api, user_id):
+    return [user['id'] async for user in api.get_users(0, user_id=user_id)]
+
+
+@pytest.mark.asyncio
+async def test_lookups_batching():
+    api = LookupApi(batch_window=0.01)
+    ids = [str(index) for index in range(150)] + ['120', 'missing']
+    results = await asyncio.gather(*(get_user_ids(api, user_id) for user_id in ids))
+    assert results == [[user_id] for user_id in ids[:-1]] + [[]]
+    assert [len(ids) for ids in api.log] == [100, 51]  # the same id is requested once
+    # an invalid id fails only its own lookup
+    api.log.clear()
+    results = await asyncio.gather(*(get_user_ids(api, user_id) for user_id in ('1', 'bad', '2', '3')),
+                                   return_exceptions=True)
+    assert results[0] == ['1'] and results[2:] == [['2'], ['3']] and isinstance(results[1], HTTPError)
+    assert api.log[0] == ['1', 'bad', '2', '3']
+    # other errors fail the whole batch at once
+    api.log.clear()
+    api.status = 401
+    results = await asyncio.gather(*(get_user_ids(api, str(index)) for index in range(100)), return_exceptions=True)
+    assert all(isinstance(result, HTTPError) for result in results)
+    assert len(api.log) == 1
+    # without the window each lookup is requested on its own
+    api = LookupApi()
+    await asyncio.gather(*(get_user_ids(api, user_id) for user_id in ('1', '2')))
+    assert api.log == [['1'], ['2']]
+
+
+@pytest.mark.asyncio
+async def test_lookups_chunking():
+    api = LookupApi()
+    ids = [str(index) for index in range(250)]
+    assert await get_user_ids(api, iter(ids)) == ids
+    assert [len(ids) for ids in api.log] == [100, 100, 50]
+    assert await get_user_ids(api, ids[:3]) == ids[:3]
+    assert api.log[-1] == ids[:3]
+
+
+class FakeHelix:
+    """Answers requests within a bucket of `limit` points per minute that has `points` points at start"""
+    def __init__(self, limit: int, points: int):
+        self.limit = limit
+        self.points = points
+        self.updated_at = monotonic()
+        self.log = []
+
+    def send(self, name: str, statuses=()):
+        statuses = list(statuses)
+
+        async def send():
+            now = monotonic()
+            self.points = min(self.limit, self.points + (now - self.updated_at) * self.limit / 60)
+            self.updated_at = now
+            if self.points < 1:
+                status = 429
+            else:
+                self.points -= 1
+                status = statuses.pop(0) if statuses else 200
+            self.log.append((name, status))
+            headers = {'Ratelimit-Limit': str(self.limit), 'Ratelimit-Remaining': str(int(self.points)),
+                       'Ratelimit-Reset': '0'}
+            await asyncio.sleep(0.005)
+            return status, headers, {'data': [name]}
+        return send
+
+
+@pytest.mark.asyncio
+async def test_scheduler_pacing():
+    helix = FakeHelix(limit=6000, points=5)  # 100 requests per second
+    scheduler = RequestScheduler()
+    started_at = monotonic()
+    responses = await asyncio.gather(*(scheduler.request('token', helix.send(str(index))) for index in range(30)))
+    assert [json['data'] for _, _, json in responses] == [[str(index)] for index in range(30)]
+    assert all(status == 200 for _, status in helix.log) and scheduler.retries == 0  # never hits 429
+    assert monotonic() - started_at >= 0.2  # 25 requests are paced by refilled points
+    assert scheduler.get_bucket('token').limit == 6000 and scheduler.get_bucket('other') is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_retries():
+    helix = FakeHelix(limit=6000, points=100)
+    scheduler = RequestScheduler(base_backoff=0.01)
+    status, _, _ = await scheduler.request('token', helix.send('flaky', statuses=(503, 500)))
+    assert status == 200 and scheduler.retries == 2
+    assert helix.log == [('flaky', 503), ('flaky', 500), ('flaky', 200)]
+    scheduler = RequestScheduler(max_retries=1, base_backoff=0.01)
+    status, _, _ = await scheduler.request('token', helix.send('broken', statuses=(502, 502)))
+    assert status == 502  # the last response is returned
+
+
+@pytest.mark.asyncio
+async def test_scheduler_transport_errors():
+    helix = FakeHelix(limit=6000, points=100)
+    scheduler = RequestScheduler()
+
+    async def fail():
+        await asyncio.sleep(0.005)
+        raise aiohttp.ClientConnectionError('no connection')
+
+    failed = asyncio.create_task(scheduler.request('token', fail))
+    waiting = asyncio.create_task(scheduler.request('token', helix.send('next')))
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await failed
+    bucket = scheduler.get_bucket('token')
+    assert not bucket.known and bucket.in_flight <= 1  # the next request is sent alone, the limit isn't known yet
+    await waiting
+    assert bucket.known and bucket.limit == 6000 and bucket.in_flight == 0
+
+
+def test_default_scheduler_per_loop():
+    api = Api()
+
+    async def get_scheduler():
+        assert api._get_scheduler() is api.with_priority(RequestScheduler.HIGH)._get_scheduler()
+        return api._get_scheduler()
+
+    first, second = asyncio.run(get_scheduler()), asyncio.run(get_scheduler())
+    assert first is not second
+    scheduler = RequestScheduler()
+    api = Api(scheduler=scheduler)
+    assert api._get_scheduler() is scheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_priority():
+    helix = FakeHelix(limit=6000, points=1)
+    scheduler = RequestScheduler()
+    await scheduler.request('token', helix.send('first'))  # the bucket is empty now
+    crawl = [asyncio.create_task(scheduler.request('token', helix.send(f'crawl{index}'), scheduler.LOW))
+             for index in range(5)]
+    await asyncio.sleep(0.015)
+    await scheduler.request('token', helix.send('moderation'), scheduler.HIGH)
+    await asyncio.gather(*crawl)
+    names = [name for name, _ in helix.log]
+    assert names.index('moderation') < 4
+    assert all(status == 200 for _, status in helix.log)
+
+
+@pytest.mark.asyncio
+async def test_sessions():
+    async with Api(session_options=SessionOptions(limit=5, limit_per_host=2, total_timeout=3)) as api:
+        session = api._get_open_session()
+        assert session.connector.limit == 5 and session.connector.limit_per_host == 2
+        assert session.timeout.total == 3
+        other_api = Api()
+        assert other_api._get_open_session() is not session  # each object has its own session
+        await other_api.close()
+        moderation_api = api.with_priority(RequestScheduler.HIGH)
+        assert moderation_api._get_open_session() is session
+        await moderation_api.close()
+        assert not session.closed
+    assert session.closed
+    # the session of the factory
+    sessions = []
+
+    def factory():
+        sessions.append(aiohttp.ClientSession())
+        return sessions[-1]
+
+    api = Api(session_factory=factory)
+    assert api._get_open_session() is api._get_open_session() is sessions[0]
+    await api.close()
+    assert sessions[0].closed
+    assert api._get_open_session() is sessions[1]  # a new one is opened after closing
+    await api.close()
+
+
+class ChannelsApi(Api):
+    """Answers get_channel_information by the current titles of channels, keeps the log of requests"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.titles = {}
+        self.log = []
+
+    async def _http_request(self, method: str, url: str, **kwargs):
+        params = kwargs['params']
+        if method == 'PATCH':
+            self.titles[params['broadcaster_id']] = kwargs['json']['title']
+            return None
+        ids = params['broadcaster_id'] if isinstance(params['broadcaster_id'], list) else [params['broadcaster_id']]
+        self.log.append(ids)
+        await asyncio.sleep(0.01)
+        return {'data': [{'broadcaster_id': user_id, 'title': self.titles.get(user_id, '')} for user_id in ids]}
+
+
+async def get_titles(api: Api, broadcaster_id):
+    return [channel['title'] async for channel in api.get_channel_information(0, broadcaster_id)]
+
+
+@pytest.mark.asyncio
+async def test_cache():
+    cache = ResponseCache({'get_channel_information': 0.2})
+    api = ChannelsApi(cache=cache)
+    api.titles = {'1': 'one', '2': 'two'}
+    # a thundering herd makes one request
+    assert await asyncio.gather(*(get_titles(api, '1') for _ in range(10))) == [['one']] * 10
+    assert await get_titles(api, '1') == ['one']
+    assert api.log == [['1']]
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+    # iterables are cached by their values
+    assert await get_titles(api, '2') == ['two']
+    assert await get_titles(api, iter(['1', '2'])) == await get_titles(api, ['1', '2']) == ['one', 'two']
+    assert api.log[1:] == [['2'], ['1', '2']]
+    # results of the channel are invalidated by its modification
+    await api.modify_channel_information('1', title='new one')
+    assert await get_titles(api, ['1', '2']) == ['new one', 'two']
+    assert await get_titles(api, '2') == ['two'] and len(api.log) == 4  # is kept yet
+    # ttl
+    await asyncio.sleep(0.2)
+    assert await get_titles(api, '2') == ['two'] and len(api.log) == 5
+    assert cache.invalidate('get_channel_information', broadcaster_id='2') == 2  # alone and with '1'
+
+
+@pytest.mark.asyncio
+async def test_cache_eviction():
+    cache = ResponseCache({'get_channel_information': 60}, max_size=2)
+    api = ChannelsApi(cache=cache)
+    for broadcaster_id in ('1', '2', '1', '3'):  # '2' is the least recently used one
+        await get_titles(api, broadcaster_id)
+    assert cache.evictions == 1 and len(cache) == 2
+    await get_titles(api, '1')
+    await get_titles(api, '2')
+    assert api.log == [['1'], ['2'], ['3'], ['2']]
+    # requests missing in ttls aren't cached
+    api = ChannelsApi(cache=ResponseCache({}))
+    await get_titles(api, '1')
+    await get_titles(api, '1')
+    assert len(api.log) == 2
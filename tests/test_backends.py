@@ -0,0 +1,26 @@
+import asyncio
+import sys
+
+import pytest
+
+from ttv.backends import get_json_backend, install_event_loop_policy, STDLIB_JSON
+
+
+def test_get_json_backend(monkeypatch):
+    assert get_json_backend('json') is STDLIB_JSON
+    backend = get_json_backend('auto')
+    assert backend.loads(backend.dumps({'data': [1, 'a']})) == {'data': [1, 'a']}
+    assert isinstance(backend.dumps({}), str)
+    with pytest.raises(ValueError):
+        get_json_backend('simplejson')
+    monkeypatch.setitem(sys.modules, 'orjson', None)  # not installed
+    assert get_json_backend('orjson') is STDLIB_JSON
+
+
+def test_install_event_loop_policy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'uvloop', None)  # not installed
+    assert install_event_loop_policy('auto') == 'asyncio'
+    assert install_event_loop_policy('uvloop') == 'asyncio'
+    assert type(asyncio.get_event_loop_policy()) is asyncio.DefaultEventLoopPolicy
+    with pytest.raises(ValueError):
+        install_event_loop_policy('trio')
@@ -1,11 +1,12 @@
 import asyncio
 import os
-from typing import Tuple
 
 import pytest
 
 from tests.test_irc.irc_msgs import *
-from ttv.irc import Client, Channel, LocalState, ChannelMessage, Whisper
+from ttv.irc import Client, Channel, LocalState, ChannelMessage, Whisper, BatchDispatcher, WorkerPoolDispatcher, \
+    ChannelLanesDispatcher, PendingMessages, TwitchIRCMsg, LazyTwitchIRCMsg, HandlerWatchdog, Metrics
+from ttv.irc.channels_accumulators import ChannelParts
 from ttv.irc.events import *
 from ttv.irc.exceptions import *
 
@@ -30,6 +31,26 @@ def test_event_registration():
     assert hasattr(bot, 'on_message')
 
 
+def test_line_filter():
+    class LClient(Client):
+        async def on_sub(self, event): pass
+
+    bot = LClient('token', 'login')
+    line_filter = bot._irc_conn.line_filter
+    assert {'PRIVMSG', 'JOIN', 'PART', 'CLEARCHAT'} <= line_filter.skipped_commands
+    assert 'USERNOTICE' not in line_filter.skipped_commands and line_filter.msg_ids['USERNOTICE'] == {'sub'}
+    assert line_filter.msg_ids['NOTICE'] == Client._ACCUMULATED_NOTICE_IDS
+
+    @bot.event
+    async def on_message(message): pass
+
+    @bot.event
+    async def on_notice(event): pass
+
+    line_filter = bot._irc_conn.line_filter
+    assert 'PRIVMSG' not in line_filter.skipped_commands and 'NOTICE' not in line_filter.msg_ids
+
+
 @pytest.mark.asyncio
 async def test_channel_getters():
     class LClient(Client):
@@ -96,6 +117,10 @@ async def test_start():
     assert valid_bot.joined_channel
 
 
+async def wait_other_tasks():
+    await asyncio.gather(*(asyncio.all_tasks() - {asyncio.current_task()}))
+
+
 async def handle_commands(client: Client, *irc_msgs: TwitchIRCMsg):
     for irc_msg in irc_msgs:
         await client._handle_command(irc_msg)
@@ -118,27 +143,106 @@ async def test_handle_command():
     bot = LClient('token', 'login')
     await handle_commands(bot, PRIVMSG, CAPS)
     await asyncio.sleep(0.001)
-    assert bot._delayed_irc_msgs['target'] == [PRIVMSG]
+    assert 'target' in bot.pending_messages and bot.pending_messages.pending == 1
     assert bot.is_on_unknown_command_called
     # also is being tested in test_handle_* tests
 
 
+@pytest.mark.asyncio
+async def test_pending_messages():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            pending_messages = PendingMessages(max_messages=3, max_age=0.01)
+            super().__init__(token, login, pending_messages=pending_messages, metrics=Metrics())
+            self.messages = []
+
+        async def on_message(self, message: ChannelMessage):
+            self.messages.append(message.content)
+
+    bot = LClient('token', 'login')
+    await handle_commands(bot, PRIVMSG)
+    await asyncio.sleep(0.02)
+    for content in ('first', 'second', 'third', 'fourth'):
+        privmsg = PRIVMSG.copy()
+        privmsg.trailing = content
+        await handle_commands(bot, privmsg)
+    pending = bot.pending_messages
+    assert pending.dropped_by_reason == {pending.AGE: 1, pending.COUNT: 1} and pending.pending == 3
+    await handle_commands(bot, *CHANNEL_PARTS)
+    await asyncio.sleep(0.01)
+    assert bot.messages == ['second', 'third', 'fourth']
+    assert pending.replayed == 3 and pending.delayed == 5 and 'target' not in pending
+    # parted before ready
+    await handle_commands(bot, TwitchIRCMsg(str(PRIVMSG).replace('#target', '#other')))
+    pending.discard('other')
+    assert pending.dropped_by_reason[pending.DISCARDED] == 1
+    assert bot.metrics.get(Metrics.PENDING_REPLAYED) == 3
+    assert bot.metrics.get(Metrics.PENDING_DROPPED, pending.AGE) == 1
+    assert bot.metrics.get(Metrics.PENDING_DROPPED, pending.COUNT) == 1
+    # sizes are bytes of raw lines
+    line = 'PRIVMSG #other :привет'
+    pending = PendingMessages(max_bytes=len(line.encode()) * 2 - 1)
+    for _ in range(2):
+        pending.add(LazyTwitchIRCMsg(line))
+    assert pending.dropped_by_reason == {pending.BYTES: 1} and pending.pending == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('dispatcher_class', (BatchDispatcher, ChannelLanesDispatcher))
+async def test_pending_messages_order(dispatcher_class):
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, dispatcher=dispatcher_class())
+            self.handled = []
+
+        async def on_channel_join(self, channel: Channel):
+            self.handled.append('join')
+
+        async def on_message(self, message: ChannelMessage):
+            self.handled.append(message.content)
+
+    bot = LClient('token', 'login')
+    first, second = PRIVMSG.copy(), PRIVMSG.copy()
+    first.trailing, second.trailing = 'first', 'second'
+    await handle_commands(bot, GLOBALSTATE, USERSTATE, NAMES_PART, ROOM_MODS, ROOM_VIPS, ROOM_CMDS, first)
+    # the channel gets ready within the frame, its delayed message must be handled before the next one
+    await bot._dispatcher.dispatch([ROOMSTATE, NAMES_END, second])
+    await asyncio.sleep(0.01)
+    assert bot.handled == ['join', 'first', 'second']
+    assert bot.pending_messages.replayed == 1
+    await bot._dispatcher.close()
+
+
 @pytest.mark.asyncio
 async def test_handle_names_part():
     bot = Client('token', 'login')
     # set(update)
     await handle_commands(bot, NAMES_PART, NAMES_END)
-    assert (await bot._chnls_accum.get_parts('target')).names == NAMES[:3]
+    assert bot._chnls_accum.get_parts('target').names == set(NAMES[:3])
     # update
     await handle_commands(bot, NAMES_PART, NAMES_PART2, NAMES_END)
-    assert (await bot._chnls_accum.get_parts('target')).names == NAMES
+    assert bot._chnls_accum.get_parts('target').names == set(NAMES)
+
+
+def test_channel_parts_readiness():
+    parts = ChannelParts('target')
+    for irc_msg in (ROOMSTATE, NAMES_PART):
+        parts.add_part(irc_msg)
+    assert parts.is_ready == parts.NOT_READY  # names aren't ended
+    parts.add_part(NAMES_END)
+    assert parts.is_ready == parts.READY_ANON and parts.has_parts(parts.ANON_PARTS)
+    for irc_msg in (USERSTATE, ROOM_MODS, ROOM_VIPS, ROOM_CMDS):
+        parts.add_part(irc_msg)
+    assert parts.is_ready == parts.READY and parts.received == parts.ALL_PARTS
+    parts.mods = None
+    assert parts.is_ready == parts.READY_ANON
 
 
 @pytest.mark.asyncio
 async def test_handle_names_end():
     bot = Client('token', 'login')
     await handle_commands(bot, *CHANNEL_PARTS)
-    assert bot.get_channel('target').names == NAMES
+    assert bot.get_channel('target').names == set(NAMES)
     # also is being tested in `test_handle_names_update()`
 
 
@@ -149,24 +253,38 @@ async def test_handle_names_update():
             super().__init__(token, login)
             self.is_names_updated = False
 
-        async def on_names_update(self, channel: Channel, before: Tuple, after: Tuple):
-            assert before == NAMES
-            assert after == NAMES[3:]
-            assert channel.login == 'target'
+        async def on_names_update(self, event: OnNamesUpdate):
+            assert event.added == set()
+            assert event.removed == set(NAMES[:3])
+            assert event.channel.login == 'target'
             self.is_names_updated = True
 
     bot = LClient('token', 'login')
     await handle_commands(bot, *CHANNEL_PARTS, NAMES_PART2, NAMES_END)
-    assert bot.get_channel('target').names == NAMES[3:]
+    assert bot.get_channel('target').names == set(NAMES[3:])
     await asyncio.sleep(0.001)
     assert bot.is_names_updated
 
 
+@pytest.mark.asyncio
+async def test_names_tracking():
+    bot = Client('token', 'login', track_names=False)
+    bot.set_names_tracking('other', track=True)
+    await handle_commands(bot, *CHANNEL_PARTS)
+    assert bot.get_channel('target').names == set()
+    bot.set_names_tracking('target', track=True)
+    await handle_commands(bot, NAMES_PART, NAMES_END)
+    assert bot.get_channel('target').names == set(NAMES[:3])
+    bot.set_names_tracking('target', track=False)
+    assert bot.get_channel('target').names == set()
+    assert bot._chnls_accum._names_tracking == {'other': True}
+
+
 @pytest.mark.asyncio
 async def test_handle_roomstate():
     bot = Client('token', 'login')
     await bot._handle_command(ROOMSTATE)
-    assert (await bot._chnls_accum.get_parts('target')).raw_channel_state == ROOMSTATE
+    assert bot._chnls_accum.get_parts('target').raw_channel_state == ROOMSTATE
     # also is being tested in `test_handle_channel_update()`
 
 
@@ -177,25 +295,33 @@ async def test_handle_channel_update():
             super().__init__(token, login)
             self.is_channel_updated = False
 
-        async def on_channel_update(self, before: Channel, after: Channel):
-            assert before.login == after.login == 'target'
-            assert not before.is_emote_only and after.is_emote_only
+        async def on_channel_update(self, event: OnChannelUpdate):
+            assert event.before.login == event.after.login == event.channel.login == 'target'
+            assert not event.before.is_emote_only and event.after.is_emote_only
+            assert event.changes == {'emote-only': ('0', '1')}
             self.is_channel_updated = True
 
     bot = LClient('token', 'login')
     _RS = ROOMSTATE.copy()
     _RS.update({'emote-only': '1'})
-    await handle_commands(bot, *CHANNEL_PARTS, _RS)
-    assert bot.get_channel_by_login('target').is_emote_only
+    await handle_commands(bot, *CHANNEL_PARTS)
+    state = bot.get_channel('target').state
+    await handle_commands(bot, _RS)
+    assert bot.get_channel_by_login('target').is_emote_only and not state.is_emote_only
     await asyncio.sleep(0.001)
     assert bot.is_channel_updated
+    # nothing is changed
+    bot.is_channel_updated = False
+    await handle_commands(bot, _RS)
+    await asyncio.sleep(0.001)
+    assert not bot.is_channel_updated
 
 
 @pytest.mark.asyncio
 async def test_handle_userstate():
     bot = Client('token', 'login')
     await handle_commands(bot, GLOBALSTATE, USERSTATE)
-    assert (await bot._chnls_accum.get_parts('target')).client_state == LocalState(USERSTATE)
+    assert bot._chnls_accum.get_parts('target').client_state == LocalState(USERSTATE)
 
 
 @pytest.mark.asyncio
@@ -501,3 +627,181 @@ async def test_handle_clearmsg():
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatcher():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, dispatcher=BatchDispatcher())
+            self.contents = []
+
+        async def on_message(self, message: ChannelMessage):
+            self.contents.append(message.content)
+
+    bot = LClient('token', 'login')
+    _PRIVMSG = PRIVMSG.copy()
+    _PRIVMSG.trailing = 'second'
+    await bot._dispatcher.dispatch([*CHANNEL_PARTS, PRIVMSG, _PRIVMSG])
+    await asyncio.gather(*bot._dispatcher._tasks)  # the batch
+    await wait_other_tasks()  # event handlers
+    assert bot.get_channel('target') is not None
+    assert bot.contents == [PRIVMSG.trailing, 'second']
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_dispatcher():
+    class LClient(Client):
+        def __init__(self, token: str, login: str, dispatcher: WorkerPoolDispatcher):
+            super().__init__(token, login, dispatcher=dispatcher)
+            self.release = asyncio.Event()
+            self.contents = []
+
+        async def on_message(self, message: ChannelMessage):
+            await self.release.wait()  # event handlers are awaited by workers
+            self.contents.append(message.content)
+
+    dispatcher = WorkerPoolDispatcher(workers=1, max_queued=2, overflow=WorkerPoolDispatcher.DROP_OLDEST)
+    bot = LClient('token', 'login', dispatcher)
+    await handle_commands(bot, *CHANNEL_PARTS)
+    privmsgs = []
+    for index in range(5):
+        privmsgs.append(_PRIVMSG := PRIVMSG.copy())
+        _PRIVMSG.trailing = str(index)
+    await dispatcher.dispatch(privmsgs[:1])
+    await asyncio.sleep(0.001)  # the worker takes the first message and waits in `on_message`
+    assert dispatcher.in_flight == 1 and dispatcher.queued == 0
+    await dispatcher.dispatch(privmsgs[1:])
+    assert dispatcher.queued == 2
+    assert dispatcher.dropped == dispatcher.dropped_by_command['PRIVMSG'] == 2
+    bot.release.set()
+    await dispatcher.join()
+    assert bot.contents == ['0', '3', '4']
+    await dispatcher.close()
+    # drop by command
+    dispatcher = WorkerPoolDispatcher(workers=1, max_queued=1, overflow=WorkerPoolDispatcher.DROP_BY_COMMAND)
+    bot = LClient('token', 'login', dispatcher)
+    await handle_commands(bot, *CHANNEL_PARTS)
+    await dispatcher.dispatch(privmsgs[:1])
+    await asyncio.sleep(0.001)
+    dispatching = asyncio.create_task(dispatcher.dispatch([privmsgs[1], privmsgs[2], CLEARMSG, privmsgs[3]]))
+    await asyncio.sleep(0.001)
+    assert not dispatching.done()  # CLEARMSG waits for a place
+    assert dispatcher.dropped_by_command == {'PRIVMSG': 1}
+    bot.release.set()
+    await dispatching
+    await dispatcher.join()
+    # the queue is full again when privmsgs[3] comes (CLEARMSG took the place), so it's dropped too
+    assert dispatcher.dropped_by_command == {'PRIVMSG': 2}
+    assert bot.contents == ['0', '1']
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_close():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, dispatcher=BatchDispatcher())
+            self.release = asyncio.Event()
+
+        async def _handle_command(self, irc_msg: TwitchIRCMsg) -> None:
+            if irc_msg is PRIVMSG:
+                await self.release.wait()
+            elif irc_msg is CAPS:
+                raise ValueError  # is logged, the batch goes on
+            await super()._handle_command(irc_msg)
+
+    bot = LClient('token', 'login')
+    await bot._dispatcher.dispatch([CAPS, PRIVMSG])
+    assert len(bot._dispatcher._tasks) == 1
+    task, = bot._dispatcher._tasks
+    await asyncio.sleep(0)  # CAPS is handled, PRIVMSG waits
+    assert not task.done()
+    await bot._dispatcher.close()
+    assert task.cancelled()
+    assert not bot._dispatcher._tasks
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_dispatcher_stop_from_handler():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, dispatcher=WorkerPoolDispatcher(workers=2))
+            self.stopped = False
+
+        async def on_message(self, message: ChannelMessage):
+            await self._dispatcher.close()  # as `Client.stop()` does
+            self.stopped = True
+
+    bot = LClient('token', 'login')
+    await handle_commands(bot, *CHANNEL_PARTS)
+    await bot._dispatcher.dispatch([PRIVMSG])
+    await asyncio.wait_for(bot._dispatcher.join(), 1)
+    assert bot.stopped
+    assert not bot._dispatcher._workers
+
+
+@pytest.mark.asyncio
+async def test_channel_lanes_dispatcher():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, dispatcher=ChannelLanesDispatcher())
+            self.release = asyncio.Event()
+            self.events = []
+
+        async def on_message(self, message: ChannelMessage):
+            await self.release.wait()  # CLEARMSG of the channel waits for it
+            self.events.append(('message', message.content))
+
+        async def on_message_delete(self, event: OnMessageDelete):
+            self.events.append(('delete', event.message_id))
+
+        async def on_whisper(self, whisper: Whisper):
+            self.events.append(('whisper', whisper.content))
+
+    bot = LClient('token', 'login')
+    dispatcher = bot._dispatcher
+    await handle_commands(bot, *CHANNEL_PARTS)
+    await dispatcher.dispatch([PRIVMSG, CLEARMSG, WHISPER])
+    await asyncio.sleep(0.001)
+    assert dispatcher.lanes == 1 and dispatcher.queued == 2  # the whisper's lane is already done
+    assert bot.events == [('whisper', WHISPER.trailing)]
+    bot.release.set()
+    await asyncio.gather(*dispatcher._tasks)
+    assert bot.events[1:] == [('message', PRIVMSG.trailing), ('delete', '1-2-3')]
+    assert dispatcher.lanes == 0 and not dispatcher._tasks  # idle lanes are removed
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_handler_watchdog(caplog):
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            watchdog = HandlerWatchdog(timeouts={'on_user_part': 0.01}, slow_threshold=0.005)
+            super().__init__(token, login, handler_watchdog=watchdog)
+            self.errors = []
+
+        async def on_user_join(self, channel: Channel, login: str):
+            raise ValueError(login)
+
+        async def on_user_part(self, channel: Channel, login: str):
+            await asyncio.sleep(1)
+
+        async def on_message(self, message: ChannelMessage):
+            await asyncio.sleep(0.01)
+
+        async def on_handler_error(self, event: OnHandlerError):
+            self.errors.append(event)
+
+    bot = LClient('token', 'login')
+    await handle_commands(bot, *CHANNEL_PARTS, JOIN, PART, PRIVMSG)
+    await asyncio.sleep(0.05)
+    assert [(error.event_name, error.channel_login, type(error.exception)) for error in bot.errors] == [
+        ('on_user_join', 'target', ValueError),
+        ('on_user_part', 'target', asyncio.TimeoutError)
+    ]
+    assert 'Slow handler of on_message in #target' in caplog.text
+    stats = {stats.event_name: stats for stats in bot.handler_watchdog.snapshot()}
+    assert (stats['on_user_join'].calls, stats['on_user_join'].errors) == (1, 1)
+    assert (stats['on_user_part'].errors, stats['on_user_part'].timeouts) == (1, 1)
+    assert [stats.event_name for stats in bot.handler_watchdog.snapshot(top=2)] == ['on_user_part', 'on_message']
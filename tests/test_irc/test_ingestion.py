@@ -0,0 +1,52 @@
+import asyncio
+import pickle
+
+import pytest
+
+from benchmarks.fake_irc_server import FakeIRCServer
+from tests.test_irc.irc_msgs import PRIVMSG, WHISPER, CLEARMSG
+from ttv.irc import MultiProcessTTVIRCClient, TwitchIRCMsg
+from ttv.irc.ingestion import _pack_irc_msg, _unpack_irc_msg
+
+
+def test_pack_irc_msg():
+    for irc_msg in (PRIVMSG, WHISPER, CLEARMSG, TwitchIRCMsg.create_empty()):
+        unpacked_irc_msg = _unpack_irc_msg(pickle.loads(pickle.dumps(_pack_irc_msg(irc_msg))))
+        assert type(unpacked_irc_msg) is TwitchIRCMsg
+        assert unpacked_irc_msg == irc_msg
+        assert (unpacked_irc_msg.channel, unpacked_irc_msg.msg_id) == (irc_msg.channel, irc_msg.msg_id)
+        assert str(unpacked_irc_msg) == str(irc_msg)
+
+
+def test_get_worker_index():
+    irc_conn = MultiProcessTTVIRCClient('justinfan0', '', processes=4)
+    indexes = [irc_conn.get_worker_index(f'channel{index}') for index in range(100)]
+    assert set(indexes) == {0, 1, 2, 3}
+    # the hash is stable, doesn't depend on PYTHONHASHSEED
+    assert irc_conn.get_worker_index('target') == 0
+    assert MultiProcessTTVIRCClient('justinfan0', '', processes=4).get_worker_index('channel0') == indexes[0]
+
+
+@pytest.mark.asyncio
+async def test_multi_process_client():
+    channels = ['channel0', 'channel1', 'channel4', 'channel5']  # two of each worker
+    received = dict.fromkeys(channels, 0)
+
+    async def receive(irc_conn: MultiProcessTTVIRCClient):
+        async for irc_msgs in irc_conn.iter_batches():
+            for irc_msg in irc_msgs:
+                if irc_msg.command == 'PRIVMSG':
+                    received[irc_msg.channel] += 1
+            if all(count == 300 for count in received.values()):
+                return
+
+    async with FakeIRCServer(messages=300, frame=40) as server:
+        irc_conn = MultiProcessTTVIRCClient('justinfan0', '', processes=2, uri=server.uri)
+        assert {irc_conn.get_worker_index(channel) for channel in channels} == {0, 1}
+        await irc_conn.connect()
+        try:
+            await irc_conn.join_channels(*channels)
+            await asyncio.wait_for(receive(irc_conn), 30)
+        finally:
+            await irc_conn.stop()
+    assert received == dict.fromkeys(channels, 300)
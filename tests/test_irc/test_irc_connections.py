@@ -0,0 +1,186 @@
+import asyncio
+from itertools import repeat
+from typing import List, Optional
+
+import pytest
+from websockets.exceptions import ConnectionClosedError
+
+from ttv.irc import IRCClient, TTVIRCClient, ShardedTTVIRCClient, TwitchIRCMsg, LineFilter, Metrics
+from ttv.irc.line_filters import read_command, read_tag
+
+
+class FakeWebSocket:
+    """Imitates an open websocket, yields given frames and saves sent data"""
+    def __init__(self, frames: List[str], error: Optional[Exception] = None):
+        self.frames = frames
+        self.error = error  # is raised after all the frames
+        self.sent: List[str] = []
+        self.open = True
+
+    async def send(self, data: str):
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = ''):
+        self.open = False
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+        if self.error is not None:
+            self.open = False
+            raise self.error
+
+
+class LiveFakeWebSocket(FakeWebSocket):
+    """Imitates an open websocket that yields frames put by :meth:`receive` until it's closed"""
+    def __init__(self):
+        super().__init__([])
+        self.received: asyncio.Queue = asyncio.Queue()
+
+    def receive(self, frame: str):
+        self.received.put_nowait(frame)
+
+    async def close(self, code: int = 1000, reason: str = ''):
+        self.open = False
+        self.received.put_nowait(None)
+
+    async def __aiter__(self):
+        while (frame := await self.received.get()) is not None:
+            yield frame
+
+
+def fake_irc_client(*frames: str) -> IRCClient:
+    irc_client = IRCClient('ws://localhost')
+    irc_client._ws = FakeWebSocket(list(frames))
+    return irc_client
+
+
+@pytest.mark.asyncio
+async def test_iter_batches():
+    irc_client = fake_irc_client(
+        'PRIVMSG #target :one\r\nPRIVMSG #target :two\r\n',
+        'PING :tmi.twitch.tv\r\n',
+        'JOIN #target\r\n'
+    )
+    batches = [batch async for batch in irc_client.iter_batches()]
+    assert len(batches) == 2  # frame with PING only is skipped
+    assert [irc_msg.trailing for irc_msg in batches[0]] == ['one', 'two']
+    assert batches[1] == [TwitchIRCMsg('JOIN #target')]
+    assert irc_client._ws.sent == ['PONG :tmi.twitch.tv\r\n']
+    assert not irc_client.is_running
+
+
+def test_line_filter():
+    line_filter = LineFilter(skipped_commands=('JOIN',), msg_ids={'NOTICE': ('room_mods',)})
+    assert read_command('@a=b;c=d :username!username@username.tmi.twitch.tv PRIVMSG #target :one') == ('PRIVMSG', 8)
+    assert read_command('PING :tmi.twitch.tv') == ('PING', 0)
+    assert read_command(':tmi.twitch.tv RECONNECT') == ('RECONNECT', 0)
+    assert read_tag('@a-msg-id=x;msg-id=room_mods NOTICE #target :mods', 'msg-id', 28) == 'room_mods'
+    assert read_tag('@msg-id=room_mods NOTICE #target :msg-id=', 'msg-id', 17) == 'room_mods'
+    assert read_tag('@a=msg-id= NOTICE #target', 'msg-id', 10) is None
+    assert not line_filter.accepts(':username!username@username.tmi.twitch.tv JOIN #target')
+    assert line_filter.accepts('@msg-id=room_mods :tmi.twitch.tv NOTICE #target :The moderators are: a')
+    assert not line_filter.accepts('@msg-id=no_vips :tmi.twitch.tv NOTICE #target :No VIPs.')
+    assert line_filter.accepts('PRIVMSG #target :one')
+
+
+@pytest.mark.asyncio
+async def test_iter_batches_filters_lines():
+    irc_client = fake_irc_client('PRIVMSG #target :one\r\nJOIN #target\r\nPING :tmi.twitch.tv\r\n', 'JOIN #target\r\n')
+    irc_client.set_line_filter(LineFilter(skipped_commands=('JOIN', 'PING')))
+    batches = [batch async for batch in irc_client.iter_batches()]
+    assert batches == [[TwitchIRCMsg('PRIVMSG #target :one')]]
+    assert irc_client._ws.sent == ['PONG :tmi.twitch.tv\r\n']  # PINGs are answered anyway
+
+
+@pytest.mark.asyncio
+async def test_iter_batches_metrics():
+    frames = ('PRIVMSG #target :one\r\nJOIN #target\r\nPRIVMSG #target :двa\r\n', 'PING :tmi.twitch.tv\r\n')
+    irc_client = fake_irc_client(*frames)
+    irc_client.set_line_filter(LineFilter(skipped_commands=('JOIN',)))
+    metrics = Metrics()
+    irc_client.set_metrics(metrics)
+    _ = [batch async for batch in irc_client.iter_batches()]
+    assert metrics.get(Metrics.MESSAGES, 'PRIVMSG') == 2
+    assert metrics.get(Metrics.MESSAGES, 'JOIN') is None
+    assert metrics.get(Metrics.DROPPED_LINES) == 1
+    assert metrics.get(Metrics.RECEIVED_BYTES) == sum(len(frame.encode()) for frame in frames)
+    assert metrics.get(Metrics.PARSE_SECONDS).count == 2
+
+
+@pytest.mark.asyncio
+async def test_aiter():
+    irc_client = fake_irc_client('PRIVMSG #target :one\r\nPRIVMSG #target :two\r\n', 'JOIN #target\r\n')
+    assert [irc_msg.command async for irc_msg in irc_client] == ['PRIVMSG', 'PRIVMSG', 'JOIN']
+
+
+@pytest.mark.asyncio
+async def test_ttv_iter_batches_reconnects():
+    sockets = [
+        FakeWebSocket(['JOIN #first\r\n'], ConnectionClosedError(None, None)),
+        FakeWebSocket(['JOIN #second\r\n'], ConnectionClosedError(None, None)),
+        FakeWebSocket(['JOIN #third\r\n']),
+    ]
+    irc_client = TTVIRCClient('justinfan0', '')
+    irc_client._ws = sockets.pop(0)
+    irc_client._delay_gen = repeat(0)
+    restarts = 0
+
+    async def connect():
+        nonlocal restarts
+        restarts += 1
+        irc_client._ws = sockets.pop(0)
+    irc_client.connect = connect
+
+    async def read_batches():
+        return [batch async for batch in irc_client.iter_batches()]
+    batches = await asyncio.wait_for(read_batches(), 5)  # a closed socket mustn't be re-iterated forever
+    assert [batch[0].channel for batch in batches] == ['first', 'second', 'third']
+    assert restarts == 2
+    assert not irc_client.is_restarting
+
+
+@pytest.mark.asyncio
+async def test_sharded_irc_client():
+    class LShardedTTVIRCClient(ShardedTTVIRCClient):
+        def _create_shard(self) -> TTVIRCClient:
+            shard = TTVIRCClient(self.login, self._token, keep_alive=False)
+
+            async def connect():
+                shard._ws = LiveFakeWebSocket()
+            shard.connect = connect
+            return shard
+
+    irc_conn = LShardedTTVIRCClient('justinfan0', '', channels_per_shard=2)
+    await irc_conn.connect()
+    await irc_conn.join_channels('first', 'second', 'third')
+    first, second = irc_conn.shards
+    assert first._ws.sent == ['JOIN #first,#second\r\n'] and second._ws.sent == ['JOIN #third\r\n']
+    assert irc_conn.get_shard('third') is second
+    await irc_conn.send_msg('third', 'content')
+    assert second._ws.sent[-1] == 'PRIVMSG #third :content\r\n'
+
+    batches = asyncio.Queue()
+
+    async def read_batches():
+        async for batch in irc_conn.iter_batches():
+            batches.put_nowait([irc_msg.trailing or irc_msg.command for irc_msg in batch])
+    reading = asyncio.create_task(read_batches())
+    first._ws.receive('PRIVMSG #first :1\r\n')
+    assert await batches.get() == ['1']
+    second._ws.receive(':username!username@username.tmi.twitch.tv WHISPER justinfan0 :w\r\nPRIVMSG #third :2\r\n')
+    assert await batches.get() == ['2']  # messages without a channel come only from the first shard
+    # #third is moved to the first shard when it's got a free place
+    await irc_conn.part_channels('first')
+    assert first._ws.sent[-2:] == ['PART #first\r\n', 'JOIN #third\r\n']
+    first._ws.receive('PRIVMSG #third :skipped\r\n')
+    second._ws.receive('PRIVMSG #third :3\r\n')
+    assert await batches.get() == ['3']  # the old shard is used until the new one has joined
+    first._ws.receive('ROOMSTATE #third\r\nPRIVMSG #third :4\r\n')
+    assert await batches.get() == ['4']
+    await asyncio.gather(*irc_conn._tasks)  # the old shard parts the channel and is closed
+    assert second._ws.sent[-1] == 'PART #third\r\n' and not second.is_connected
+    assert irc_conn.shards == [first] and irc_conn.get_shard('third') is first
+    await irc_conn.stop()
+    await asyncio.wait_for(reading, 5)
+    assert not irc_conn.is_running
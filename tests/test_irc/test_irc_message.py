@@ -1,4 +1,11 @@
-from ttv.irc import TwitchIRCMsg
+import os
+import subprocess
+import sys
+from copy import copy
+
+from ttv.irc import TwitchIRCMsg, FastTwitchIRCMsg, LazyTwitchIRCMsg
+
+from tests.test_irc import irc_msgs
 
 
 def test_irc_msg():
@@ -160,3 +167,127 @@ def test_str_repr():
     assert str(TwitchIRCMsg(raw_irc_msg)) == raw_irc_msg
     raw_irc_msg = '@badge-info=subscriber/1;badges=subscriber/0;client-nonce=3f58e4f3107d580b8a29626738823a5c;color=#FF69B4;display-name=fernandx_z;emotes=;flags=;id=aa3b5987-1929-414c-bc55-10f9e6c1723e;mod=0;reply-parent-display-name=MaYidRaMaS;reply-parent-msg-body=axozerTem\\sato\\saxozerPium\\saxozerPium_HF;reply-parent-msg-id=2f06b2b8-d33d-4e65-a0c4-82d1894c7b63;reply-parent-user-id=612074199;reply-parent-user-login=mayidramas;room-id=133528221;subscriber=1;tmi-sent-ts=1622471612333;turbo=0;user-id=602696060;user-type= :fernandx_z!fernandx_z@fernandx_z.tmi.twitch.tv PRIVMSG #axozer :@MaYidRaMaS PERO JAJSJAJSJASJASJA'
     assert str(TwitchIRCMsg(raw_irc_msg)) == raw_irc_msg
+
+
+def is_parsed(irc_msg: LazyTwitchIRCMsg, name: str) -> bool:
+    try:
+        return object.__getattribute__(irc_msg, name) is not None  # doesn't call __getattr__
+    except AttributeError:
+        return False
+
+
+def test_lazy_irc_msg():
+    # same results as the eager one
+    for irc_msg in vars(irc_msgs).values():
+        if isinstance(irc_msg, TwitchIRCMsg):
+            lazy_msg = LazyTwitchIRCMsg(str(irc_msg))
+            assert lazy_msg == irc_msg
+            assert lazy_msg.tags == irc_msg.tags
+            assert lazy_msg.middles == irc_msg.middles
+            assert lazy_msg.channel == irc_msg.channel
+            assert lazy_msg.msg_id == irc_msg.msg_id
+    # nothing is parsed except command
+    raw_irc_msg = r'@key=value;no-value-tag;key2=escaped\svalue;ke=v :nick!user@host COMMAND #channel :trai :ling'
+    irc_msg = LazyTwitchIRCMsg(raw_irc_msg)
+    assert irc_msg.command == 'COMMAND'
+    assert not is_parsed(irc_msg, '_tags') and not is_parsed(irc_msg, 'middles')
+    assert not is_parsed(irc_msg, 'nickname') and not is_parsed(irc_msg, 'channel')
+    # single tags are taken from raw tags
+    assert irc_msg.get('key') == 'value'
+    assert irc_msg.get('ke') == 'v'
+    assert irc_msg.get('key2') == 'escaped value'
+    assert irc_msg['no-value-tag'] is None
+    assert 'no-value-tag' in irc_msg
+    assert 'k' not in irc_msg and 'value' not in irc_msg
+    assert irc_msg.get('unknown', 'DEFAULT') == 'DEFAULT'
+    irc_msg['key3'] = 'value3'
+    assert irc_msg.get('key3') == 'value3'
+    assert not is_parsed(irc_msg, '_tags')
+    # parsed on access
+    assert irc_msg.tags == {'key': 'value', 'no-value-tag': None, 'key2': 'escaped value', 'ke': 'v', 'key3': 'value3'}
+    assert irc_msg.nickname == 'nick' and irc_msg.user == 'user' and irc_msg.host == 'host'
+    assert irc_msg.channel == 'channel'
+    assert irc_msg.trailing == 'trai :ling'
+    # no tags, no params
+    irc_msg = LazyTwitchIRCMsg('COMMAND')
+    assert irc_msg.command == 'COMMAND'
+    assert irc_msg.get('key') is None
+    assert irc_msg.tags == {}
+    assert irc_msg.middles == () and irc_msg.trailing is None
+    assert str(LazyTwitchIRCMsg(raw_irc_msg)) == raw_irc_msg
+
+
+def assert_same_parsing(irc_msg: TwitchIRCMsg, other: TwitchIRCMsg):
+    assert irc_msg.command == other.command
+    assert irc_msg.tags == other.tags
+    assert irc_msg.servername == other.servername
+    assert irc_msg.nickname == other.nickname
+    assert irc_msg.user == other.user
+    assert irc_msg.host == other.host
+    assert irc_msg.middles == other.middles
+    assert irc_msg.trailing == other.trailing
+    assert irc_msg.channel == other.channel
+    assert irc_msg.msg_id == other.msg_id
+
+
+def test_fast_irc_msg():
+    raw_irc_msgs = [str(irc_msg) for irc_msg in vars(irc_msgs).values() if isinstance(irc_msg, TwitchIRCMsg)]
+    raw_irc_msgs += [
+        r'@no-value-tag;key=value;key2=escaped\svalue\\\:;key3=a=b COMMAND',
+        ':server.name.tv COMMAND',
+        ':nickname@host COMMAND',
+        'COMMAND ',
+        'COMMAND middle',
+        'COMMAND middle :trai :ling',
+        'COMMAND middle  :trailing',
+        'COMMAND ' + 'middle ' * 14 + 'trailing',
+        'COMMAND ' + 'middle ' * 14 + 'trai :ling',
+        'COMMAND ' + 'middle ' * 13 + ':trai :ling',
+        'COMMAND ' + 'middle ' * 16 + ':trai :ling',
+        'COMMAND :',
+        'COMMAND :trailing',
+        'COMMAND first middle channel_login :trai :ling',
+    ]
+    for raw_irc_msg in raw_irc_msgs:
+        assert_same_parsing(FastTwitchIRCMsg(raw_irc_msg), TwitchIRCMsg(raw_irc_msg))
+        assert_same_parsing(LazyTwitchIRCMsg(raw_irc_msg), TwitchIRCMsg(raw_irc_msg))
+
+
+def test_lazy_irc_msg_copy():
+    irc_msg = LazyTwitchIRCMsg('@key=value :nick!user@host COMMAND #channel :trailing')
+    irc_msg['key2'] = 'value2'
+    new_msg = copy(irc_msg)
+    new_msg['key3'] = 'value3'
+    assert not is_parsed(new_msg, '_tags') and not is_parsed(new_msg, 'middles')
+    assert 'key3' not in irc_msg
+    assert irc_msg.tags == {'key': 'value', 'key2': 'value2'}
+    assert new_msg.tags == {'key': 'value', 'key2': 'value2', 'key3': 'value3'}
+    assert new_msg.channel == 'channel' and new_msg.nickname == 'nick'
+    # parsed tags are copied by `IRCMsg.copy()`
+    copied_msg = irc_msg.copy()
+    copied_msg['key'] = 'new_value'
+    assert irc_msg['key'] == 'value'
+
+
+def run_with_slots(use_slots: str, code: str):
+    env = {**os.environ, 'TTV_USE_SLOTS': use_slots}  # is read when `ttv` is imported
+    code = 'from ttv.irc import *\n' + code
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_slots_mode():
+    # `__dict__`-based by default
+    run_with_slots('', (
+        'irc_msg = LazyTwitchIRCMsg("@a=b PRIVMSG #target :text")\n'
+        'irc_msg.handled = True\n'
+        'assert vars(irc_msg)["handled"] and irc_msg.get("a") == "b"\n'
+    ))
+    # slotted if opted into
+    run_with_slots('1', (
+        'from ttv.irc.events import OnNamesUpdate\n'
+        'classes = (TwitchIRCMsg, LazyTwitchIRCMsg, ChannelMessage, Whisper, ChannelUser, GlobalUser, Emote, Flag, '
+        'OnNamesUpdate)\n'
+        'assert all(cls.__dictoffset__ == 0 for cls in classes), [cls for cls in classes if cls.__dictoffset__]\n'
+        'assert LazyTwitchIRCMsg("@a=b PRIVMSG #target :text").get("a") == "b"\n'
+    ))
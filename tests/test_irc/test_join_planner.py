@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from tests.test_irc.test_irc_connections import FakeWebSocket
+from ttv.irc import Client, RateLimits
+from ttv.irc.events import OnJoinProgress
+
+
+async def wait_planner(client: Client):
+    planner = client._join_planner
+    while planner._joining_task is not None or planner._requesting_task is not None:
+        await asyncio.gather(*(task for task in (planner._joining_task, planner._requesting_task) if task))
+
+
+@pytest.mark.asyncio
+async def test_join_planner():
+    class LClient(Client):
+        def __init__(self, token: str, login: str):
+            super().__init__(token, login, rate_limits=RateLimits(joins=(2, 0.01), privmsg=(3, 0.01)))
+            self.progress = []
+
+        async def on_join_progress(self, event: OnJoinProgress):
+            self.progress.append(event)
+
+    bot = LClient('token', 'login')
+    bot._irc_conn._ws = FakeWebSocket([])
+    await bot.join_channels('a', 'b', 'c', 'd', 'e')
+    await bot.part_channels('d')  # isn't joined yet
+    assert bot._join_planner.planned == 4
+    await wait_planner(bot)
+    await asyncio.sleep(0)  # event handlers
+    joins = [raw for raw in bot._irc_conn._ws.sent if raw.startswith('JOIN')]
+    assert joins == ['JOIN #a,#b\r\n', 'JOIN #c,#e\r\n']
+    assert [(event.joined, event.total, event.channels) for event in bot.progress] == [
+        (2, 4, ('a', 'b')), (4, 4, ('c', 'e'))
+    ]
+    requests = [raw for raw in bot._irc_conn._ws.sent if raw.startswith('PRIVMSG')]
+    assert requests[:3] == ['PRIVMSG #a :/help\r\n', 'PRIVMSG #a :/mods\r\n', 'PRIVMSG #a :/vips\r\n']
+    assert len(requests) == 12
+    assert all(bot._chnls_accum.is_accumulating(channel) for channel in 'abce')
+    await bot._join_planner.close()
+    bot._chnls_accum.abort_accumulations('a', 'b', 'c', 'e')
+
+
+@pytest.mark.asyncio
+async def test_join_planner_line_length():
+    bot = Client('token', 'justinfan0', rate_limits=RateLimits(joins=(100, 0.01)))
+    bot._irc_conn._ws = FakeWebSocket([])
+    channels = [f'channel{index:020}' for index in range(50)]
+    await bot.join_channels(*channels)
+    await wait_planner(bot)
+    joins = bot._irc_conn._ws.sent
+    assert len(joins) == 3 and all(len(join) <= 512 for join in joins)
+    assert ','.join(joins).replace('\r\n', '').replace('JOIN #', '#').replace('#', '').split(',') == channels
+    bot._chnls_accum.abort_accumulations(*channels)
+
+
+@pytest.mark.asyncio
+async def test_join_planner_replanning():
+    bot = Client('token', 'justinfan0', rate_limits=RateLimits(joins=(10, 0.01)))
+    bot._irc_conn._ws = FakeWebSocket([])
+    planner = bot._join_planner
+    planner.plan('a', 'b')
+    planner.cancel('a')
+    planner.plan('a')
+    assert planner.planned == 2 and planner.total == 2
+    await wait_planner(bot)
+    assert bot._irc_conn._ws.sent == ['JOIN #a,#b\r\n'] and planner.joined == 2
+    bot._chnls_accum.abort_accumulations('a', 'b')
+
+
+@pytest.mark.asyncio
+async def test_join_planner_failed_join():
+    class FailingWebSocket(FakeWebSocket):
+        async def send(self, data: str):
+            if not self.sent:
+                self.sent.append(None)
+                raise ConnectionError('closed')
+            await super().send(data)
+
+    bot = Client('token', 'justinfan0', rate_limits=RateLimits(joins=(10, 0.01)))
+    bot._irc_conn._ws = FailingWebSocket([])
+    planner = bot._join_planner
+    planner.plan('a', 'b')
+    await wait_planner(bot)
+    assert bot._irc_conn._ws.sent == [None, 'JOIN #a,#b\r\n']  # the chunk is joined again
+    assert planner.joined == 2 and planner.planned == 0
+    bot._chnls_accum.abort_accumulations('a', 'b')
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from tests.test_irc.irc_msgs import CHANNEL_PARTS, JOIN
+from ttv.irc import Client, Metrics
+
+
+def test_metrics():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.count(Metrics.MESSAGES, 'PRIVMSG')
+    metrics.count(Metrics.MESSAGES, 'PRIVMSG')
+    metrics.count(Metrics.RECEIVED_BYTES, amount=100)
+    for value in (0.05, 0.5, 5.0):
+        metrics.observe(Metrics.HANDLER_SECONDS, value, 'on_message')
+    assert metrics.get(Metrics.MESSAGES, 'PRIVMSG') == 2
+    assert metrics.get(Metrics.MESSAGES, 'JOIN') is None
+    histogram = metrics.get(Metrics.HANDLER_SECONDS, 'on_message')
+    assert (histogram.counts, histogram.count, histogram.sum) == ([1, 1], 3, 5.55)
+    assert metrics.to_prometheus().splitlines() == [
+        '# HELP ttv_irc_messages_total Received messages by command',
+        '# TYPE ttv_irc_messages_total counter',
+        'ttv_irc_messages_total{command="PRIVMSG"} 2',
+        '# HELP ttv_irc_received_bytes_total Bytes of received frames',
+        '# TYPE ttv_irc_received_bytes_total counter',
+        'ttv_irc_received_bytes_total 100',
+        '# HELP ttv_irc_handler_seconds Seconds of event handlers by event',
+        '# TYPE ttv_irc_handler_seconds histogram',
+        'ttv_irc_handler_seconds_bucket{event="on_message",le="0.1"} 1',
+        'ttv_irc_handler_seconds_bucket{event="on_message",le="1.0"} 2',
+        'ttv_irc_handler_seconds_bucket{event="on_message",le="+Inf"} 3',
+        'ttv_irc_handler_seconds_sum{event="on_message"} 5.55',
+        'ttv_irc_handler_seconds_count{event="on_message"} 3',
+    ]
+    metrics.reset()
+    assert metrics.to_prometheus() == ''
+
+
+@pytest.mark.asyncio
+async def test_client_metrics():
+    class LClient(Client):
+        async def on_user_join(self, channel, login):
+            await asyncio.sleep(0.01)
+
+    metrics = Metrics()
+    bot = LClient('token', 'login', metrics=metrics)
+    assert bot._irc_conn.metrics is metrics
+    for irc_msg in CHANNEL_PARTS:
+        await bot._handle_command(irc_msg)
+    bot._stamp_received([JOIN])
+    await bot._handle_command(JOIN)
+    await asyncio.sleep(0.02)
+    assert metrics.get(Metrics.DISPATCH_SECONDS).count == 1
+    assert JOIN.received_at is None
+    histogram = metrics.get(Metrics.HANDLER_SECONDS, 'on_user_join')
+    assert histogram.count == 1 and histogram.sum >= 0.01
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from tests.test_irc.test_irc_connections import FakeWebSocket
+from ttv.irc import TTVIRCClient
+from ttv.irc import TokenBucket, RateLimits, OutboundScheduler
+
+
+def test_token_bucket():
+    bucket = TokenBucket(2, 10)
+    assert bucket.delay(2) == 0
+    bucket.take(2)
+    assert 4.9 < bucket.delay() <= 5
+    assert 9.9 < bucket.delay(2) <= 10
+    with pytest.raises(ValueError):
+        bucket.delay(3)
+
+
+@pytest.mark.asyncio
+async def test_outbound_scheduler():
+    sent = []
+
+    async def send(raw_command: str):
+        sent.append(raw_command)
+
+    scheduler = OutboundScheduler(send, RateLimits(privmsg=(1, 0.01)))
+    scheduling = [
+        asyncio.create_task(scheduler.schedule(scheduler.PRIVMSG, 'first')),
+        asyncio.create_task(scheduler.schedule(scheduler.PRIVMSG, 'second', scheduler.LOW)),
+        asyncio.create_task(scheduler.schedule(scheduler.PRIVMSG, 'third')),
+        asyncio.create_task(scheduler.schedule(scheduler.PRIVMSG, '/ban username', scheduler.HIGH)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queued == 4 and scheduler.stats[scheduler.PRIVMSG].queued == 4
+    await asyncio.gather(*scheduling)
+    assert sent == ['/ban username', 'first', 'third', 'second']
+    stats = scheduler.stats[scheduler.PRIVMSG]
+    assert stats.sent == 4 and stats.queued == 0
+    assert stats.max_wait >= 0.02  # the last message has waited for three units of the bucket
+    assert scheduler.stats[scheduler.JOIN].sent == 0
+    # the channel's tier
+    assert scheduler.get_msg_lane('target') == scheduler.PRIVMSG
+    scheduler.set_moderated('target', True)
+    assert scheduler.get_msg_lane('target') == scheduler.MODERATOR_PRIVMSG
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_irc_client():
+    irc_client = TTVIRCClient('justinfan0', '', rate_limits=RateLimits(joins=(2, 0.01), privmsg=(10, 0.01)))
+    irc_client._ws = FakeWebSocket([])
+    await irc_client.join_channels('a', 'b', 'c', 'd', 'e')
+    assert irc_client._ws.sent == ['JOIN #a,#b\r\n', 'JOIN #c,#d\r\n', 'JOIN #e\r\n']
+    irc_client._ws.sent.clear()
+    await irc_client.send_msg('a', 'content')
+    await irc_client.send_whisper('username', 'content')
+    assert irc_client._ws.sent == ['PRIVMSG #a :content\r\n', 'PRIVMSG #ananonymousgifter :/w username content\r\n']
+    assert irc_client.scheduler.stats[OutboundScheduler.WHISPER].sent == 1
@@ -0,0 +1,29 @@
+import pytest
+
+from tests.test_irc.test_irc_connections import fake_irc_client
+from ttv.irc import FrameRecorder, read_frames
+
+
+def test_frame_recorder(tmp_path):
+    path = str(tmp_path / 'traffic.rec.gz')
+    with FrameRecorder(path) as recorder:
+        recorder.record('PRIVMSG #target :one\r\n', 100.0)
+        recorder.record('PRIVMSG #target :два\r\nJOIN #target\r\n', 100.5)
+    assert recorder.frames == 2
+    assert list(read_frames(path)) == [
+        (0.0, 'PRIVMSG #target :one\r\n'),
+        (0.5, 'PRIVMSG #target :два\r\nJOIN #target\r\n')
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_batches_records_frames(tmp_path):
+    path = str(tmp_path / 'traffic.rec.gz')
+    frames = ('PRIVMSG #target :one\r\nPRIVMSG #target :two\r\n', 'PING :tmi.twitch.tv\r\n')
+    irc_client = fake_irc_client(*frames)
+    with FrameRecorder(path) as recorder:
+        irc_client.set_recorder(recorder)
+        _ = [batch async for batch in irc_client.iter_batches()]
+    recorded = list(read_frames(path))
+    assert [frame for _, frame in recorded] == list(frames)  # frames without messages are recorded too
+    assert recorded[0][0] == 0 and recorded[1][0] >= 0
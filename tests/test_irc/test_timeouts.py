@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from ttv.irc import TimeoutQueue
+from ttv.irc.channels_accumulators import ChannelsAccumulator
+
+
+@pytest.mark.asyncio
+async def test_timeout_queue():
+    expired = []
+    timeouts = TimeoutQueue(0.2, expired.append)  # margins of 50 ms keep it stable on a loaded machine
+    timeouts.add('a')
+    timeouts.add('b')
+    timeouts.add('c')
+    assert timeouts.remove('a') and not timeouts.remove('a')
+    await asyncio.sleep(0.1)
+    timeouts.add('b')  # restarted, expires after 'c'
+    assert len(timeouts) == 2 and 'b' in timeouts
+    await asyncio.sleep(0.15)  # 'c' expires at 0.2, 'b' - at 0.3
+    assert expired == ['c']
+    await asyncio.sleep(0.15)
+    assert expired == ['c', 'b'] and len(timeouts) == 0
+    timeouts.add('d')
+    timeouts.clear()
+    await asyncio.sleep(0.3)
+    assert expired == ['c', 'b']
+
+
+@pytest.mark.asyncio
+async def test_accumulation_timeouts():
+    ready = []
+    accumulator = ChannelsAccumulator(
+        channel_ready_callback=ready.append,
+        irc_conn=None,
+        accumulation_timeout=0.1,
+        is_anon=True
+    )
+    accumulator.start_accumulations('a', 'b')
+    accumulator.abort_accumulations('a')
+    assert not accumulator.is_accumulating('a') and accumulator.is_accumulating('b')
+    await asyncio.sleep(0.2)
+    assert [channel.login for channel in ready] == ['b'] and not accumulator.is_accumulating('b')
+    accumulator.start_accumulations('c')
+    accumulator.close()
+    await asyncio.sleep(0.2)
+    assert len(ready) == 1
@@ -96,3 +96,35 @@ def test_remove_not_valid_postfix():
     assert remove_not_valid_postfix('BAZBARFOO', invalid_symbols=invalids) == ''
     assert remove_not_valid_postfix('BAZBARFOO_', invalid_symbols=invalids) == 'BAZBARFOO_'
     assert remove_not_valid_postfix('B_B', invalid_symbols=invalids) == 'B_'
+
+
+def test_slotted_cached_property():
+    class Slotted:
+        __slots__ = ('calls', '_value')
+
+        def __init__(self):
+            self.calls = 0
+
+        @slotted_cached_property
+        def value(self):
+            self.calls += 1
+            return self.calls
+
+    slotted = Slotted()
+    assert slotted.value == slotted.value == 1
+    assert slotted.calls == 1
+    slotted.value = 10
+    assert slotted.value == 10
+    del slotted.value
+    assert slotted.value == 2
+    assert not hasattr(slotted, '__dict__')
+
+
+def test_split_channels():
+    assert split_channels('JOIN', []) == []
+    assert split_channels('JOIN', ['a', 'b', 'c'], max_channels=2) == [['a', 'b'], ['c']]
+    channels = ['a' * 250, 'b' * 250, 'c']
+    chunks = split_channels('JOIN', channels)
+    assert chunks == [channels[:2], channels[2:]]
+    assert len('JOIN #' + ',#'.join(chunks[0]) + '\r\n') == 510
+    assert split_channels('JOIN', channels, max_length=509) == [channels[:1], channels[1:]]
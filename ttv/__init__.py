@@ -1,4 +1,4 @@
-from . import api, eventsub, irc
+from . import api, backends, eventsub, irc
 
 import logging
 
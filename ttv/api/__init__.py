@@ -1,5 +1,9 @@
 from .client import Api
+from . import batching
+from . import cache
 from . import requests
 from . import exceptions
+from . import rate_limits
+from . import session
 
-__all__ = ('Api', 'requests', 'exceptions',)
+__all__ = ('Api', 'batching', 'cache', 'requests', 'exceptions', 'rate_limits', 'session',)
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .exceptions import HTTPError
+
+__all__ = ('LookupBatcher', 'MAX_LOOKUP_VALUES', 'chunked')
+
+MAX_LOOKUP_VALUES = 100  # ids or logins a single Helix request takes
+
+
+def chunked(
+        values: List[Any],
+        size: int = MAX_LOOKUP_VALUES
+) -> List[List[Any]]:
+    return [values[index:index + size] for index in range(0, len(values), size)]
+
+
+def _normalize(value: Any) -> str:
+    """Logins and names are matched case-insensitively, ids are the same either way"""
+    return str(value).casefold()
+
+
+class LookupBatcher:
+    """
+    Collects lookups of single values (ids, logins, names) made by concurrent callers during `window` seconds
+    and requests them together, up to :data:`MAX_LOOKUP_VALUES` values per request.
+    Each caller gets the items of its own value. Is used by :class:`Api` if `batch_window` is set.
+
+    If a request of several values fails with :exc:`HTTPError` of status 400 (one of the values is malformed),
+    the values are requested again in halves, so only lookups of the invalid value get the error.
+    Any other error fails all the lookups of the request.
+
+    Args:
+        fetch: Callable[[List[`Any`]], Awaitable[List[`dict`]]]
+            requests items of the given values
+        field: `str`
+            key of a returned item that holds the value it's looked up by
+        window: `float`
+            seconds lookups are collected for after the first one,
+            0 - lookups made in the same iteration of the event loop are requested together
+
+    Attributes:
+        lookups: `int`
+            count of lookups made
+        requests: `int`
+            count of `fetch` calls made for them
+    """
+
+    def __init__(
+            self,
+            fetch: Callable[[List[Any]], Awaitable[List[dict]]],
+            field: str,
+            window: float
+    ) -> None:
+        self.field: str = field
+        self.window: float = window
+        self.lookups: int = 0
+        self.requests: int = 0
+        self._fetch = fetch
+        self._pending: Dict[str, List[asyncio.Future]] = {}  # normalized value: futures of its callers
+        self._values: Dict[str, Any] = {}  # normalized value: value as it is requested
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def lookup(
+            self,
+            value: Any
+    ) -> List[dict]:
+        """Returns items of the value, an empty list if nothing is found"""
+        self.lookups += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = _normalize(value)
+        try:
+            self._pending[key].append(future)
+        except KeyError:
+            self._pending[key] = [future]
+            self._values[key] = value
+        if len(self._pending) >= MAX_LOOKUP_VALUES:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, values = self._pending, self._values
+        self._pending, self._values = {}, {}
+        task = asyncio.create_task(self._request(pending, values))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _request(
+            self,
+            pending: Dict[str, List[asyncio.Future]],
+            values: Dict[str, Any]
+    ) -> None:
+        self.requests += 1
+        try:
+            items = await self._fetch(list(values.values()))
+        except HTTPError as e:
+            if len(values) == 1 or self._get_status(e) != 400:  # only a malformed value is isolated by halving
+                self._set_exception(pending, e)
+                return
+            keys = list(values)
+            halves = (keys[:len(keys) // 2], keys[len(keys) // 2:])
+            await asyncio.gather(*(
+                self._request({key: pending[key] for key in half}, {key: values[key] for key in half})
+                for half in halves
+            ))
+            return
+        except Exception as e:
+            self._set_exception(pending, e)
+            return
+        found: Dict[str, List[dict]] = {key: [] for key in pending}
+        for item in items:
+            key = _normalize(item.get(self.field))
+            if key in found:
+                found[key].append(item)
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():  # the caller may be cancelled
+                    future.set_result(list(found[key]))
+
+    @staticmethod
+    def _get_status(error: HTTPError) -> Optional[int]:
+        json = error.args[0] if error.args else None
+        return json.get('status') if isinstance(json, dict) else None
+
+    @staticmethod
+    def _set_exception(
+            pending: Dict[str, List[asyncio.Future]],
+            exception: Exception
+    ) -> None:
+        for futures in pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exception)
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(field={self.field!r}, window={self.window}, '
+                f'lookups={self.lookups}, requests={self.requests})')
@@ -0,0 +1,187 @@
+import asyncio
+from collections import OrderedDict
+from functools import partial
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+__all__ = ('ResponseCache',)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Makes a value of a param hashable: iterables of ids/logins become tuples"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    elif isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return tuple(_freeze(item) for item in value)
+
+
+class _Entry:
+    __slots__ = ('name', 'params', 'expires_at', 'value')
+
+    def __init__(self, name: str, params: Dict[str, Hashable], expires_at: float, value: Any) -> None:
+        self.name: str = name
+        self.params: Dict[str, Hashable] = params
+        self.expires_at: float = expires_at
+        self.value: Any = value
+
+
+class ResponseCache:
+    """
+    Keeps results of read-only (GET) requests of :class:`Api` for a TTL of the request,
+    the least recently used results are evicted beyond `max_size` of them.
+    Identical requests made while the first of them is in flight wait for its result instead of being sent.
+
+    Results are shared by the callers, they must not be changed.
+    Results of paginated requests are cached as a whole: all their items (up to the `limit`)
+    are requested before the first one is yielded.
+
+    Args:
+        ttls: Dict[`str`, `float`]
+            seconds results of the request are kept for, by name of the request (e.g. 'get_users').
+            Requests missing here aren't cached. Default: :attr:`DEFAULT_TTLS`.
+        max_size: `int`
+            max count of kept results. Default: 1000.
+
+    Attributes:
+        hits: `int`
+            count of requests answered by a kept result
+        misses: `int`
+            count of sent requests
+        coalesced: `int`
+            count of requests that waited for an identical request in flight
+        evictions: `int`
+            count of results evicted by `max_size`
+
+    Examples:
+        >>> cache = ResponseCache({'get_users': 600, 'get_games': 3600})
+        >>> api = await Api.create(token, cache=cache)
+        >>> ...
+        >>> await api.modify_channel_information(broadcaster_id, title='new title')  # invalidates by itself
+        >>> cache.invalidate('get_users', id=user_id)
+    """
+    DEFAULT_TTLS: Dict[str, float] = {
+        'get_users': 300,
+        'get_channel_information': 60,
+        'get_games': 3600,
+        'get_cheermotes': 3600,
+        'get_all_stream_tags': 3600,
+    }
+
+    def __init__(
+            self,
+            ttls: Optional[Dict[str, float]] = None,
+            *,
+            max_size: int = 1000
+    ) -> None:
+        self.ttls: Dict[str, float] = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()  # the least recently used first
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._generation: int = 0  # is increased by invalidation, results requested before aren't kept
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / requests if requests else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cached(
+            self,
+            name: Optional[str]
+    ) -> bool:
+        return name in self.ttls
+
+    async def get(
+            self,
+            name: str,
+            params: Dict[str, Any],
+            request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        |Coroutine|
+        Returns the kept result of the request with the params, or the result of an identical request in flight,
+        or requests it by `request`.
+        """
+        frozen = {key: _freeze(value) for key, value in params.items() if value is not None}
+        key = (name, tuple(sorted(frozen.items())))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            del self._entries[key]
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._in_flight[key] = asyncio.create_task(request())
+            task.add_done_callback(partial(self._keep, key, name, frozen, self._generation))
+        # a cancelled caller doesn't cancel the request, others may wait for it
+        return await asyncio.shield(task)
+
+    def invalidate(
+            self,
+            name: Optional[str] = None,
+            **params: Any
+    ) -> int:
+        """
+        Drops kept results of the request (of all requests if `name` is None) made with the params,
+        e.g. `invalidate('get_users', id='123')` drops results of `get_users` requested by that id
+        (alone or among others). Results of requests in flight aren't kept.
+
+        Returns:
+            count of dropped results
+        """
+        self._generation += 1
+        keys = [
+            key for key, entry in self._entries.items()
+            if (name is None or entry.name == name) and all(
+                self._matches(entry.params.get(param), value) for param, value in params.items()
+            )
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    @staticmethod
+    def _matches(
+            kept: Hashable,
+            value: Any
+    ) -> bool:
+        if isinstance(kept, tuple):
+            return value in kept
+        return kept == value
+
+    def _keep(
+            self,
+            key: Hashable,
+            name: str,
+            params: Dict[str, Hashable],
+            generation: int,
+            task: asyncio.Task
+    ) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None or generation != self._generation:
+            return
+        self._entries[key] = _Entry(name, params, monotonic() + self.ttls[name], task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(size={len(self._entries)}/{self.max_size}, hits={self.hits}, '
+                f'misses={self.misses}, coalesced={self.coalesced}, evictions={self.evictions})')
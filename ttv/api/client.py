@@ -1,11 +1,20 @@
+import asyncio
+import copy
+import weakref
+
 import aiohttp
 from aiohttp.client import ClientResponse
 from aiohttp.client_exceptions import ContentTypeError
 
-from .requests import SingleRequest, PaginatedRequest
+from .batching import LookupBatcher, MAX_LOOKUP_VALUES, chunked
+from .cache import ResponseCache
+from .rate_limits import RequestScheduler
+from .requests import SingleRequest, PaginatedRequest, set_names
+from .session import SessionOptions
 from .exceptions import HTTPError, InvalidToken
+from ..backends import JsonBackend, get_json_backend, STDLIB_JSON
 
-from typing import Dict, Union, Iterable, List, Optional, AsyncGenerator, Any, Callable, Awaitable
+from typing import Dict, Union, Iterable, List, Optional, AsyncGenerator, Any, Callable, Awaitable, Tuple
 
 __all__ = (
     'Api',
@@ -21,9 +30,71 @@ class Api:
                 Before calling a request, Authorization-Token must be set, see self.set_token() and Api.create() methods
             2nd:
                 All object's attributes is None before set_token() is successfully called
+
+        Args:
+            json_backend: `str`
+                JSON codec responses are decoded with: 'json', 'orjson' or 'auto' (orjson if it's installed),
+                see :func:`ttv.backends.get_json_backend`. Default: 'json'.
+            prefetch: `int`
+                count of pages of paginated requests requested ahead while yielded items are being handled,
+                0 - the next page is requested only when all items of the current one are handled. Default: 0.
+                May be set for a single request, e.g. `get_streams(0, prefetch=4)`.
+            max_prefetched_items: `int`
+                pages aren't prefetched while the prefetched ones hold that many items. Default: 1000.
+            batch_window: Optional[`float`]
+                seconds lookups of a single id/login by `get_users`, `get_streams`, `get_games` and
+                `get_channel_information` are collected for to be requested together, up to 100 per request,
+                see :class:`ttv.api.batching.LookupBatcher`. 0 - lookups made at the same moment are batched.
+                Default: None (each lookup is requested on its own).
+            scheduler: Optional[:class:`ttv.api.rate_limits.RequestScheduler`]
+                paces requests within rate limits of the token, retries ones answered with 429 or 5XX.
+                Default: None (the scheduler shared by all such objects in the running event loop).
+            priority: `int`
+                priority of requests in the scheduler, e.g. `RequestScheduler.LOW` for bulk crawls,
+                see :meth:`with_priority`. Default: `RequestScheduler.NORMAL`.
+            session_options: :class:`ttv.api.session.SessionOptions`
+                connection pool and timeouts of the session the object owns. Default: `SessionOptions()`.
+            session_factory: Optional[Callable[[], :class:`aiohttp.ClientSession`]]
+                creates the session instead of `session_options`, is called in a running event loop.
+                The object owns the created session and closes it by :meth:`close`. Default: None.
+            cache: Optional[:class:`ttv.api.cache.ResponseCache`]
+                keeps results of read-only requests (`get_users`, `get_games` etc.) for a TTL,
+                identical requests in flight are sent once. May be shared by objects using the same token.
+                Default: None (nothing is cached).
+
+        Notes:
+            Each object has its own session, it's created by the first request and closed by :meth:`close`
+            or at exit of `async with`:
+                >>> async with await Api.create(token) as api:
+                >>>     ...
+            More than 100 ids/logins given to these methods at once are requested by parallel requests of 100.
         """
 
-    def __init__(self):
+    def __init__(
+            self,
+            *,
+            json_backend: str = 'json',
+            prefetch: int = 0,
+            max_prefetched_items: int = 1000,
+            batch_window: Optional[float] = None,
+            scheduler: Optional[RequestScheduler] = None,
+            priority: int = RequestScheduler.NORMAL,
+            session_options: Optional[SessionOptions] = None,
+            session_factory: Optional[Callable[[], aiohttp.ClientSession]] = None,
+            cache: Optional[ResponseCache] = None
+    ):
+        self._json: JsonBackend = get_json_backend(json_backend)
+        self.prefetch: int = prefetch
+        self.max_prefetched_items: int = max_prefetched_items
+        self.batch_window: Optional[float] = batch_window
+        self._batchers: Dict[Tuple[str, str], LookupBatcher] = {}  # (url, key of the param): batcher
+        self.scheduler: Optional[RequestScheduler] = scheduler
+        self.priority: int = priority
+        self.session_options: SessionOptions = session_options if session_options is not None else SessionOptions()
+        self._session_factory: Optional[Callable[[], aiohttp.ClientSession]] = session_factory
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache: Optional[ResponseCache] = cache
+        self._session_owner: Optional[Api] = None  # the object a copy made by `with_priority` uses the session of
         self._headers: Optional[Dict[str, str]] = None
         self.token: Optional[str] = None
         self.scopes: Optional[List[str]] = None
@@ -36,7 +107,8 @@ class Api:
     @classmethod
     async def create(
             cls,
-            token: str
+            token: str,
+            **kwargs
     ):
         """
         |Coroutine|
@@ -47,6 +119,8 @@ class Api:
         Args:
             token: `str`
                 your Authorization-token
+            **kwargs:
+                passed to the constructor
 
         Examples:
             1. >>>> ttv_api = await Api.create(api_token)
@@ -55,7 +129,7 @@ class Api:
             `cls` created and initialized object
         """
 
-        api = cls()
+        api = cls(**kwargs)
         await api.set_token(token)
         return api
 
@@ -88,7 +162,8 @@ class Api:
         url = 'https://id.twitch.tv/oauth2/validate'  # url to check token
         try:
             json = await self._get_response(
-                self._get_open_session().get(url, headers=self._headers)
+                self._get_open_session().get(url, headers=self._headers),
+                self._json
             )
         except HTTPError as e:
             json: dict = e.args[0]
@@ -159,9 +234,10 @@ class Api:
             params['grant_type'] = grant_type
 
         url = 'https://id.twitch.tv/oauth2/token'  # url to create app token
-        json = await cls._get_response(
-            cls._get_open_session().post(url, params=params)
-        )
+        async with SessionOptions().create_session() as session:
+            json = await cls._get_response(
+                session.post(url, params=params)
+            )
         return json
     #
     # initialization methods
@@ -170,38 +246,102 @@ class Api:
     #################################
     # requests methods
     #
-    _session: aiohttp.ClientSession = None
-    'session container'
+    _schedulers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RequestScheduler]' = weakref.WeakKeyDictionary()
+    'schedulers of requests shared by objects created without their own one, by event loop'
+
+    def _get_scheduler(self) -> RequestScheduler:
+        """returns `self.scheduler`, if it's None -> the scheduler shared in the running event loop"""
+        if self.scheduler is not None:
+            return self.scheduler
+        loop = asyncio.get_running_loop()
+        try:
+            return Api._schedulers[loop]
+        except KeyError:
+            scheduler = Api._schedulers[loop] = RequestScheduler()
+            return scheduler
 
-    @staticmethod
-    def _get_open_session():
+    def _get_open_session(self) -> aiohttp.ClientSession:
         """
-        returns open session, if `Api._session` is open -> `Api._session`.
-        else -> open new one, save to `Api._session` and return
+        returns open session, if `self._session` is open -> `self._session`.
+        else -> open new one by `self._session_factory` or `self.session_options`, save to `self._session` and return
 
         Returns:
             (aiohttp.ClientSession)
         """
-        if Api._session is None or Api._session.closed:
-            Api._session = aiohttp.ClientSession()
-        return Api._session
+        if self._session_owner is not None:
+            return self._session_owner._get_open_session()
+        if self._session is None or self._session.closed:
+            if self._session_factory is not None:
+                self._session = self._session_factory()
+            else:
+                self._session = self.session_options.create_session(self._json.dumps)
+        return self._session
 
-    @classmethod
-    async def close(cls):
-        await cls._session.close()
+    async def close(self) -> None:
+        """|Coroutine| Closes the session of the object, the next request opens a new one"""
+        if self._session is not None and self._session_owner is None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'Api':
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
 
     @staticmethod
     async def _get_response(
-            request: Awaitable
+            request: Awaitable,
+            json_backend: JsonBackend = STDLIB_JSON
     ) -> Optional[Dict]:
         async with request as response:
             if 199 < response.status < 300:
                 try:
-                    return await response.json()
+                    return await response.json(loads=json_backend.loads)
                 except ContentTypeError:
                     return None
             else:
-                raise HTTPError(await response.json())
+                raise HTTPError(await response.json(loads=json_backend.loads))
+
+    def with_priority(
+            self,
+            priority: int
+    ) -> 'Api':
+        """
+        Returns a copy of the object sending requests with the given priority by the same token and scheduler,
+        e.g. to let moderation requests overtake a bulk crawl. The copy uses the session of the object,
+        its :meth:`close` does nothing.
+
+        Examples:
+            >>> moderation_api = api.with_priority(RequestScheduler.HIGH)
+            >>> await moderation_api.check_automod_status(data)
+        """
+        api = copy.copy(self)
+        api.priority = priority
+        api._batchers = {}
+        api._session = None
+        api._session_owner = self._session_owner or self
+        return api
+
+    async def _http_request(
+            self,
+            method: str,
+            url: str,
+            **kwargs
+    ) -> Optional[dict]:
+        """Sends the request by the scheduler, returns json of the response"""
+        async def send():
+            async with self._get_open_session().request(method, url, headers=self._headers, **kwargs) as response:
+                try:
+                    json = await response.json(loads=self._json.loads)
+                except ContentTypeError:
+                    json = None
+                return response.status, response.headers, json
+
+        status, _, json = await self._get_scheduler().request(self.token, send, self.priority)
+        if 199 < status < 300:
+            return json
+        raise HTTPError(json if json is not None else {'status': status})
 
     async def _http_get(
             self,
@@ -209,10 +349,7 @@ class Api:
             data: dict = None,
             params: dict = None
     ) -> Optional[dict]:
-        json = await self._get_response(
-            self._get_open_session().get(url, data=data, params=params, headers=self._headers)
-        )
-        return json
+        return await self._http_request('GET', url, data=data, params=params)
 
     async def _http_post(
             self,
@@ -220,10 +357,7 @@ class Api:
             data: dict = None,
             params: dict = None
     ) -> Optional[dict]:
-        json = await self._get_response(
-            self._get_open_session().post(url, json=data, params=params, headers=self._headers)
-        )
-        return json
+        return await self._http_request('POST', url, json=data, params=params)
 
     async def _http_put(
             self,
@@ -231,10 +365,7 @@ class Api:
             data: dict = None,
             params: dict = None
     ) -> Optional[dict]:
-        json = await self._get_response(
-            self._get_open_session().put(url, json=data, params=params, headers=self._headers)
-        )
-        return json
+        return await self._http_request('PUT', url, json=data, params=params)
 
     async def _http_patch(
             self,
@@ -242,10 +373,7 @@ class Api:
             data: dict = None,
             params: dict = None
     ) -> Optional[dict]:
-        json = await self._get_response(
-            self._get_open_session().patch(url, json=data, params=params, headers=self._headers)
-        )
-        return json
+        return await self._http_request('PATCH', url, json=data, params=params)
 
     async def _http_delete(
             self,
@@ -253,10 +381,7 @@ class Api:
             data: dict = None,
             params: dict = None
     ) -> Optional[dict]:
-        json = await self._get_response(
-            self._get_open_session().delete(url, data=data, params=params, headers=self._headers)
-        )
-        return json
+        return await self._http_request('DELETE', url, data=data, params=params)
 
     @staticmethod
     def _set_additional_data(
@@ -286,12 +411,14 @@ class Api:
             raw_params: dict,
             limit: int,
             *,
-            additional_data: Optional[dict] = None
+            additional_data: Optional[dict] = None,
+            prefetch: Optional[int] = None
     ):
 
         """yields all that yields called method `self.do_paginated_request`"""
         request = Api.paginated_requests[request_name]
-        async for json_part in self.do_paginated_request(request, raw_params, limit, additional_data=additional_data):
+        async for json_part in self.do_paginated_request(request, raw_params, limit, additional_data=additional_data,
+                                                         prefetch=prefetch):
             yield json_part
 
     async def do_single_request(
@@ -305,6 +432,19 @@ class Api:
         basing on `request.data_params_keys` and `request.query_params_keys`"""
         # prepare data
         data, params = request.distribute_raw_params(raw_params)
+        if (self.cache is not None and additional_data is None and request.http_method is Api._http_get
+                and self.cache.is_cached(request.name)):
+            return await self.cache.get(request.name, {**data, **params},
+                                        lambda: self._request_single(request, data, params))
+        return await self._request_single(request, data, params, additional_data)
+
+    async def _request_single(
+            self,
+            request: SingleRequest,
+            data: Dict[str, Any],
+            params: Dict[str, Any],
+            additional_data: Optional[dict] = None
+    ) -> Any:
         # get request
         json = await request.http_method(self, url=request.url, data=data, params=params)
         if additional_data is not None:
@@ -317,16 +457,93 @@ class Api:
             raw_params: Dict[str, Any],
             limit: int,
             *,
-            additional_data: Optional[dict] = None
+            additional_data: Optional[dict] = None,
+            prefetch: Optional[int] = None
     ) -> AsyncGenerator[dict, None]:
         """Does single request based on url from `request.url`, with selected not None params from `raw_params`
-        basing on `request.data_params_keys` and `request.query_params_keys`"""
+        basing on `request.data_params_keys` and `request.query_params_keys`.
+        `prefetch` - count of pages requested ahead, `self.prefetch` if None"""
         data, params = request.distribute_raw_params(raw_params, limit)
+        if self.cache is not None and additional_data is None and self.cache.is_cached(request.name):
+            # iterables of ids/logins are read by the cache and by the request
+            params = {key: value if isinstance(value, (str, int)) else list(value) for key, value in params.items()}
+            items = await self.cache.get(
+                request.name, {**data, **params, 'limit': limit},
+                lambda: self._collect(self._request_pages(request, data, params, limit, None, prefetch))
+            )
+            for item in items:
+                yield item
+            return
+        async for json_part in self._request_pages(request, data, params, limit, additional_data, prefetch):
+            yield json_part
+
+    @staticmethod
+    async def _collect(
+            generator: AsyncGenerator[Any, Any]
+    ) -> List[Any]:
+        return [item async for item in generator]
+
+    async def _request_pages(
+            self,
+            request: PaginatedRequest,
+            data: Dict[str, Any],
+            params: Dict[str, Any],
+            limit: int,
+            additional_data: Optional[dict],
+            prefetch: Optional[int]
+    ) -> AsyncGenerator[dict, None]:
+        lookup = request.get_lookup_param(data, params) if additional_data is None else None
+        if lookup is not None:
+            key, value = lookup
+            if isinstance(value, (str, int)):
+                if self.batch_window is not None:
+                    items = await self._get_batcher(request, key).lookup(value)
+                    for item in items[:limit] if limit > 0 else items:
+                        yield item
+                    return
+            elif len(values := list(value)) > MAX_LOOKUP_VALUES:
+                chunks = await asyncio.gather(*(self._request_lookup(request, key, chunk) for chunk in chunked(values)))
+                items = [item for chunk in chunks for item in chunk]
+                for item in items[:limit] if limit > 0 else items:
+                    yield item
+                return
+            else:
+                params[key] = values
         async for json_part in self._handle_pagination(request.url, limit, data, params,
                                                        response_json_preparer=request.response_json_preparer,
-                                                       additional_data=additional_data):
+                                                       additional_data=additional_data,
+                                                       prefetch=self.prefetch if prefetch is None else prefetch):
             yield json_part
 
+    def _get_batcher(
+            self,
+            request: PaginatedRequest,
+            key: str
+    ) -> LookupBatcher:
+        try:
+            return self._batchers[request.url, key]
+        except KeyError:
+            batcher = self._batchers[request.url, key] = LookupBatcher(
+                lambda values: self._request_lookup(request, key, values), request.lookup_keys[key], self.batch_window
+            )
+            return batcher
+
+    async def _request_lookup(
+            self,
+            request: PaginatedRequest,
+            key: str,
+            values: List[Any]
+    ) -> List[dict]:
+        """Returns all items of up to 100 ids/logins given as `key` param of the request"""
+        params = {key: values}
+        if 'first' in request.query_params_keys:
+            params['first'] = request.calc_first_param(len(values))
+        return [
+            item async for item in self._handle_pagination(
+                request.url, 0, None, params, response_json_preparer=request.response_json_preparer
+            )
+        ]
+
     async def _handle_pagination(
             self,
             url: str,
@@ -335,7 +552,8 @@ class Api:
             params: Optional[dict] = None,
             *,
             response_json_preparer: Callable[[dict], Iterable] = lambda json: json['data'] if (json is not None) else [],
-            additional_data: Optional[dict] = None
+            additional_data: Optional[dict] = None,
+            prefetch: int = 0
     ) -> AsyncGenerator[dict, None]:
         """
         |Async Generator|
@@ -352,32 +570,101 @@ class Api:
                 value of max count of Yields
             params: `dict`
                 params to insert in the URL
+            prefetch: `int`
+                count of pages requested ahead while items of the current one are being yielded,
+                0 - the next page is requested after all items of the current one are yielded
 
         Yields:
             parsed data of the response of the request
         """
+        pages = self._iter_pages(url, data, params, response_json_preparer)
+        if prefetch > 0:
+            pages = self._prefetch_pages(pages, limit, prefetch)
         counter = 0
+        try:
+            async for json, parts in pages:
+                if additional_data is not None:
+                    self._set_additional_data(json, additional_data)
+                for part in parts:
+                    yield part
+                    # if limit is reached
+                    counter += 1
+                    if counter == limit:  # if limit is 0 -> never True (unlimited)
+                        return
+        finally:
+            await pages.aclose()  # stops prefetching
+
+    async def _iter_pages(
+            self,
+            url: str,
+            data: Optional[dict],
+            params: Optional[dict],
+            response_json_preparer: Callable[[dict], Iterable]
+    ) -> AsyncGenerator[Tuple[Optional[dict], Iterable], None]:
+        """Requests pages one by one following the cursor, yields json of each page with its prepared items"""
         while True:
             json = await self._http_get(url=url, data=data, params=params)
-            if additional_data is not None:
-                self._set_additional_data(json, additional_data)
-            # parse
-            for part in response_json_preparer(json):
-                yield part
-                # if limit is reached
-                counter += 1
-                if counter == limit:  # if limit is 0 -> never True (unlimited)
-                    return
-            # prepare to new
+            yield json, response_json_preparer(json)
+            try:
+                cursor = json['pagination']['cursor']
+            # if can't get
+            except (KeyError, TypeError):  # no cursor or no json
+                return
+            # if have got
             else:
-                try:
-                    cursor = json['pagination']['cursor']
-                # if can't get
-                except KeyError:
+                params['after'] = cursor  # set or change
+
+    async def _prefetch_pages(
+            self,
+            pages: AsyncGenerator[Tuple[Optional[dict], Iterable], None],
+            limit: int,
+            depth: int
+    ) -> AsyncGenerator[Tuple[Optional[dict], List], None]:
+        """
+        Yields the same as `pages`, but pages are requested by a task up to `depth` pages ahead
+        while prefetched pages hold less than `self.max_prefetched_items` items.
+        Pages aren't requested after `limit` items are got.
+        """
+        queue: asyncio.Queue = asyncio.Queue(depth)
+        prefetched_items = 0
+        consumed = asyncio.Event()  # a page is taken from the queue
+
+        async def fetch():
+            nonlocal prefetched_items
+            fetched_items = 0
+            try:
+                while not 0 < limit <= fetched_items:
+                    while prefetched_items >= self.max_prefetched_items:  # the next page isn't requested yet
+                        consumed.clear()
+                        await consumed.wait()
+                    try:
+                        json, parts = await pages.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    parts = list(parts)  # items are prepared in advance too
+                    prefetched_items += len(parts)
+                    fetched_items += len(parts)
+                    await queue.put((json, parts, None))
+            except Exception as e:  # is raised to the consumer
+                await queue.put((None, None, e))
+                return
+            finally:
+                await pages.aclose()
+            await queue.put((None, None, None))  # the last page
+
+        task = asyncio.create_task(fetch())
+        try:
+            while True:
+                json, parts, error = await queue.get()
+                if error is not None:
+                    raise error
+                elif parts is None:
                     return
-                # if have got
-                else:
-                    params['after'] = cursor  # set or change
+                prefetched_items -= len(parts)
+                consumed.set()
+                yield json, parts
+        finally:
+            task.cancel()
 
     @staticmethod
     async def once(
@@ -845,7 +1132,7 @@ Input type:
     async def get_channel_information(
             self,
             limit: int,
-            broadcaster_id: str
+            broadcaster_id: Union[Iterable[str], str]
     ) -> AsyncGenerator[dict, None]:
         """
         |Coroutine|\n
@@ -854,8 +1141,8 @@ Input type:
 
         Args:
         ================
-            broadcaster_id: REQUIRED `str`
-                ID of the channel.
+            broadcaster_id: REQUIRED Union[`str`, Iterable[`str`]]
+                ID of the channel. Multiple IDs can be specified, by 100 per request.
 
         Returns:
         ================
@@ -928,7 +1215,10 @@ Input type:
             :class:`AccessError`:
                 if the Authorization-Token hasn't required scope
         """
-        return await self.do_single_request_by_name('modify_channel_information', locals())
+        result = await self.do_single_request_by_name('modify_channel_information', locals())
+        if self.cache is not None:
+            self.cache.invalidate('get_channel_information', broadcaster_id=broadcaster_id)
+        return result
 
     async def get_channel_editors(
             self,
@@ -2056,11 +2346,11 @@ Input type:
             limit: `int`
                 limit on number of returned values, 0 - unlimited
 
-            game_id: `str`
-                Game ID. At most 100 id values can be specified
+            game_id: Union[`str`, Iterable[`str`]]
+                Game ID. Multiple IDs can be specified, by 100 per request.
 
-            name: `str`
-                Game name. The name must be an exact match.
+            name: Union[`str`, Iterable[`str`]]
+                Game name. The name must be an exact match. Multiple names can be specified, by 100 per request.
                 For example, “Pokemon” will not return a list of Pokemon games;
                 instead, query any specific Pokemon games in which you are interested.
                 At most 100 name values can be specified.
@@ -2586,7 +2876,9 @@ Input type:
             game_id: Union[Iterable[str], str] = None,
             language: Union[Iterable[str], str] = None,
             user_id: Union[Iterable[str], str] = None,
-            user_login: Union[Iterable[str], str] = None
+            user_login: Union[Iterable[str], str] = None,
+            *,
+            prefetch: Optional[int] = None
     ) -> AsyncGenerator[dict, None]:
         """
         |Async Generator|\n
@@ -2608,11 +2900,16 @@ Input type:
                 A language value must be either the ISO 639-1
                 two-letter code for a supported stream language or “other”.
 
-            user_id: `str`
-                Returns streams broadcast by one or more specified user IDs. You can specify up to 100 IDs.
+            user_id: Union[`str`, Iterable[`str`]]
+                Returns streams broadcast by one or more specified user IDs. Limit: 100 per request,
+                more IDs are requested by parallel requests.
+
+            user_login: Union[`str`, Iterable[`str`]]
+                Returns streams broadcast by one or more specified user login names. Limit: 100 per request,
+                more names are requested by parallel requests.
 
-            user_login: `str`
-                Returns streams broadcast by one or more specified user login names. You can specify up to 100 names.
+            prefetch: `int`
+                count of pages requested ahead while yielded streams are being handled. Default: `self.prefetch`.
 
         Yields:
         ================
@@ -2661,7 +2958,7 @@ Input type:
             :class:`HTTPError`:
                 if status-code is not 2XX, passes `dict` with json of response.
         """
-        async for stream in self.do_paginated_request_by_name('get_streams', locals(), limit):
+        async for stream in self.do_paginated_request_by_name('get_streams', locals(), limit, prefetch=prefetch):
             yield stream
 
     async def create_stream_marker(
@@ -3013,8 +3310,8 @@ Input type:
     async def get_users(
             self,
             limit: int,
-            user_id: str = None,
-            login: str = None
+            user_id: Union[Iterable[str], str] = None,
+            login: Union[Iterable[str], str] = None
     ) -> AsyncGenerator[dict, None]:
         """
         |Async Generator|
@@ -3028,15 +3325,18 @@ Input type:
             limit: `int`
                 limit on number of returned values, 0 - unlimited
 
-            user_id: `int`
-                User ID. Multiple user IDs can be specified. Limit: 100.
+            user_id: Union[`str`, Iterable[`str`]]
+                User ID. Multiple user IDs can be specified. Limit: 100 per request,
+                more IDs are requested by parallel requests.
 
-            login: `str`
-                User login name. Multiple login names can be specified. Limit: 100.
+            login: Union[`str`, Iterable[`str`]]
+                User login name. Multiple login names can be specified. Limit: 100 per request,
+                more names are requested by parallel requests.
 
         Notes:
             Note: The limit of 100 IDs and login names is the total limit. You can request,
             for example, 50 of each or 100 of one of them. You cannot request 100 of both.
+            Only IDs or only login names are split by 100 into parallel requests.
 
         Yields:
         ================
@@ -3139,13 +3439,18 @@ Input type:
             :class:`AccessError`:
                 if the Authorization-Token hasn't required scope
         """
-        return await self.do_single_request_by_name('update_user', locals())
+        result = await self.do_single_request_by_name('update_user', locals())
+        if self.cache is not None:
+            self.cache.invalidate('get_users')  # the user of the token isn't known by id or login here
+        return result
 
     async def get_users_follows(
             self,
             limit: int,
             from_id: str = None,
-            to_id: str = None
+            to_id: str = None,
+            *,
+            prefetch: Optional[int] = None
     ) -> AsyncGenerator[dict, None]:
         """
         |Async Generator|
@@ -3168,6 +3473,9 @@ Input type:
             to_id: `str`
                 User ID. The request returns information about users who are following the to_id user.
 
+            prefetch: `int`
+                count of pages requested ahead while yielded follows are being handled. Default: `self.prefetch`.
+
             !Notes:
                 Note: At minimum, `from_id` or `to_id` must be provided for a query to be valid.
         ----------------
@@ -3198,7 +3506,8 @@ Input type:
                 if status-code is not 2XX, passes `dict` with json of response.
         ----------------
         """
-        async for follow in self.do_paginated_request_by_name('get_users_follows', locals(), limit):
+        async for follow in self.do_paginated_request_by_name('get_users_follows', locals(), limit,
+                                                              prefetch=prefetch):
             yield follow
 
     async def create_user_follows(
@@ -3575,7 +3884,7 @@ Input type:
                 extension['number'] = extension_number
                 yield extension
 
-    single_requests: Dict[str, SingleRequest] = {
+    single_requests: Dict[str, SingleRequest] = set_names({
         'start_commercial': SingleRequest(
             sub_url='/channels/commercial',
             http_method=_http_post,
@@ -3712,9 +4021,9 @@ Input type:
             http_method=_http_delete,
             query_params_keys=('id',),
         )
-    }
+    })
 
-    paginated_requests: Dict[str, PaginatedRequest] = {
+    paginated_requests: Dict[str, PaginatedRequest] = set_names({
         'get_extension_analytics': PaginatedRequest(
             sub_url='/analytics/extensions',
             max_first=100,
@@ -3741,7 +4050,8 @@ Input type:
         ),
         'get_channel_information': PaginatedRequest(
             sub_url='/channels',
-            query_params_keys=('broadcaster_id',)
+            query_params_keys=('broadcaster_id',),
+            lookup_keys={'broadcaster_id': 'broadcaster_id'}
         ),
         'get_channel_editors': PaginatedRequest(
             sub_url='/channels/editors',
@@ -3778,7 +4088,8 @@ Input type:
         'get_games': PaginatedRequest(
             sub_url='/games',
             max_first=100,
-            query_params_keys=('id', 'name')
+            query_params_keys=('id', 'name'),
+            lookup_keys={'id': 'id', 'name': 'name'}
         ),
         'get_eventsub_subscriptions': PaginatedRequest(
             sub_url='/eventsub/subscriptions',
@@ -3827,7 +4138,8 @@ Input type:
         'get_streams': PaginatedRequest(
             sub_url='/streams',
             max_first=100,
-            query_params_keys=('first', 'game_id', 'language', 'user_id', 'user_login')
+            query_params_keys=('first', 'game_id', 'language', 'user_id', 'user_login'),
+            lookup_keys={'user_id': 'user_id', 'user_login': 'user_login'}
         ),
         'get_stream_markers': PaginatedRequest(
             sub_url='/streams/markers',
@@ -3860,7 +4172,8 @@ Input type:
         ),
         'get_users': PaginatedRequest(
             sub_url='/users',
-            query_params_keys=('id', 'login')
+            query_params_keys=('id', 'login'),
+            lookup_keys={'id': 'id', 'login': 'login'}
         ),
         'get_users_follows': PaginatedRequest(
             sub_url='/users/follows',
@@ -3891,4 +4204,4 @@ Input type:
             sub_url='/webhooks/subscriptions',
             max_first=100,
         )
-    }
+    })
@@ -0,0 +1,276 @@
+import asyncio
+import heapq
+import random
+from itertools import count
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+__all__ = ('HelixBucket', 'RequestScheduler')
+
+Response = Tuple[int, Mapping[str, str], Any]  # status, headers, json
+
+
+class HelixBucket:
+    """
+    Estimated points of a Helix rate limit bucket, is updated by `Ratelimit-*` headers of responses.
+    A request spends a point, points are refilled continuously at `limit` per minute.
+
+    Attributes:
+        limit: Optional[`int`]
+            points per minute, None - unknown (no response is got yet or responses have no such headers)
+        reset_at: Optional[`float`]
+            :func:`time.time` time the bucket is full again at
+        in_flight: `int`
+            count of sent requests that aren't answered yet
+        known: `bool`
+            whether any response is got, requests are sent one by one until then
+    """
+    __slots__ = ('limit', 'reset_at', 'in_flight', 'known', '_remaining', '_updated_at')
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.in_flight: int = 0
+        self.known: bool = False
+        self._remaining: float = 0.0
+        self._updated_at: float = monotonic()
+
+    @property
+    def remaining(self) -> float:
+        """Points available now, without points of requests in flight"""
+        self._refill()
+        return self._remaining
+
+    def delay(self) -> float:
+        """Returns seconds until a request may be sent, 0 - if it may be sent now"""
+        if self.limit is None:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self._remaining) * 60 / self.limit)
+
+    def take(self) -> None:
+        """Spends a point on a sent request"""
+        self._refill()
+        self._remaining -= 1
+        self.in_flight += 1
+
+    def update(
+            self,
+            headers: Mapping[str, str]
+    ) -> None:
+        """Takes the state of the bucket from headers of a response to a request sent by :meth:`take`"""
+        self.release()
+        self.known = True
+        try:
+            limit = int(headers['Ratelimit-Limit'])
+            remaining = int(headers['Ratelimit-Remaining'])
+            reset_at = float(headers['Ratelimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        self.limit = limit
+        self.reset_at = reset_at
+        self._remaining = remaining - self.in_flight  # requests in flight aren't counted by Twitch yet
+        self._updated_at = monotonic()
+
+    def release(self) -> None:
+        """Counts a request sent by :meth:`take` as finished, e.g. the one that got no response"""
+        self.in_flight -= 1
+
+    def _refill(self) -> None:
+        now = monotonic()
+        if self.limit is not None:
+            self._remaining = min(self.limit, self._remaining + (now - self._updated_at) * self.limit / 60)
+        self._updated_at = now
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(limit={self.limit}, remaining={self.remaining:.2f}, '
+                f'in_flight={self.in_flight})')
+
+
+class _Lane:
+    """Requests spending the same bucket, ordered by priority and then by scheduling order"""
+    __slots__ = ('bucket', 'heap', 'task', 'answered', 'sending')
+
+    def __init__(self) -> None:
+        self.bucket: HelixBucket = HelixBucket()
+        self.heap: List[Tuple[int, int, int, Callable[[], Awaitable[Response]], asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.answered: Optional[asyncio.Future] = None  # is done when a response is got
+        self.sending: Set[asyncio.Task] = set()
+
+
+class RequestScheduler:
+    """
+    Sends requests of :class:`Api` within Helix rate limits. May be shared by any count of `Api` objects.
+
+    Each token has its own bucket, its state is taken from `Ratelimit-Limit`, `Ratelimit-Remaining`
+    and `Ratelimit-Reset` headers, requests are sent as soon as the bucket has a point for them.
+    Waiting requests are sent in order of priority (:attr:`HIGH`, :attr:`NORMAL`, :attr:`LOW`),
+    requests of the same priority - in scheduling order.
+    Requests answered with 429 or 5XX are sent again after a random backoff, up to `max_retries` times,
+    the last response is returned after that.
+
+    Args:
+        max_retries: `int`
+            count of retries of a request. Default: 3.
+        base_backoff: `float`
+            seconds of the backoff before the first retry, it doubles with each next retry,
+            the actual backoff is random from 0 to that. Default: 0.5.
+        max_backoff: `float`
+            the backoff doesn't grow beyond that. Default: 30.
+
+    Attributes:
+        retries: `int`
+            count of made retries
+
+    Examples:
+        >>> scheduler = RequestScheduler(max_retries=5)
+        >>> crawler = await Api.create(token, scheduler=scheduler, priority=RequestScheduler.LOW)
+        >>> moderator = await Api.create(token, scheduler=scheduler, priority=RequestScheduler.HIGH)
+    """
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+    def __init__(
+            self,
+            *,
+            max_retries: int = 3,
+            base_backoff: float = 0.5,
+            max_backoff: float = 30.0
+    ) -> None:
+        self.max_retries: int = max_retries
+        self.base_backoff: float = base_backoff
+        self.max_backoff: float = max_backoff
+        self.retries: int = 0
+        self._lanes: Dict[str, _Lane] = {}
+        self._counter = count()  # keeps scheduling order within a priority
+
+    def get_bucket(
+            self,
+            key: str
+    ) -> Optional[HelixBucket]:
+        """Returns the bucket of the token, None if nothing is requested by it yet"""
+        lane = self._lanes.get(key)
+        return lane.bucket if lane is not None else None
+
+    @property
+    def queued(self) -> int:
+        """Count of requests waiting to be sent, including ones waiting for a retry"""
+        return sum(len(lane.heap) for lane in self._lanes.values())
+
+    async def request(
+            self,
+            key: str,
+            send: Callable[[], Awaitable[Response]],
+            priority: int = NORMAL
+    ) -> Response:
+        """
+        |Coroutine|
+        Waits for the bucket of `key`, sends the request, retries it if needed.
+
+        Args:
+            key: `str`
+                token (or client ID) the request spends points of
+            send: Callable[[], Awaitable[Tuple[`int`, Mapping[`str`, `str`], `Any`]]]
+                sends the request, returns status, headers and json of the response, is called for each retry
+            priority: `int`
+                one of :attr:`HIGH`, :attr:`NORMAL`, :attr:`LOW`. Default: :attr:`NORMAL`.
+
+        Returns:
+            status, headers and json of the last response
+        """
+        try:
+            lane = self._lanes[key]
+        except KeyError:
+            lane = self._lanes[key] = _Lane()
+        future = asyncio.get_running_loop().create_future()
+        self._push(lane, priority, next(self._counter), 0, send, future)
+        return await future
+
+    async def close(self) -> None:
+        """Cancels waiting requests"""
+        for lane in self._lanes.values():
+            if lane.task is not None:
+                lane.task.cancel()
+            for *_, future in lane.heap:
+                future.cancel()
+            lane.heap.clear()
+
+    def _push(
+            self,
+            lane: _Lane,
+            priority: int,
+            order: int,
+            attempt: int,
+            send: Callable[[], Awaitable[Response]],
+            future: asyncio.Future
+    ) -> None:
+        heapq.heappush(lane.heap, (priority, order, attempt, send, future))
+        if lane.task is None:
+            lane.task = asyncio.create_task(self._drain(lane))
+
+    async def _drain(
+            self,
+            lane: _Lane
+    ) -> None:
+        try:
+            while lane.heap:
+                # the head is peeked again after waiting, a request of a higher priority may have come meanwhile
+                if not lane.bucket.known and lane.bucket.in_flight:  # the limit is learned by the first response
+                    lane.answered = asyncio.get_running_loop().create_future()
+                    await lane.answered
+                    continue
+                if (delay := lane.bucket.delay()) > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                priority, order, attempt, send, future = heapq.heappop(lane.heap)
+                if future.done():  # the caller doesn't wait anymore
+                    continue
+                lane.bucket.take()
+                task = asyncio.create_task(self._send(lane, priority, order, attempt, send, future))
+                lane.sending.add(task)
+                task.add_done_callback(lane.sending.discard)
+        finally:
+            lane.task = None
+
+    async def _send(
+            self,
+            lane: _Lane,
+            priority: int,
+            order: int,
+            attempt: int,
+            send: Callable[[], Awaitable[Response]],
+            future: asyncio.Future
+    ) -> None:
+        headers: Optional[Mapping[str, str]] = None
+        try:
+            status, headers, _ = response = await send()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        finally:
+            if headers is not None:
+                lane.bucket.update(headers)
+            else:  # a transport error tells nothing about the bucket
+                lane.bucket.release()
+            if lane.answered is not None and not lane.answered.done():
+                lane.answered.set_result(None)
+        if future.done():
+            return
+        if (status == 429 or status >= 500) and attempt < self.max_retries:
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            self._push(lane, priority, order, attempt + 1, send, future)  # keeps its place in the queue
+        else:
+            future.set_result(response)
+
+    def _backoff(
+            self,
+            attempt: int
+    ) -> float:
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(queued={self.queued}, retries={self.retries})'
@@ -1,11 +1,12 @@
 from dataclasses import InitVar, dataclass
-from typing import Iterable, Dict, Any, Tuple, Callable, Optional
+from typing import Iterable, Dict, Any, Tuple, Callable, Optional, TypeVar
 
 
 __all__ = (
     'BaseRequest',
     'SingleRequest',
-    'PaginatedRequest'
+    'PaginatedRequest',
+    'set_names'
 )
 
 
@@ -18,6 +19,7 @@ class BaseRequest:
     def __post_init__(self, sub_url: str):
         helix_url: str = 'https://api.twitch.tv/helix'
         self.url: str = helix_url + sub_url
+        self.name: Optional[str] = None  # is set by `set_names`
 
     @staticmethod
     def not_none_fromkeys(
@@ -58,6 +60,21 @@ class SingleRequest(BaseRequest):
 class PaginatedRequest(BaseRequest):
     max_first: int = 100
     response_json_preparer: Callable[[dict], Iterable] = lambda json: json['data'] if (json is not None) else ()
+    lookup_keys: Optional[Dict[str, str]] = None
+    'query param of ids/logins the request may be batched by: key of a returned item that holds the value'
+
+    def get_lookup_param(
+            self,
+            data: Dict[str, Any],
+            params: Dict[str, Any]
+    ) -> Optional[Tuple[str, Any]]:
+        """returns (key, value) of the param if the request looks up items only by one of `lookup_keys`"""
+        if not self.lookup_keys or data:
+            return None
+        keys = [key for key in params if key != 'first']
+        if len(keys) == 1 and keys[0] in self.lookup_keys:
+            return keys[0], params[keys[0]]
+        return None
 
     def calc_first_param(
             self,
@@ -81,3 +98,13 @@ class PaginatedRequest(BaseRequest):
             if first is not None:
                 kwargs['first'] = first
         return super().distribute_raw_params(raw_params, *args, **kwargs)
+
+
+RequestsDict = TypeVar('RequestsDict', bound=Dict[str, BaseRequest])
+
+
+def set_names(requests: RequestsDict) -> RequestsDict:
+    """sets keys of `requests` as names of the requests, returns `requests`"""
+    for name, request in requests.items():
+        request.name = name
+    return requests
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Callable, Optional
+
+import aiohttp
+
+__all__ = ('SessionOptions',)
+
+
+class SessionOptions:
+    """
+    Settings of the connection pool and timeouts of the :class:`aiohttp.ClientSession` an :class:`Api` object owns.
+
+    Args:
+        limit: `int`
+            max count of simultaneous connections, 0 - unlimited. Default: 100.
+        limit_per_host: `int`
+            max count of simultaneous connections to the same host, 0 - unlimited. Default: 0.
+        keepalive_timeout: Optional[`float`]
+            seconds an idle connection is kept open for. Default: 30.
+        ttl_dns_cache: Optional[`int`]
+            seconds resolved addresses are cached for, None - forever. Default: 300.
+        total_timeout: Optional[`float`]
+            seconds a whole request (including reading of the response) may take. Default: 60.
+        connect_timeout: Optional[`float`]
+            seconds of getting a connection from the pool, including connecting to the host. Default: 10.
+        sock_read_timeout: Optional[`float`]
+            seconds between received chunks of a response. Default: None (no timeout).
+
+    Examples:
+        >>> api = Api(session_options=SessionOptions(limit=20, total_timeout=10))
+    """
+
+    def __init__(
+            self,
+            *,
+            limit: int = 100,
+            limit_per_host: int = 0,
+            keepalive_timeout: Optional[float] = 30.0,
+            ttl_dns_cache: Optional[int] = 300,
+            total_timeout: Optional[float] = 60.0,
+            connect_timeout: Optional[float] = 10.0,
+            sock_read_timeout: Optional[float] = None
+    ) -> None:
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.keepalive_timeout: Optional[float] = keepalive_timeout
+        self.ttl_dns_cache: Optional[int] = ttl_dns_cache
+        self.total_timeout: Optional[float] = total_timeout
+        self.connect_timeout: Optional[float] = connect_timeout
+        self.sock_read_timeout: Optional[float] = sock_read_timeout
+
+    def create_session(
+            self,
+            json_serialize: Callable[[Any], str] = json.dumps
+    ) -> aiohttp.ClientSession:
+        """Creates a session by the settings, must be called in a running event loop"""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout, connect=self.connect_timeout, sock_read=self.sock_read_timeout
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, json_serialize=json_serialize)
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(limit={self.limit}, limit_per_host={self.limit_per_host}, '
+                f'keepalive_timeout={self.keepalive_timeout}, ttl_dns_cache={self.ttl_dns_cache}, '
+                f'total_timeout={self.total_timeout}, connect_timeout={self.connect_timeout}, '
+                f'sock_read_timeout={self.sock_read_timeout})')
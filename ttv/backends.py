@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+from typing import Any, Callable
+
+__all__ = (
+    'JsonBackend',
+    'get_json_backend',
+    'install_event_loop_policy',
+    'STDLIB_JSON',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JsonBackend:
+    """
+    JSON codec: `loads` takes `str` or `bytes`, `dumps` returns `str`
+
+    Attributes:
+        name: `str`
+            'json' or 'orjson'
+    """
+    __slots__ = ('name', 'loads', 'dumps')
+
+    def __init__(
+            self,
+            name: str,
+            loads: Callable[[Any], Any],
+            dumps: Callable[[Any], str]
+    ) -> None:
+        self.name: str = name
+        self.loads: Callable[[Any], Any] = loads
+        self.dumps: Callable[[Any], str] = dumps
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r})'
+
+
+STDLIB_JSON = JsonBackend('json', json.loads, json.dumps)
+
+
+def get_json_backend(name: str = 'json') -> JsonBackend:
+    """
+    Returns the JSON codec by name:
+        'json': the standard library's one
+        'orjson': orjson, the standard one with a warning if orjson isn't installed
+        'auto': orjson if it's installed, else - the standard one
+    """
+    if name == 'json':
+        return STDLIB_JSON
+    elif name not in ('orjson', 'auto'):
+        raise ValueError(f'Unknown JSON backend: {name}')
+    try:
+        import orjson
+    except ImportError:
+        if name == 'orjson':
+            logger.warning('orjson is not installed, the standard json is used')
+        return STDLIB_JSON
+    return JsonBackend('orjson', orjson.loads, lambda obj: orjson.dumps(obj).decode())
+
+
+def install_event_loop_policy(name: str = 'asyncio') -> str:
+    """
+    Sets the policy of event loops created afterwards, must be called before the loop is started:
+        'asyncio': the default one
+        'uvloop': uvloop's one, the default with a warning if uvloop isn't installed
+        'auto': uvloop's one if it's installed, else - the default one
+
+    Returns:
+        name of the installed policy: 'asyncio' or 'uvloop'
+    """
+    if name == 'asyncio':
+        asyncio.set_event_loop_policy(None)
+        return 'asyncio'
+    elif name not in ('uvloop', 'auto'):
+        raise ValueError(f'Unknown event loop: {name}')
+    try:
+        import uvloop
+    except ImportError:
+        if name == 'uvloop':
+            logger.warning('uvloop is not installed, the default event loop is used')
+        asyncio.set_event_loop_policy(None)
+        return 'asyncio'
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return 'uvloop'
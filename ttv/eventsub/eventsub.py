@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 # project
 from .events import *
+from ..backends import JsonBackend, get_json_backend
 from ..utils import calc_sha256, str_to_datetime
 # type hints
 from typing import Coroutine, Dict, Awaitable, Tuple, List, Type, Callable
@@ -32,7 +33,12 @@ class MessageDuplicate:
     
 
 class EventSub:
-    """ Class to handle your webhooks verifications, notifications and revocations """
+    """
+    Class to handle your webhooks verifications, notifications and revocations
+
+    `json_backend` is the JSON codec messages are decoded with: 'json', 'orjson' or 'auto' (orjson if it's installed),
+    see :func:`ttv.backends.get_json_backend`. Default: 'json'.
+    """
 
     def __init__(
             self,
@@ -43,9 +49,11 @@ class EventSub:
             *,
             time_limit: float = 10 * 60,
             duplicates_save_period: float = 10 * 60,
-            loop: asyncio.AbstractEventLoop = None
+            loop: asyncio.AbstractEventLoop = None,
+            json_backend: str = 'json'
     ) -> None:
         self.secret: str = secret
+        self._json: JsonBackend = get_json_backend(json_backend)
         self.loop: asyncio.AbstractEventLoop = loop if loop is not None else asyncio.get_event_loop()
         # verifications
         self.disable_all_validation: bool = False
@@ -152,7 +160,7 @@ class EventSub:
             self,
             message: web.Request
     ) -> web.Response:
-        json = await message.json()
+        json = await message.json(loads=self._json.loads)
         webhook_sub = WebhookSubscription(json['subscription'])
         if hasattr(self, 'custom_verification'):
             try:
@@ -170,7 +178,7 @@ class EventSub:
             self,
             message: web.Request
     ) -> web.Response:
-        json = await message.json()
+        json = await message.json(loads=self._json.loads)
         webhook_sub = WebhookSubscription(json['subscription'])
         event_type = webhook_sub.type  # type of current notification
         try:
@@ -195,7 +203,7 @@ class EventSub:
             message: web.Request
     ) -> web.Response:
         if hasattr(self, 'on_revocation'):
-            json = await message.json()
+            json = await message.json(loads=self._json.loads)
             webhook_sub = WebhookSubscription(json['subscription'])
             self._do_later(self.on_revocation(webhook_sub))
         return web.HTTPOk()
@@ -3,13 +3,23 @@ import logging
 from . import events
 from . import exceptions
 from . import user_events
-from .channel import Channel
-from .client import Client
+from .channel import Channel, ChannelState
+from .client import Client, ShardedClient, MultiProcessClient
+from .dispatchers import Dispatcher, TaskDispatcher, BatchDispatcher, WorkerPoolDispatcher, ChannelLanesDispatcher
 from .emotes import Emote
 from .flags import Flag
-from .irc_connections import IRCClient, irc_connect, TTVIRCClient, ttv_connect, ANON_LOGIN
-from .irc_messages import TwitchIRCMsg
+from .handler_watchdog import HandlerStats, HandlerWatchdog
+from .ingestion import MultiProcessTTVIRCClient
+from .irc_connections import IRCClient, irc_connect, TTVIRCClient, ttv_connect, ShardedTTVIRCClient, ANON_LOGIN
+from .line_filters import LineFilter
+from .metrics import Histogram, Metrics
+from .irc_messages import TwitchIRCMsg, FastTwitchIRCMsg, LazyTwitchIRCMsg
+from .join_planner import JoinPlanner
+from .pending_messages import PendingMessages
 from .messages import BaseMessage, ChannelMessage, ParentMessage, Whisper
+from .rate_limits import TokenBucket, RateLimits, LaneStats, OutboundScheduler
+from .recording import FrameRecorder, read_frames
+from .timeouts import TimeoutQueue
 from .user_states import BaseState, GlobalState, LocalState
 from .users import BaseUser, ChannelUser, GlobalUser, ParentMessageUser
 
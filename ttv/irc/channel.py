@@ -1,35 +1,19 @@
-from typing import Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Mapping, Optional, Tuple
 
 from .irc_connections import TTVIRCClient
 from .irc_messages import TwitchIRCMsg
+from .rate_limits import OutboundScheduler
 from .user_states import LocalState
 
-__all__ = ('Channel',)
+__all__ = ('Channel', 'ChannelState')
 
+StateChanges = Dict[str, Tuple[Optional[str], Optional[str]]]  # key: (old value, new value)
 
-class Channel:
-    def __init__(
-            self,
-            raw_state: TwitchIRCMsg,
-            client_state: LocalState,
-            names: Tuple[str, ...],
-            commands: Tuple[str, ...],
-            mods: Tuple[str, ...],
-            vips: Tuple[str, ...],
-            irc_conn: TTVIRCClient
-    ) -> None:
-        self.id: str = raw_state.get('room-id')
-        self.login: str = raw_state.channel
-        # TODO: logically the class must not have this variable (client_state),
-        #  because it represents state of a :class:`Client` not anything of :class:`Channel`.
-        #  But that way's easier to understand and to use
-        self.client_state: LocalState = client_state
-        self.names: Tuple[str, ...] = names
-        self.commands: Tuple[str, ...] = commands
-        self.mods: Tuple[str, ...] = mods
-        self.vips: Tuple[str, ...] = vips
-        self._raw_state: TwitchIRCMsg = raw_state
-        self._irc_conn: TTVIRCClient = irc_conn
+
+class _StateProperties:
+    """Properties of a channel's state read from `_raw_state`, anything with `get()` of tags"""
+    __slots__ = ()
 
     @property
     def is_unique_only(self) -> bool:
@@ -63,20 +47,85 @@ class Channel:
     def is_followers_only(self) -> bool:
         return self.followers_only_minutes != -1
 
+
+class ChannelState(_StateProperties):
+    """
+    Immutable snapshot of :class:`Channel`'s state (ROOMSTATE tags), see :attr:`Channel.state`.
+    Is created without copying, since :class:`Channel` replaces its tags on update instead of changing them.
+    """
+    __slots__ = ('id', 'login', '_raw_state')
+
+    def __init__(
+            self,
+            login: str,
+            tags: Mapping[str, Optional[str]]
+    ) -> None:
+        self.id: Optional[str] = tags.get('room-id')
+        self.login: str = login
+        self._raw_state: Mapping[str, Optional[str]] = tags
+
+    @property
+    def tags(self) -> Mapping[str, Optional[str]]:
+        return MappingProxyType(self._raw_state)
+
+    def __eq__(self, other):
+        return isinstance(other, ChannelState) and self.login == other.login and self._raw_state == other._raw_state
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.login!r}, {self._raw_state!r})'
+
+
+class Channel(_StateProperties):
+    def __init__(
+            self,
+            raw_state: TwitchIRCMsg,
+            client_state: LocalState,
+            names: AbstractSet[str],
+            commands: Tuple[str, ...],
+            mods: Tuple[str, ...],
+            vips: Tuple[str, ...],
+            irc_conn: TTVIRCClient
+    ) -> None:
+        self.id: str = raw_state.get('room-id')
+        self.login: str = raw_state.channel
+        # TODO: logically the class must not have this variable (client_state),
+        #  because it represents state of a :class:`Client` not anything of :class:`Channel`.
+        #  But that way's easier to understand and to use
+        self.client_state: LocalState = client_state
+        self.names: AbstractSet[str] = names  # is replaced by new names, never changed in place
+        self.commands: Tuple[str, ...] = commands
+        self.mods: Tuple[str, ...] = mods
+        self.vips: Tuple[str, ...] = vips
+        self._raw_state: TwitchIRCMsg = raw_state
+        self._irc_conn: TTVIRCClient = irc_conn
+
+    @property
+    def state(self) -> ChannelState:
+        """Immutable snapshot of the current state, costs no copying"""
+        return ChannelState(self.login, self._raw_state.tags)
+
     def update_state(
             self,
             irc_msg: TwitchIRCMsg
-    ):
+    ) -> StateChanges:
         """
         Updates state-attributes with new values provided in :arg:`irc_msg`.
 
         Notes:
             Does not change a value if there isn't the value in `irc_msg`.
+            The tags are replaced by updated ones, so snapshots taken by :attr:`state` stay unchanged.
         Args:
             irc_msg :class:`TwitchIRCMsg`:
                  TwitchIRCMsg with new values
+
+        Returns:
+            changed keys with old and new values
         """
-        self._raw_state.update(irc_msg)
+        tags = self._raw_state.tags
+        changes = {key: (tags.get(key), value) for key, value in irc_msg.tags.items() if tags.get(key) != value}
+        if changes:
+            self._raw_state.tags = {**tags, **irc_msg.tags}
+        return changes
 
     def copy(self):
         return self.__class__(
@@ -85,9 +134,11 @@ class Channel:
 
     async def send(
             self,
-            content: str
+            content: str,
+            *,
+            priority: int = OutboundScheduler.NORMAL
     ) -> None:
-        await self._irc_conn.send_msg(self.login, content)
+        await self._irc_conn.send_msg(self.login, content, priority=priority)
 
     async def request_state_update(self):
         await self._irc_conn.join_channels(self.login)
@@ -102,7 +153,7 @@ class Channel:
         await self.send('/vips')
 
     async def clear(self):
-        await self.send('/clear')
+        await self.send('/clear', priority=OutboundScheduler.HIGH)
 
     def __eq__(self, other):
         return isinstance(other, Channel) and self.login == other.login
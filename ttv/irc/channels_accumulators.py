@@ -1,29 +1,81 @@
-import asyncio
-from asyncio import Task
-from typing import Callable, Dict, Union, List, Tuple, Optional
+from typing import AbstractSet, Callable, Dict, Set, Tuple, Optional
 
 from .channel import Channel
 from .irc_connections import TTVIRCClient
 from .irc_messages import TwitchIRCMsg
+from .rate_limits import OutboundScheduler
+from .timeouts import TimeoutQueue
 from .user_states import LocalState
 
 __all__ = ('ChannelsAccumulator', 'ChannelParts')
 
 
+class _Part:
+    """
+    Attribute of :class:`ChannelParts` holding a part. Setting the part sets its bit in `ChannelParts.received`,
+    so readiness is checked by a mask instead of checking each part.
+    """
+    __slots__ = ('bit', 'attr')
+
+    def __init__(self, bit: int) -> None:
+        self.bit: int = bit
+        self.attr: str = ''
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.attr = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__[self.attr]
+
+    def __set__(self, instance, value) -> None:
+        instance.__dict__[self.attr] = value
+        if value is None:
+            instance.received &= ~self.bit
+        else:
+            instance.received |= self.bit
+
+
 class ChannelParts:
     """
     Class represents all the parts of :class:`Channel` as raw_state, client_state, names, commands, mods, vips
 
-    :meth:`add_part` takes irc_msg with a raw part and parse the part from it
+    :meth:`add_part` takes irc_msg with a raw part and parse the part from it.
+    Received parts are marked by bits of `received`, see :attr:`ANON_PARTS` and :attr:`ALL_PARTS`.
+
+    Names are received by several messages (353) into a set, they become the `names` part when they end (366).
+    If `track_names` is False, the names are ignored and the part is an empty set.
     """
+    RAW_CHANNEL_STATE = 1
+    CLIENT_STATE = 2
+    NAMES = 4
+    COMMANDS = 8
+    MODS = 16
+    VIPS = 32
+    ANON_PARTS = RAW_CHANNEL_STATE | NAMES  # parts received during anonymous logging in
+    ALL_PARTS = ANON_PARTS | CLIENT_STATE | COMMANDS | MODS | VIPS
+
+    raw_channel_state = _Part(RAW_CHANNEL_STATE)
+    client_state = _Part(CLIENT_STATE)
+    names = _Part(NAMES)
+    commands = _Part(COMMANDS)
+    mods = _Part(MODS)
+    vips = _Part(VIPS)
+
     def __init__(
             self,
-            login: str
+            login: str,
+            *,
+            track_names: bool = True
     ):
         self.login: str = login
+        self.track_names: bool = track_names
+        self.received: int = 0
         self.raw_channel_state: Optional[TwitchIRCMsg] = None
         self.client_state: Optional[LocalState] = None
-        self.names: Optional[Union[List, Tuple]] = None
+        self.names: Optional[AbstractSet[str]] = None
+        self._receiving_names: Optional[Set[str]] = None  # names of the 353 messages since the last 366
         self.commands: Optional[Tuple[str]] = None
         self.mods: Optional[Tuple[str]] = None
         self.vips: Optional[Tuple[str]] = None
@@ -44,19 +96,19 @@ class ChannelParts:
             >>> if parts.is_ready == parts.READY:
             >>>     print('Wow!')
         """
-        try:
-            ready_type: str = self.NOT_READY
-            assert self.raw_channel_state is not None
-            assert isinstance(self.names, tuple)  # migth be a list (unended names)
-            ready_type = self.READY_ANON
-            assert self.client_state is not None
-            assert self.commands is not None
-            assert self.mods is not None
-            assert self.vips is not None
-            ready_type = self.READY
-        except AssertionError:
-            pass
-        return ready_type
+        if self.received == self.ALL_PARTS:
+            return self.READY
+        elif self.received & self.ANON_PARTS == self.ANON_PARTS:
+            return self.READY_ANON
+        else:
+            return self.NOT_READY
+
+    def has_parts(
+            self,
+            parts: int
+    ) -> bool:
+        """Returns True if all the parts marked by bits of `parts` are received, e.g. :attr:`ANON_PARTS`"""
+        return self.received & parts == parts
 
     def add_part(
             self,
@@ -94,7 +146,7 @@ class ChannelParts:
         return Channel(
             self._get_raw_channel_state(),
             self.client_state or LocalState(TwitchIRCMsg.create_empty()),
-            self.names or (),
+            self.names if self.names is not None else set(),
             self.commands or (),
             self.mods or (),
             self.vips or (),
@@ -137,17 +189,22 @@ class ChannelParts:
             self,
             irc_msg: TwitchIRCMsg
     ) -> None:
-        names = irc_msg.trailing.split(' ')
-        if isinstance(self.names, list):
-            self.names += names
-        else:
-            self.names = names
+        if self._receiving_names is None:
+            self._receiving_names = set()
+        if self.track_names:
+            self._receiving_names.update(irc_msg.trailing.split(' '))
 
     def _end_names(
             self,
             _: TwitchIRCMsg
     ) -> None:
-        self.names = tuple(self.names)
+        self.end_names()
+
+    def end_names(self) -> AbstractSet[str]:
+        """Makes names received since the last end the `names` part and returns them"""
+        self.names = self._receiving_names if self._receiving_names is not None else set()
+        self._receiving_names = None
+        return self.names
 
     def _update_commands(
             self,
@@ -210,7 +267,8 @@ class ChannelsAccumulator:
         2. Calls when the timeout is expired. Timeout is canceled if the channel is ready
         3. Timeouts are being handled only after calling :meth:`start_accumulation()`
         4. To don't use timeout feature don't call :meth:`start_accumulation()`
-        5. There is :meth:`abort_accumulation()` that removes the timeout task and accumulated parts.
+        5. There is :meth:`abort_accumulation()` that removes the timeout and accumulated parts.
+        6. Timeouts of all the channels share one timer (see :class:`TimeoutQueue`), :meth:`close` stops it.
 
     Args:
         channel_ready_callback:
@@ -221,6 +279,9 @@ class ChannelsAccumulator:
             The value of time limit for channel's accumulation. Default: 5.
         is_anon:
             The flag affects when a channel is considered as ready. Default: False.
+        track_names:
+            If names of channels are accumulated, may be changed for a channel by :meth:`set_names_tracking`.
+            Default: True.
      """
     def __init__(
             self,
@@ -228,52 +289,55 @@ class ChannelsAccumulator:
             channel_ready_callback: Callable[[Channel], None],
             irc_conn: TTVIRCClient,
             accumulation_timeout: float = 50,
-            is_anon: bool = False
+            is_anon: bool = False,
+            track_names: bool = True
     ) -> None:
         self._channel_ready_callback: Callable[[Channel], None] = channel_ready_callback
         self._irc_conn: TTVIRCClient = irc_conn
         self._all_parts: Dict[str, ChannelParts] = {}
-        self._timeout: float = accumulation_timeout
-        self._timeout_tasks: Dict[str, Task] = {}
+        self._timeouts: TimeoutQueue = TimeoutQueue(accumulation_timeout, self._complete_accumulation)
         self.is_anon: bool = is_anon
+        self.track_names: bool = track_names
+        self._names_tracking: Dict[str, bool] = {}  # channel_login: track_names, differs from the default
 
-    async def start_accumulations(
+    def start_accumulations(
             self,
             *channels: str
     ):
         """
-        Adds timeout task for the given channel login. Creates :class:'ChannelParts' in advance.
+        Adds timeout for the given channel login. Creates :class:'ChannelParts' in advance.
+        Commands, mods and vips must be requested by :meth:`request_channel_parts` then.
 
         Args:
             channels:
                 login of the channel to be accumulated
         """
-        await self.abort_accumulations(*channels, msg='Restarting accumulation')
+        self.abort_accumulations(*channels)
         for channel in channels:
-            await self._add_timeout(channel)
-            self._all_parts[channel] = ChannelParts(channel)
-            await self._request_channel_parts(channel)
+            self._timeouts.add(channel)
+            self._all_parts[channel] = ChannelParts(channel, track_names=self.is_names_tracked(channel))
 
-    async def abort_accumulations(
+    def abort_accumulations(
             self,
-            *channels: str,
-            msg: str = None
+            *channels: str
     ) -> None:
         """
-        Cancels the timeout task if exists.
+        Removes the timeout if exists and the accumulated parts.
 
         Args:
             channels:
                 login of the channel whose accumulation must be aborted
-            msg:
-                msg for the canceled task
         """
-        msg = msg or 'Accumulation abort'
         for channel in channels:
-            await self._remove_timeout(channel, msg=msg)
+            self._timeouts.remove(channel)
             self._all_parts.pop(channel, None)
 
-    async def accumulate_part(
+    def close(self) -> None:
+        """Aborts all the accumulations"""
+        self._timeouts.clear()
+        self._all_parts.clear()
+
+    def accumulate_part(
             self,
             irc_msg: TwitchIRCMsg
     ):
@@ -285,22 +349,50 @@ class ChannelsAccumulator:
             irc_msg:
                 raw part
         """
-        parts = await self._setdefault_parts(irc_msg.channel)
+        try:
+            parts = self._all_parts[irc_msg.channel]
+        except KeyError:
+            self._all_parts[irc_msg.channel] = parts = ChannelParts(
+                irc_msg.channel, track_names=self.is_names_tracked(irc_msg.channel)
+            )
         parts.add_part(irc_msg)
-        if await self.is_channel_ready(irc_msg.channel):
-            await self._call_channel_ready_callback(irc_msg.channel)
+        if parts.has_parts(self._ready_parts):
+            self._call_channel_ready_callback(irc_msg.channel)
+
+    def get_parts(self, channel_login: str) -> Optional[ChannelParts]:
+        """Returns accumulated parts of the channel, None - if nothing is accumulated"""
+        return self._all_parts.get(channel_login)
 
-    async def get_parts(self, channel_login: str) -> ChannelParts:
-        return self._all_parts.get(channel_login) or ChannelParts(channel_login)
+    def is_names_tracked(self, channel_login: str) -> bool:
+        return self._names_tracking.get(channel_login, self.track_names)
 
-    async def _request_channel_parts(self, login: str):
+    def set_names_tracking(
+            self,
+            *channels: str,
+            track: bool
+    ) -> None:
+        """Sets if names of the channels are accumulated, names already received aren't dropped"""
+        for channel in channels:
+            if track == self.track_names:
+                self._names_tracking.pop(channel, None)
+            else:
+                self._names_tracking[channel] = track
+            if (parts := self._all_parts.get(channel)) is not None:
+                parts.track_names = track
+
+    def is_accumulating(self, channel_login: str) -> bool:
+        """Returns True if the channel's accumulation is started and isn't completed or aborted"""
+        return channel_login in self._timeouts
+
+    async def request_channel_parts(self, login: str):
         """ Requests commands list, mods list, vips list for the channel with given `login` """
         if not self.is_anon:
-            await self._irc_conn.send_msg(login, '/help')
-            await self._irc_conn.send_msg(login, '/mods')
-            await self._irc_conn.send_msg(login, '/vips')
+            # must not delay messages sent by the user if the budget is short
+            await self._irc_conn.send_msg(login, '/help', priority=OutboundScheduler.LOW)
+            await self._irc_conn.send_msg(login, '/mods', priority=OutboundScheduler.LOW)
+            await self._irc_conn.send_msg(login, '/vips', priority=OutboundScheduler.LOW)
 
-    async def is_channel_ready(
+    def is_channel_ready(
             self,
             channel_login: str
     ) -> bool:
@@ -313,45 +405,21 @@ class ChannelsAccumulator:
 
         Returns: :class:`bool`
         """
-        if (parts := self._all_parts.get(channel_login)) is None:
-            return False
-        elif not self.is_anon:
-            return parts.is_ready == parts.READY
-        else:
-            return parts.is_ready in (parts.READY_ANON, parts.READY)
-
-    async def _setdefault_parts(self, channel_login: str) -> ChannelParts:
-        try:
-            return self._all_parts[channel_login]
-        except KeyError:
-            self._all_parts[channel_login] = (parts := ChannelParts(channel_login))
-            return parts
+        parts = self._all_parts.get(channel_login)
+        return parts is not None and parts.has_parts(self._ready_parts)
 
-    async def _add_timeout(
-            self,
-            channel_login: str
-    ):
-        self._timeout_tasks[channel_login] = asyncio.create_task(self._channel_ready_timeout(channel_login))
-
-    async def _remove_timeout(
-            self,
-            channel_login: str,
-            msg: Optional[str] = None
-    ):
-        if (timeout_task := self._timeout_tasks.pop(channel_login, None)) is not None:
-            timeout_task.cancel(msg)
+    @property
+    def _ready_parts(self) -> int:
+        return ChannelParts.ANON_PARTS if self.is_anon else ChannelParts.ALL_PARTS
 
-    async def _channel_ready_timeout(self, channel_login: str):
-        await asyncio.sleep(self._timeout)
-        await self._call_channel_ready_callback(channel_login, by_timeout=True)
+    def _complete_accumulation(self, channel_login: str):
+        # is called by the timeouts queue, the timeout is already removed then
+        parts = self._all_parts.pop(channel_login, None) or ChannelParts(channel_login)
+        self._channel_ready_callback(parts.create_channel(irc_conn=self._irc_conn))
 
-    async def _call_channel_ready_callback(
+    def _call_channel_ready_callback(
             self,
-            channel_login: str,
-            *,
-            by_timeout: bool = False
+            channel_login: str
     ):
-        msg = 'Channel ready' + (' timeout' if by_timeout else '')
-        parts = await self.get_parts(channel_login)
-        await self.abort_accumulations(channel_login, msg=msg)
-        self._channel_ready_callback(parts.create_channel(irc_conn=self._irc_conn))
+        self._timeouts.remove(channel_login)
+        self._complete_accumulation(channel_login)
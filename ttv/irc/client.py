@@ -1,46 +1,151 @@
 import asyncio
+import logging
 from asyncio import iscoroutinefunction
-from typing import Coroutine, Iterable, Tuple, Any, Awaitable, Callable, List, Optional, Dict
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Coroutine, Iterable, Tuple, Any, Awaitable, Callable, List, Optional, Dict, Set, Type
 
+from ..backends import install_event_loop_policy
 from .channel import Channel
 from .channels_accumulators import ChannelsAccumulator
+from .dispatchers import Dispatcher, TaskDispatcher
 from .events import OnUserTimeout, OnChannelJoinError, OnNotice, OnMessageDelete, OnSendMessageError, OnUserBan, \
-    OnClearChat
+    OnClearChat, OnJoinProgress, OnNamesUpdate, OnChannelUpdate, OnHandlerError
 from .exceptions import *
-from .irc_connections import TTVIRCClient
-from .irc_messages import TwitchIRCMsg
+from .handler_watchdog import HandlerWatchdog, get_event_channel
+from .irc_connections import TTVIRCClient, ShardedTTVIRCClient
+from .ingestion import MultiProcessTTVIRCClient
+from .join_planner import JoinPlanner
+from .line_filters import LineFilter
+from .metrics import Metrics
+from .pending_messages import PendingMessages
+from .irc_messages import TwitchIRCMsg, FastTwitchIRCMsg
 from .messages import ChannelMessage, Whisper
+from .rate_limits import RateLimits, OutboundScheduler
 from .user_events import *
 from .user_states import GlobalState, LocalState
 from .users import ChannelUser, GlobalUser
 
-__all__ = ('Client', )
+__all__ = ('Client', 'ShardedClient', 'MultiProcessClient')
+
+
+class _InlineEvents:
+    """Collects coroutines of event handlers called while a message is being handled, to await them afterwards"""
+    __slots__ = ('coros', 'is_open')
+
+    def __init__(self):
+        self.coros: List[Coroutine] = []
+        self.is_open: bool = True
+
+
+_inline_events: ContextVar[Optional[_InlineEvents]] = ContextVar('_inline_events', default=None)
 
 
 class Client:
+    """
+    Twitch IRC client that accumulates joined channels and calls registered event handlers.
+
+    Args:
+        token: `str`
+            irc token of the user
+        login: `str`
+            login of the user
+        keep_alive: `bool`
+            if the connection must be restarted when it's closed. Default: True.
+        irc_msg_class: `Type[TwitchIRCMsg]`
+            class incoming messages are parsed with. Use :class:`LazyTwitchIRCMsg` to parse message's tags, prefix
+            and params only when they are accessed. Default: :class:`TwitchIRCMsg`.
+        dispatcher: `Dispatcher`
+            decides how messages of received frames are handled. Use :class:`BatchDispatcher` to handle
+            all messages of a frame within one task, :class:`WorkerPoolDispatcher` to handle messages by
+            a bounded pool of workers, :class:`ChannelLanesDispatcher` to handle events of each channel
+            in received order. Default: :class:`TaskDispatcher` (a task per message).
+        rate_limits: Optional[`RateLimits`]
+            budgets of sent messages, whispers and JOINs. Commands over the budgets wait in
+            :class:`OutboundScheduler` of the connection. Default: None (no limits).
+            Channels are joined within the JOIN budget of the limits anyway, the default one if it's None.
+        track_names: `bool`
+            if names (logins of chatters) of channels are tracked. Names of huge channels take much memory,
+            tracking may be changed for a channel by :meth:`set_names_tracking`. Default: True.
+        pending_messages: Optional[`PendingMessages`]
+            buffer of messages of channels that aren't accumulated yet, they are handled when the channels are ready.
+            Default: a buffer with default limits.
+        metrics: Optional[`Metrics`]
+            registry of counts of received messages, parse time, dispatch latency, duration of event handlers
+            and reconnects, see :meth:`Metrics.to_prometheus`. Default: None (nothing is measured).
+        handler_watchdog: Optional[`HandlerWatchdog`]
+            timeouts of event handlers, logging of slow ones and stats of their durations.
+            Exceptions of handlers are passed to `on_handler_error`. Default: a watchdog without timeouts.
+    """
 
     def __init__(
             self,
             token: str,
             login: str,
             *,
-            keep_alive: bool = True
+            keep_alive: bool = True,
+            irc_msg_class: Type[TwitchIRCMsg] = TwitchIRCMsg,
+            dispatcher: Optional[Dispatcher] = None,
+            rate_limits: Optional[RateLimits] = None,
+            track_names: bool = True,
+            pending_messages: Optional[PendingMessages] = None,
+            metrics: Optional[Metrics] = None,
+            handler_watchdog: Optional[HandlerWatchdog] = None
     ) -> None:
-        self._irc_conn = TTVIRCClient(
-            login, token, keep_alive=keep_alive, on_recconect_callback=self._on_irc_conn_reconnect
+        self._irc_conn: TTVIRCClient = self._create_irc_conn(
+            login,
+            token,
+            keep_alive=keep_alive,
+            on_recconect_callback=self._on_irc_conn_reconnect,
+            irc_msg_class=irc_msg_class,
+            rate_limits=rate_limits
         )
+        self._dispatcher: Dispatcher = dispatcher or TaskDispatcher()
+        if self._dispatcher.awaits_events:
+            self._dispatcher.bind(self._handle_command_awaiting_events)
+        else:
+            self._dispatcher.bind(self._handle_command)
+        self._logger = logging.getLogger(__name__)
+        # metrics
+        self.metrics: Optional[Metrics] = metrics
+        if metrics is not None:
+            self._irc_conn.set_metrics(metrics)
+        self.handler_watchdog: HandlerWatchdog = handler_watchdog or HandlerWatchdog()
         # state
         self.global_state: Optional[GlobalState] = None
         # channels
         self._channels_by_id: Dict[str, Channel] = {}
         self._channels_by_login: Dict[str, Channel] = {}
-        self._delayed_irc_msgs: Dict[str, List[TwitchIRCMsg]] = {}  # channel_login: [irc_msg, ...]
+        self.pending_messages: PendingMessages = pending_messages or PendingMessages()
+        if metrics is not None:
+            self.pending_messages.set_metrics(metrics)
+        self._accumulated_login: Optional[str] = None  # channel of the part being accumulated
+        self._replay_tasks: Set[asyncio.Task] = set()
         # accumulation
         self._chnls_accum: ChannelsAccumulator = ChannelsAccumulator(
             channel_ready_callback=self._save_channel,
             irc_conn=self._irc_conn,
-            is_anon=self.is_anon
+            is_anon=self.is_anon,
+            track_names=track_names
         )
+        rate_limits = rate_limits or RateLimits()  # the planner keeps Twitch's limits even if sending isn't limited
+        self._join_planner: JoinPlanner = JoinPlanner(
+            irc_conn=self._irc_conn,
+            channels_accumulator=self._chnls_accum,
+            progress_callback=self._on_join_progress,
+            joins=(rate_limits.joins.capacity, rate_limits.joins.period),
+            requests=(rate_limits.privmsg.capacity, rate_limits.privmsg.period)
+        )
+        self._update_line_filter()  # handlers defined by a subclass are already known
+
+    def _create_irc_conn(
+            self,
+            login: str,
+            token: str,
+            **kwargs
+    ) -> TTVIRCClient:
+        """Creates the connection messages are received from and sent through"""
+        return TTVIRCClient(login, token, **kwargs)
 
     @property
     def is_restarting(self) -> bool:
@@ -103,17 +208,24 @@ class Client:
 
     def run(
             self,
-            channels: Iterable[str]
+            channels: Iterable[str],
+            *,
+            event_loop: Optional[str] = None
     ) -> None:
         """
         Starts event listener.
 
         Args:
             channels Iterable[`str`] : Object with logins of channels to join
+            event_loop Optional[`str`] : event loop to run in: 'asyncio', 'uvloop' or 'auto' (uvloop if it's installed),
+                see :func:`ttv.backends.install_event_loop_policy`. Default: None (the current policy is kept).
 
         Notes:
             Async version of the method is :meth:`start`
         """
+        if event_loop is not None:
+            install_event_loop_policy(event_loop)
+            asyncio.set_event_loop(asyncio.new_event_loop())  # uvloop's policy doesn't create a loop on demand
         asyncio.get_event_loop().run_until_complete(
             self.start(channels)
         )
@@ -137,21 +249,39 @@ class Client:
         self.global_state = GlobalState(global_state_msg)
         self._call_event('on_ready')
         await self.join_channels(*channels)
-        async for irc_msg in self._irc_conn:
-            asyncio.create_task(
-                self._handle_command(irc_msg)  # protection from a shutdown caused by an exception
-            )
+        async for irc_msgs in self._irc_conn.iter_batches():
+            if self.metrics is not None:
+                self._stamp_received(irc_msgs)
+            await self._dispatcher.dispatch(irc_msgs)
 
     async def stop(self):  # TODO: script for case: self.is_running == False
+        await self._join_planner.close()
+        self._chnls_accum.close()
         await self._irc_conn.stop()
+        await self._dispatcher.close()
 
     async def _on_irc_conn_reconnect(self):
         self._call_event('on_reconnect')
 
+    def _on_join_progress(self, event: OnJoinProgress):
+        self._call_event('on_join_progress', event)
+
+    def _stamp_received(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        """Marks when the messages are received, to measure how long they wait for handling"""
+        received_at = perf_counter()
+        for irc_msg in irc_msgs:
+            irc_msg.received_at = received_at
+
     async def _handle_command(
             self,
             irc_msg: TwitchIRCMsg
     ) -> None:
+        if self.metrics is not None and (received_at := irc_msg.received_at) is not None:
+            irc_msg.received_at = None  # a delayed message is measured once
+            self.metrics.observe(Metrics.DISPATCH_SECONDS, perf_counter() - received_at)
         try:
             handler = self._COMMAND_HANDLERS[irc_msg.command]
         except KeyError:
@@ -162,11 +292,46 @@ class Client:
             except ChannelNotAccumulated:
                 await self._delay_irc_message(irc_msg)
 
+    async def _handle_command_awaiting_events(
+            self,
+            irc_msg: TwitchIRCMsg
+    ) -> None:
+        """Same as :meth:`_handle_command` but awaits called event handlers one by one instead of creating tasks"""
+        inline_events = _InlineEvents()
+        token = _inline_events.set(inline_events)
+        try:
+            await self._handle_command(irc_msg)
+        finally:
+            _inline_events.reset(token)
+            inline_events.is_open = False  # tasks created meanwhile have the same context, must not add anything
+        for coro in inline_events.coros:
+            await coro  # exceptions are handled by :meth:`_run_event`
+
     async def _handle_names_part(
             self,
             irc_msg: TwitchIRCMsg
     ) -> None:
-        await self._chnls_accum.accumulate_part(irc_msg)
+        await self._accumulate_part(irc_msg)
+
+    async def _accumulate_part(
+            self,
+            irc_msg: TwitchIRCMsg
+    ) -> None:
+        """
+        Adds the part to the channel's accumulation. If the channel gets ready, its delayed messages
+        are handled right away, before the next messages of the frame.
+        """
+        self._accumulated_login = irc_msg.channel  # :meth:`_save_channel` leaves delayed messages to this method
+        try:
+            self._chnls_accum.accumulate_part(irc_msg)
+        finally:
+            self._accumulated_login = None
+        if irc_msg.channel in self._channels_by_login:
+            for delayed_irc_msg in self.pending_messages.pop(irc_msg.channel):
+                try:
+                    await self._handle_command(delayed_irc_msg)
+                except Exception:  # one broken message must not break the others
+                    self._logger.exception(f'Exception while handling delayed {delayed_irc_msg.command}')
 
     async def _handle_names_end(
             self,
@@ -175,7 +340,7 @@ class Client:
         if irc_msg.channel in self._channels_by_login:
             await self._handle_names_update(irc_msg)
         else:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
 
     async def _handle_names_update(
             self,
@@ -183,9 +348,11 @@ class Client:
     ):
         channel = self._channels_by_login[irc_msg.channel]
         before = channel.names
-        after = channel.names = tuple((await self._chnls_accum.get_parts(irc_msg.channel)).names)
-        await self._chnls_accum.abort_accumulations(irc_msg.channel)  # Remove the ChannelParts from the Accum
-        self._call_event('on_names_update', channel, before, after)
+        parts = self._chnls_accum.get_parts(irc_msg.channel)
+        after = channel.names = parts.end_names() if parts is not None else set()
+        self._chnls_accum.abort_accumulations(irc_msg.channel)  # Remove the ChannelParts from the Accum
+        if hasattr(self, 'on_names_update'):  # the diff of huge channels costs much
+            self._call_event('on_names_update', OnNamesUpdate(channel, after - before, before - after))
 
     async def _handle_roomstate(
             self,
@@ -194,20 +361,16 @@ class Client:
         if irc_msg.channel in self._channels_by_login:
             await self._handle_channel_update(irc_msg)
         else:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
 
     async def _handle_channel_update(
             self,
             irc_msg: TwitchIRCMsg
     ) -> None:
         channel = self._channels_by_login[irc_msg.channel]
-        if hasattr(self, 'on_channel_update'):  # Channel.copy() cost us much time
-            before = channel.copy()
-            channel.update_state(irc_msg)
-            after = channel.copy()
-            self._call_event('on_channel_update', before, after)
-        else:
-            channel.update_state(irc_msg)
+        before = channel.state  # snapshots cost no copying, the channel's tags are replaced on update
+        if (changes := channel.update_state(irc_msg)) and hasattr(self, 'on_channel_update'):
+            self._call_event('on_channel_update', OnChannelUpdate(channel, before, channel.state, changes))
 
     async def _handle_userstate(
             self,
@@ -222,7 +385,7 @@ class Client:
         if irc_msg.channel in self._channels_by_login:
             await self._handle_userstate_update(irc_msg)
         else:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
 
     async def _handle_userstate_update(
             self,
@@ -231,6 +394,7 @@ class Client:
         channel = self._channels_by_login[irc_msg.channel]
         before = channel.client_state
         after = channel.client_state = LocalState(irc_msg)
+        self._irc_conn.set_channel_moderated(channel.login, after.is_moderator or after.is_broadcaster)
         self._call_event('on_client_state_update', channel, before, after)
 
     async def _handle_privmsg(
@@ -310,7 +474,7 @@ class Client:
             irc_msg: TwitchIRCMsg
     ) -> None:
         if (channel := self.get_channel(irc_msg.channel)) is None:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
         else:
             before = channel.commands
             if irc_msg.msg_id == 'no_help':
@@ -327,7 +491,7 @@ class Client:
             irc_msg: TwitchIRCMsg
     ) -> None:
         if (channel := self.get_channel(irc_msg.channel)) is None:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
         else:
             before = channel.mods
             if irc_msg.msg_id == 'no_mods':
@@ -343,7 +507,7 @@ class Client:
             irc_msg: TwitchIRCMsg
     ) -> None:
         if (channel := self.get_channel(irc_msg.channel)) is None:
-            await self._chnls_accum.accumulate_part(irc_msg)
+            await self._accumulate_part(irc_msg)
         else:
             before = channel.vips
             if irc_msg.msg_id == 'no_vips':
@@ -505,12 +669,16 @@ class Client:
         """
         self._channels_by_id[channel.id] = channel
         self._channels_by_login[channel.login] = channel
-        # handle delayed irc_messages
-        delayed_irc_messages = self._delayed_irc_msgs.pop(channel.login, ())
-        for delayed_irc_message in delayed_irc_messages:
-            asyncio.create_task(
-                self._handle_command(delayed_irc_message)
-            )
+        if (client_state := channel.client_state) is not None:
+            is_moderated = client_state.is_moderator or client_state.is_broadcaster
+            self._irc_conn.set_channel_moderated(channel.login, is_moderated)
+        # delayed messages of a channel readied by a received part are handled by :meth:`_accumulate_part` inline,
+        # the ones of a channel readied by the accumulation timeout - by the dispatcher
+        if channel.login != self._accumulated_login:
+            if delayed_irc_messages := self.pending_messages.pop(channel.login):
+                task = asyncio.create_task(self._dispatcher.dispatch(delayed_irc_messages))
+                self._replay_tasks.add(task)  # the loop keeps only weak references to tasks
+                task.add_done_callback(self._replay_tasks.discard)
         self._call_event('on_channel_join', channel)
 
     async def _send(
@@ -533,7 +701,9 @@ class Client:
     async def send_msg(
             self,
             channel_login: str,
-            content: str
+            content: str,
+            *,
+            priority: int = OutboundScheduler.NORMAL
     ) -> None:
         """
         Sends `content` into the channel with login equals `channel_login`
@@ -543,11 +713,14 @@ class Client:
                 login of channel into which `content` should be sent.
             content: `str`
                 content to send into the channel
+            priority: `int`
+                priority of the message if `rate_limits` are set, one of :attr:`OutboundScheduler.HIGH`,
+                :attr:`OutboundScheduler.NORMAL`, :attr:`OutboundScheduler.LOW`. Default: NORMAL.
 
         Returns:
             `None`
         """
-        await self._irc_conn.send_msg(channel_login, content)
+        await self._irc_conn.send_msg(channel_login, content, priority=priority)
 
     async def send_whisper(
             self,
@@ -569,18 +742,37 @@ class Client:
         await self._irc_conn.send_whisper(target, content)
 
     async def join_channels(self, *channels: str):
-        await self._chnls_accum.start_accumulations(*channels)
-        await self._irc_conn.join_channels(*channels)
+        """
+        Plans joining of the channels and returns at once.
+        JOINs are sent in the background within the JOIN budget, `on_join_progress` is called after each of them.
+        """
+        self._join_planner.plan(*channels)
+
+    def set_names_tracking(
+            self,
+            *channels: str,
+            track: bool
+    ) -> None:
+        """
+        Sets if names of the channels are tracked. Names of a joined channel are cleared if they aren't tracked,
+        tracked names come when the channel is joined again (e.g. by :meth:`Channel.request_state_update`).
+        """
+        self._chnls_accum.set_names_tracking(*channels, track=track)
+        if not track:
+            for channel in channels:
+                if (joined_channel := self._channels_by_login.get(channel)) is not None:
+                    joined_channel.names = set()
 
     async def part_channels(self, *channels):
-        await self._chnls_accum.abort_accumulations(*channels)
+        self._join_planner.cancel(*channels)
+        self._chnls_accum.abort_accumulations(*channels)
         await self._irc_conn.part_channels(*channels)
         for channel in channels:
-            self._delayed_irc_msgs.pop(channel, None)
+            self.pending_messages.discard(channel)
 
     async def _delay_irc_message(self, irc_msg: TwitchIRCMsg) -> None:
         """
-        Delays `irc_msg`.
+        Delays `irc_msg` in :attr:`pending_messages`.
         Delayed message will be handled after the channel with `channel_login` is created
 
         Args:
@@ -590,12 +782,7 @@ class Client:
         Returns:
             `None`
         """
-        delayed_irc_messages = self._delayed_irc_msgs.setdefault(irc_msg.channel, [])
-        if len(delayed_irc_messages) == 30:
-            print(f'#{irc_msg.channel} got delayed_msgs overflow')  # TODO: modify the print into logging
-            delayed_irc_messages.append(irc_msg)  # was 30 becoming 31 no more true conditions
-        elif len(delayed_irc_messages) < 30:
-            delayed_irc_messages.append(irc_msg)
+        self.pending_messages.add(irc_msg)
 
     def _call_event(
             self,
@@ -603,7 +790,36 @@ class Client:
             *args
     ):
         if (event := getattr(self, event_name, None)) is not None:
-            asyncio.create_task(event(*args))
+            coro = self._run_event(event_name, event(*args), args)
+            inline_events = _inline_events.get()
+            if inline_events is not None and inline_events.is_open:
+                inline_events.coros.append(coro)
+            else:
+                asyncio.create_task(coro)
+
+    async def _run_event(
+            self,
+            event_name: str,
+            coro: Coroutine,
+            args: tuple
+    ) -> None:
+        """Runs the handler within its timeout, counts its duration, passes its exception to `on_handler_error`"""
+        watchdog = self.handler_watchdog
+        error = None
+        started_at = perf_counter()
+        try:
+            if (timeout := watchdog.get_timeout(event_name)) is None:
+                await coro
+            else:
+                await asyncio.wait_for(coro, timeout)
+        except Exception as e:  # a broken handler must not be lost in a never retrieved task exception
+            error = e
+        seconds = perf_counter() - started_at
+        watchdog.observe(event_name, seconds, error, args)
+        if self.metrics is not None:
+            self.metrics.observe(Metrics.HANDLER_SECONDS, seconds, event_name)
+        if error is not None and event_name != 'on_handler_error':  # errors of the handler itself are only logged
+            self._call_event('on_handler_error', OnHandlerError(event_name, get_event_channel(args), error))
 
     def event(self, coro: Callable[..., Coroutine]) -> Callable[[], Coroutine]:
         """
@@ -625,8 +841,30 @@ class Client:
                 the object that the method got in `coro` as argument
         """
         self._register_event(coro.__name__, coro)
+        self._update_line_filter()
         return coro
 
+    def _update_line_filter(self) -> None:
+        """
+        Makes the connection drop lines nobody listens to before they are parsed.
+        Lines keeping states of channels (ROOMSTATE, USERSTATE, NAMES, the accumulated NOTICEs) are never dropped.
+        """
+        skipped_commands = [
+            command for command, events in self._COMMAND_EVENTS.items()
+            if not any(hasattr(self, event) for event in events)
+        ]
+        msg_ids = {}
+        if not (hasattr(self, 'on_notice') or hasattr(self, 'on_send_message_error')):  # ids of these aren't listed
+            msg_ids['NOTICE'] = self._ACCUMULATED_NOTICE_IDS
+            if hasattr(self, 'on_channel_join_error'):
+                msg_ids['NOTICE'] |= self._JOIN_ERROR_NOTICE_IDS
+        if not (hasattr(self, 'on_user_event') or hasattr(self, 'on_unknown_user_event')):
+            msg_ids['USERNOTICE'] = frozenset(
+                event_type for event_type, (event_name, _) in self._USER_EVENT_TYPES.items()
+                if hasattr(self, event_name)
+            )
+        self._irc_conn.set_line_filter(LineFilter(skipped_commands=skipped_commands, msg_ids=msg_ids))
+
     def _register_event(
             self,
             handler_name: str,
@@ -715,6 +953,8 @@ class Client:
         'on_commands_update', 'on_mods_update', 'on_vips_update',  # NOTICE
         'on_user_event', 'on_unknown_user_event',  # USERNOTICE
         'on_reconnect', 'on_unknown_command',
+        'on_join_progress',
+        'on_handler_error',
     )
 
     USER_EVENTS = (
@@ -726,3 +966,120 @@ class Client:
         'on_raid', 'on_unraid',  # raids
         'on_ritual',  # rituals
     )
+
+    # commands that are handled only for these events, lines of the others are always handled
+    _COMMAND_EVENTS: Dict[str, Tuple[str, ...]] = {
+        'PRIVMSG': ('on_message',),
+        'WHISPER': ('on_whisper',),
+        'JOIN': ('on_user_join',),
+        'PART': ('on_user_part',),
+        'CLEARCHAT': ('on_user_timeout', 'on_user_ban', 'on_clear_chat'),
+        'CLEARMSG': ('on_message_delete',),
+        'HOSTTARGET': ('on_host_start', 'on_host_stop'),
+        'USERNOTICE': ('on_user_event', 'on_unknown_user_event') + USER_EVENTS,
+    }
+
+    _ACCUMULATED_NOTICE_IDS = frozenset(('cmds_available', 'no_help', 'room_mods', 'no_mods', 'vips_success', 'no_vips'))
+    _JOIN_ERROR_NOTICE_IDS = frozenset(('msg_room_not_found', 'msg_channel_suspended'))
+
+
+class ShardedClient(Client):
+    """
+    :class:`Client` whose channels are spread across several connections, see :class:`ShardedTTVIRCClient`.
+    Messages of all the connections are handled by the same handlers, states of channels are kept
+    when channels are moved between connections.
+
+    Args:
+        token: `str`
+            irc token of the user
+        login: `str`
+            login of the user
+        channels_per_shard: `int`
+            max count of channels joined by one connection. Default: 100.
+        max_shards: Optional[`int`]
+            max count of connections. Default: None (no limit).
+        **kwargs:
+            passed to :class:`Client`
+
+    Examples:
+        >>> client = ShardedClient(token, login, channels_per_shard=50)
+        >>> client.run(logins)
+    """
+
+    def __init__(
+            self,
+            token: str,
+            login: str,
+            *,
+            channels_per_shard: int = 100,
+            max_shards: Optional[int] = None,
+            **kwargs
+    ) -> None:
+        self._channels_per_shard: int = channels_per_shard
+        self._max_shards: Optional[int] = max_shards
+        super().__init__(token, login, **kwargs)
+
+    def _create_irc_conn(
+            self,
+            login: str,
+            token: str,
+            **kwargs
+    ) -> ShardedTTVIRCClient:
+        return ShardedTTVIRCClient(
+            login,
+            token,
+            channels_per_shard=self._channels_per_shard,
+            max_shards=self._max_shards,
+            **kwargs
+        )
+
+
+class MultiProcessClient(ShardedClient):
+    """
+    :class:`Client` whose messages are received and parsed in worker processes,
+    see :class:`MultiProcessTTVIRCClient`. Event handlers run in the current process.
+
+    Args:
+        token: `str`
+            irc token of the user
+        login: `str`
+            login of the user
+        processes: `int`
+            count of worker processes. Default: 2.
+        irc_msg_class: `Type[TwitchIRCMsg]`
+            class messages are parsed with in workers. Default: :class:`FastTwitchIRCMsg`.
+        **kwargs:
+            passed to :class:`ShardedClient`, shards are created within each of the workers
+
+    Examples:
+        >>> if __name__ == '__main__':
+        >>>     client = MultiProcessClient(token, login, processes=4)
+        >>>     client.run(logins)
+    """
+
+    def __init__(
+            self,
+            token: str,
+            login: str,
+            *,
+            processes: int = 2,
+            irc_msg_class: Type[TwitchIRCMsg] = FastTwitchIRCMsg,
+            **kwargs
+    ) -> None:
+        self._processes: int = processes
+        super().__init__(token, login, irc_msg_class=irc_msg_class, **kwargs)
+
+    def _create_irc_conn(
+            self,
+            login: str,
+            token: str,
+            **kwargs
+    ) -> MultiProcessTTVIRCClient:
+        return MultiProcessTTVIRCClient(
+            login,
+            token,
+            processes=self._processes,
+            channels_per_shard=self._channels_per_shard,
+            max_shards=self._max_shards,
+            **kwargs
+        )
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from asyncio import Queue, Task
+from collections import deque
+from typing import Awaitable, Callable, List, Optional, Dict, Iterable, Set, Coroutine, Deque
+
+from .irc_messages import TwitchIRCMsg
+
+__all__ = ('Dispatcher', 'TaskDispatcher', 'BatchDispatcher', 'WorkerPoolDispatcher', 'ChannelLanesDispatcher')
+
+MessageHandler = Callable[[TwitchIRCMsg], Awaitable[None]]
+
+
+class Dispatcher(ABC):
+    """
+    Base class for dispatchers. A dispatcher decides how :class:`Client` handles messages of received frames.
+
+    :class:`Client` binds its handler by :meth:`bind` and passes messages of each frame to :meth:`dispatch`.
+    If `awaits_events` is True, the bound handler also awaits event handlers called for the message
+    instead of creating a task for each of them.
+    """
+    awaits_events: bool = False
+
+    def __init__(self) -> None:
+        self._handler: Optional[MessageHandler] = None
+        self._tasks: Set[Task] = set()  # the loop keeps only weak references to tasks
+        self._logger = logging.getLogger(__name__)
+
+    def bind(
+            self,
+            handler: MessageHandler
+    ) -> None:
+        """Sets the coroutine function that handles a single message"""
+        self._handler = handler
+
+    @abstractmethod
+    async def dispatch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        """
+        |Coroutine|
+        Passes messages of a frame to the handler in received order.
+        Whether they are also handled in that order depends on the dispatcher.
+
+        Args:
+            irc_msgs: List[:class:`TwitchIRCMsg`]
+                messages of a received frame
+        """
+
+    async def close(self) -> None:
+        """
+        |Coroutine|
+        Stops the dispatcher. Must be called when :class:`Client` stops.
+        Cancels the dispatcher's running tasks and waits until they are finished.
+        """
+        current_task = asyncio.current_task()  # `close()` may be called from a handler
+        tasks = [task for task in self._tasks if task is not current_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _create_task(
+            self,
+            coro: Coroutine
+    ) -> Task:
+        """Creates a task and keeps a reference to it until it's done"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle_safely(
+            self,
+            irc_msg: TwitchIRCMsg
+    ) -> None:
+        """Handles :arg:`irc_msg`, logs an exception if the handler raises any"""
+        try:
+            await self._handler(irc_msg)
+        except Exception:  # one broken message must not break the others
+            self._logger.exception(f'Exception while handling {irc_msg.command}: {irc_msg}')
+
+
+class TaskDispatcher(Dispatcher):
+    """Handles each message in its own task, so messages may be handled out of order. Is used by default"""
+
+    async def dispatch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        for irc_msg in irc_msgs:
+            self._create_task(self._handle_safely(irc_msg))
+
+
+class BatchDispatcher(Dispatcher):
+    """
+    Handles all messages of a frame one after another within one task.
+
+    Notes:
+        Under bursts a frame carries dozens of messages, a task per frame is much cheaper than a task per message.
+    """
+
+    async def dispatch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        self._create_task(self._handle_batch(irc_msgs))
+
+    async def _handle_batch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        for irc_msg in irc_msgs:
+            await self._handle_safely(irc_msg)
+
+
+class WorkerPoolDispatcher(Dispatcher):
+    """
+    Handles messages by a fixed number of workers that take messages from a bounded queue.
+    Event handlers are awaited by the workers, so a slow handler slows down only the workers.
+
+    What's done with a message if the queue is full depends on `overflow`:
+        self.BLOCK:
+            waits for a free place. Reading of the connection is blocked meanwhile.
+        self.DROP_OLDEST:
+            drops the oldest queued message to put the new one.
+        self.DROP_BY_COMMAND:
+            drops the new message if its command is one of `droppable_commands`, else - waits for a free place.
+
+    Args:
+        workers: `int`
+            count of workers. Default: 8.
+        max_queued: `int`
+            max count of queued messages. Default: 10000.
+        overflow: `str`
+            one of :attr:`BLOCK`, :attr:`DROP_OLDEST`, :attr:`DROP_BY_COMMAND`. Default: :attr:`BLOCK`.
+        droppable_commands: Iterable[`str`]
+            commands may be dropped if `overflow` is :attr:`DROP_BY_COMMAND`. Default: PRIVMSG, JOIN, PART.
+
+    Examples:
+        >>> dispatcher = WorkerPoolDispatcher(workers=4, overflow=WorkerPoolDispatcher.DROP_OLDEST)
+        >>> client = Client(token, login, dispatcher=dispatcher)
+        >>> ...
+        >>> print(dispatcher.queued, dispatcher.in_flight, dispatcher.dropped)
+    """
+    BLOCK = 'BLOCK'
+    DROP_OLDEST = 'DROP_OLDEST'
+    DROP_BY_COMMAND = 'DROP_BY_COMMAND'
+
+    awaits_events = True
+
+    def __init__(
+            self,
+            *,
+            workers: int = 8,
+            max_queued: int = 10_000,
+            overflow: str = BLOCK,
+            droppable_commands: Iterable[str] = ('PRIVMSG', 'JOIN', 'PART')
+    ) -> None:
+        super().__init__()
+        if overflow not in (self.BLOCK, self.DROP_OLDEST, self.DROP_BY_COMMAND):
+            raise ValueError(f'Unknown overflow policy: {overflow}')
+        self.workers_count: int = workers
+        self.overflow: str = overflow
+        self.droppable_commands: frozenset = frozenset(droppable_commands)
+        self.max_queued: int = max_queued
+        self._queue: Optional[Queue] = None  # is created with workers, within a running loop
+        self._workers: List[Task] = []
+        self._in_flight: int = 0
+        self.dropped_by_command: Dict[str, int] = {}
+
+    @property
+    def queued(self) -> int:
+        """Count of messages waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def in_flight(self) -> int:
+        """Count of messages being handled by workers"""
+        return self._in_flight
+
+    @property
+    def dropped(self) -> int:
+        """Count of all dropped messages"""
+        return sum(self.dropped_by_command.values())
+
+    async def dispatch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        if not self._workers:
+            self._start_workers()
+        for irc_msg in irc_msgs:
+            if not self._queue.full():
+                self._queue.put_nowait(irc_msg)
+            elif self.overflow == self.DROP_OLDEST:
+                self._drop(self._queue.get_nowait())
+                self._queue.task_done()
+                self._queue.put_nowait(irc_msg)
+            elif self.overflow == self.DROP_BY_COMMAND and irc_msg.command in self.droppable_commands:
+                self._drop(irc_msg)
+            else:
+                await self._queue.put(irc_msg)
+
+    async def join(self) -> None:
+        """
+        |Coroutine|
+        Waits until all queued messages are handled.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        await super().close()  # cancels the workers except the one `close()` is called from
+        self._workers.clear()
+
+    def _start_workers(self) -> None:
+        if self._queue is None:
+            self._queue = Queue(self.max_queued)
+        self._workers = [self._create_task(self._work()) for _ in range(self.workers_count)]
+
+    def _drop(
+            self,
+            irc_msg: TwitchIRCMsg
+    ) -> None:
+        self.dropped_by_command[irc_msg.command] = self.dropped_by_command.get(irc_msg.command, 0) + 1
+
+    async def _work(self) -> None:
+        while True:
+            irc_msg = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._handle_safely(irc_msg)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+
+class ChannelLanesDispatcher(Dispatcher):
+    """
+    Handles messages of each channel one after another in received order, different channels - concurrently.
+    Event handlers are awaited within the lane, so e.g. `on_message_delete` always comes after `on_message`
+    of the deleted message. Messages without a channel (e.g. WHISPER, GLOBALSTATE) share their own lane.
+
+    A lane (a queue and a task draining it) is created when a message of the channel comes
+    and is removed as soon as the queue is empty, so idle channels take no memory.
+
+    Examples:
+        >>> client = Client(token, login, dispatcher=ChannelLanesDispatcher())
+    """
+    awaits_events = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lanes: Dict[Optional[str], Deque[TwitchIRCMsg]] = {}
+
+    @property
+    def lanes(self) -> int:
+        """Count of channels that have messages being handled"""
+        return len(self._lanes)
+
+    @property
+    def queued(self) -> int:
+        """Count of messages waiting in lanes, including the ones being handled"""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    async def dispatch(
+            self,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> None:
+        for irc_msg in irc_msgs:
+            lane = self._lanes.get(irc_msg.channel)
+            if lane is not None:
+                lane.append(irc_msg)
+            else:
+                self._lanes[irc_msg.channel] = deque((irc_msg,))
+                self._create_task(self._drain(irc_msg.channel))
+
+    async def close(self) -> None:
+        await super().close()
+        self._lanes.clear()
+
+    async def _drain(
+            self,
+            channel: Optional[str]
+    ) -> None:
+        lane = self._lanes[channel]
+        try:
+            while lane:
+                # the message stays in the lane while it's handled, so new messages don't start a new lane
+                await self._handle_safely(lane[0])
+                lane.popleft()
+        finally:
+            if self._lanes.get(channel) is lane:
+                del self._lanes[channel]
@@ -1,9 +1,14 @@
 from typing import Iterable, Tuple, Generator
 
+from ..utils import USE_SLOTS
+
 __all__ = ('BaseEmote', 'SubEmote', 'Emote')
 
 
 class BaseEmote:
+    if USE_SLOTS:
+        __slots__ = ('id', 'content')
+
     def __init__(self, id_: str, content: str):
         self.id: str = id_
         self.content: str = content
@@ -13,6 +18,9 @@ class BaseEmote:
 
 
 class SubEmote(BaseEmote):
+    if USE_SLOTS:
+        __slots__ = ('start', 'end')
+
     def __init__(self, id_: str, content: str, start, end):
         super().__init__(id_, content)
         self.start = start
@@ -27,6 +35,9 @@ class SubEmote(BaseEmote):
 
 
 class Emote(BaseEmote):
+    if USE_SLOTS:
+        __slots__ = ('positions',)
+
     def __init__(self, id_: str, content: str, positions: Iterable[Tuple[int, int]]):
         super().__init__(id_, content)
         self.positions: Tuple[Tuple[int, int], ...] = tuple(positions)
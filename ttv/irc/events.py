@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import AbstractSet, Dict, Optional, Tuple
 
-from .channel import Channel
+from ..utils import USE_SLOTS
+from .channel import Channel, ChannelState
 
 __all__ = (
     'OnUserTimeout',
@@ -9,12 +11,19 @@ __all__ = (
     'OnChannelJoinError',
     'OnNotice',
     'OnMessageDelete',
-    'OnSendMessageError'
+    'OnSendMessageError',
+    'OnJoinProgress',
+    'OnNamesUpdate',
+    'OnChannelUpdate',
+    'OnHandlerError'
 )
 
 
 @dataclass
 class OnUserTimeout:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'user_login', 'user_id', 'message_id', 'duration', 'timestamp')
+
     channel: Channel
     user_login: str
     user_id: str
@@ -25,6 +34,9 @@ class OnUserTimeout:
 
 @dataclass
 class OnUserBan:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'user_login', 'user_id', 'message_id', 'timestamp')
+
     channel: Channel
     user_login: str
     user_id: str
@@ -34,12 +46,18 @@ class OnUserBan:
 
 @dataclass
 class OnClearChat:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'timestamp')
+
     channel: Channel
     timestamp: int
 
 
 @dataclass
 class OnChannelJoinError:
+    if USE_SLOTS:
+        __slots__ = ('channel_login', 'reason', 'message')
+
     channel_login: str
     reason: str
     message: str
@@ -47,6 +65,9 @@ class OnChannelJoinError:
 
 @dataclass
 class OnNotice:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'notice_id', 'message')
+
     channel: Channel
     notice_id: str
     message: str
@@ -54,6 +75,9 @@ class OnNotice:
 
 @dataclass
 class OnMessageDelete:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'user_login', 'content', 'message_id', 'timestamp')
+
     channel: Channel
     user_login: str
     content: str
@@ -63,6 +87,50 @@ class OnMessageDelete:
 
 @dataclass
 class OnSendMessageError:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'reason', 'message')
+
     channel: Channel
     reason: str
     message: str
+
+
+@dataclass
+class OnJoinProgress:
+    if USE_SLOTS:
+        __slots__ = ('joined', 'total', 'channels')
+
+    joined: int  # count of channels whose JOIN is sent
+    total: int  # count of channels planned to be joined
+    channels: Tuple[str, ...]  # channels of the last sent JOIN
+
+
+@dataclass
+class OnNamesUpdate:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'added', 'removed')
+
+    channel: Channel
+    added: AbstractSet[str]  # logins that weren't in the previous names
+    removed: AbstractSet[str]  # logins that are gone since the previous names
+
+
+@dataclass
+class OnChannelUpdate:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'before', 'after', 'changes')
+
+    channel: Channel
+    before: ChannelState  # snapshot of the state before the update
+    after: ChannelState  # snapshot of the state after the update
+    changes: Dict[str, Tuple[Optional[str], Optional[str]]]  # changed keys: (old value, new value)
+
+
+@dataclass
+class OnHandlerError:
+    if USE_SLOTS:
+        __slots__ = ('event_name', 'channel_login', 'exception')
+
+    event_name: str  # event whose handler has failed
+    channel_login: Optional[str]  # channel the event is called for, None if the event has no channel
+    exception: Exception  # :exc:`asyncio.TimeoutError` if the handler has exceeded its timeout
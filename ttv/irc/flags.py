@@ -1,10 +1,15 @@
 from abc import ABC
 from typing import Tuple, Iterable, Generator
 
+from ..utils import USE_SLOTS
+
 __all__ = ('BaseFlag', 'Flag', 'SubFlag')
 
 
 class BaseFlag(ABC):
+    if USE_SLOTS:
+        __slots__ = ('content', 'start', 'end')
+
     def __init__(self, content: str, start: int, end: int):
         self.content: str = content
         self.start: int = start
@@ -17,6 +22,9 @@ class BaseFlag(ABC):
 
 class SubFlag(BaseFlag):
     """Class represents a sub flag with its id, content, and position(start, end)."""
+    if USE_SLOTS:
+        __slots__ = ('id',)
+
     def __init__(self, id_: str, content: str, start: int, end: int):
         super().__init__(content, start, end)
         self.id: str = id_
@@ -56,6 +64,8 @@ class Flag(BaseFlag):
         Flag I.5 in position (29, 34) :bitch
         Flag P.6 in position (29, 34) :bitch
     """
+    if USE_SLOTS:
+        __slots__ = ('ids',)
 
     def __init__(self, ids: Iterable[str], content: str, start: int, end: int):
         """
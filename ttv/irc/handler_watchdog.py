@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from .channel import Channel
+
+__all__ = ('HandlerStats', 'HandlerWatchdog', 'get_event_channel')
+
+
+def get_event_channel(args: Sequence) -> Optional[str]:
+    """Returns login of the channel an event is called for by arguments of the event, None if it has no channel"""
+    for arg in args:
+        if isinstance(arg, Channel):
+            return arg.login
+        elif isinstance(channel := getattr(arg, 'channel', None), Channel):  # messages and events
+            return channel.login
+        elif isinstance(channel_login := getattr(arg, 'channel_login', None), str):
+            return channel_login
+    return None
+
+
+class HandlerStats:
+    """
+    Durations of finished calls of an event's handler
+
+    Attributes:
+        event_name: `str`
+        calls: `int`
+            count of finished calls, including failed ones
+        errors: `int`
+            count of calls that have raised an exception, including timed out ones
+        timeouts: `int`
+            count of calls cancelled by the timeout of the event
+        total_seconds: `float`
+        max_seconds: `float`
+    """
+    __slots__ = ('event_name', 'calls', 'errors', 'timeouts', 'total_seconds', 'max_seconds')
+
+    def __init__(
+            self,
+            event_name: str
+    ) -> None:
+        self.event_name: str = event_name
+        self.calls: int = 0
+        self.errors: int = 0
+        self.timeouts: int = 0
+        self.total_seconds: float = 0.0
+        self.max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def copy(self) -> 'HandlerStats':
+        new = HandlerStats(self.event_name)
+        for name in self.__slots__:
+            setattr(new, name, getattr(self, name))
+        return new
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self.event_name!r}, calls={self.calls}, errors={self.errors}, '
+                f'timeouts={self.timeouts}, mean={self.mean_seconds:.6f}s, max={self.max_seconds:.6f}s)')
+
+
+class HandlerWatchdog:
+    """
+    Watches event handlers called by :class:`Client`: limits their duration, logs slow and failed ones
+    and keeps stats of their durations.
+
+    A handler that exceeds the timeout of its event is cancelled. An exception of a handler
+    (:exc:`asyncio.TimeoutError` for a timed out one) is logged and passed to `on_handler_error` of the client.
+
+    Args:
+        timeouts: Dict[`str`, `float`]
+            seconds a handler of the event may run. Default: no timeouts.
+        default_timeout: Optional[`float`]
+            seconds a handler of an event missing in `timeouts` may run. Default: None (no timeout).
+        slow_threshold: Optional[`float`]
+            handlers running longer are logged with the event's name, channel and duration.
+            Default: None (nothing is logged).
+
+    Examples:
+        >>> watchdog = HandlerWatchdog(timeouts={'on_message': 2}, slow_threshold=0.1)
+        >>> client = Client(token, login, handler_watchdog=watchdog)
+        >>> ...
+        >>> for stats in watchdog.snapshot(top=5):  # the slowest ones
+        >>>     print(stats)
+    """
+
+    def __init__(
+            self,
+            *,
+            timeouts: Optional[Dict[str, float]] = None,
+            default_timeout: Optional[float] = None,
+            slow_threshold: Optional[float] = None
+    ) -> None:
+        self.timeouts: Dict[str, float] = dict(timeouts or {})
+        self.default_timeout: Optional[float] = default_timeout
+        self.slow_threshold: Optional[float] = slow_threshold
+        self._stats: Dict[str, HandlerStats] = {}
+        self._logger = logging.getLogger(__name__)
+
+    def get_timeout(
+            self,
+            event_name: str
+    ) -> Optional[float]:
+        return self.timeouts.get(event_name, self.default_timeout)
+
+    def observe(
+            self,
+            event_name: str,
+            seconds: float,
+            error: Optional[Exception],
+            args: Sequence
+    ) -> None:
+        """Counts the finished call of the event's handler, logs it if it's slow or has failed"""
+        try:
+            stats = self._stats[event_name]
+        except KeyError:
+            stats = self._stats[event_name] = HandlerStats(event_name)
+        stats.calls += 1
+        stats.total_seconds += seconds
+        if seconds > stats.max_seconds:
+            stats.max_seconds = seconds
+        if error is not None:
+            stats.errors += 1
+            if isinstance(error, asyncio.TimeoutError):
+                stats.timeouts += 1
+                self._logger.error('Handler of %s in #%s is cancelled after %.3f s',
+                                   event_name, get_event_channel(args), seconds)
+            else:
+                self._logger.error('Exception in handler of %s in #%s',
+                                   event_name, get_event_channel(args), exc_info=error)
+        elif self.slow_threshold is not None and seconds > self.slow_threshold:
+            self._logger.warning('Slow handler of %s in #%s took %.3f s', event_name, get_event_channel(args), seconds)
+
+    def snapshot(
+            self,
+            top: Optional[int] = None
+    ) -> List[HandlerStats]:
+        """Returns copies of stats of handlers, the slowest (by max duration) first, only `top` of them if given"""
+        stats = sorted((stats.copy() for stats in self._stats.values()), key=lambda s: s.max_seconds, reverse=True)
+        return stats[:top] if top is not None else stats
+
+    def reset(self) -> None:
+        self._stats.clear()
@@ -0,0 +1,392 @@
+import asyncio
+import logging
+import multiprocessing
+import zlib
+from asyncio import Queue, create_task
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from collections import deque
+from threading import Thread, Semaphore
+from typing import Optional, Union, AsyncGenerator, Callable, Coroutine, List, Dict, Tuple, Type, Any
+
+from ..backends import install_event_loop_policy
+from .irc_connections import ShardedTTVIRCClient, empty_coroutine
+from .irc_messages import IRCMsg, TwitchIRCMsg, FastTwitchIRCMsg
+from .line_filters import LineFilter
+from .metrics import Metrics
+from .rate_limits import OutboundScheduler
+
+__all__ = ('MultiProcessTTVIRCClient', )
+
+# kinds of items sent by workers
+_READY = 'READY'
+_BATCH = 'BATCH'
+_RECONNECT = 'RECONNECT'
+_ERROR = 'ERROR'
+_STOPPED = 'STOPPED'
+
+# methods of :class:`ShardedTTVIRCClient` the parent may call in workers
+_COMMANDS = frozenset((
+    'join_channels', 'part_channels', 'assign_channels', 'send', 'send_msg', 'send_whisper', 'set_channel_moderated',
+    'set_line_filter', 'stop'
+))
+
+PackedIRCMsg = Tuple[
+    str, Dict[str, Optional[str]], Optional[str], Optional[str], Optional[str], Optional[str],
+    Tuple[str, ...], Optional[str], Optional[str], Optional[str]
+]
+
+
+def _pack_irc_msg(irc_msg: TwitchIRCMsg) -> PackedIRCMsg:
+    """Returns parsed parts of the message as a tuple, it's much cheaper to pickle than the message"""
+    return (
+        irc_msg.command, irc_msg.tags, irc_msg.servername, irc_msg.nickname, irc_msg.user, irc_msg.host,
+        irc_msg.middles, irc_msg.trailing, irc_msg.channel, irc_msg.msg_id
+    )
+
+
+def _unpack_irc_msg(packed_irc_msg: PackedIRCMsg) -> TwitchIRCMsg:
+    """Creates :class:`TwitchIRCMsg` from parts returned by :func:`_pack_irc_msg` without parsing anything"""
+    irc_msg = TwitchIRCMsg.__new__(TwitchIRCMsg)
+    (
+        irc_msg.command, irc_msg.tags, irc_msg.servername, irc_msg.nickname, irc_msg.user, irc_msg.host,
+        irc_msg.middles, irc_msg.trailing, irc_msg.channel, irc_msg.msg_id
+    ) = packed_irc_msg
+    return irc_msg
+
+
+class MultiProcessTTVIRCClient:
+    """
+    Receives and parses messages in worker processes, each of them owns a :class:`ShardedTTVIRCClient`.
+    Workers send parsed parts of messages to the parent process, where they are yielded by :meth:`iter_batches`.
+    Has the same interface as :class:`TTVIRCClient`.
+
+    A channel is joined by the worker chosen by a stable hash (CRC32) of the channel's login,
+    so the channel gets the same worker whenever it's joined.
+    Messages without a channel (e.g. WHISPER) come only from the first worker.
+
+    Args:
+        login: `str`
+            login of the user
+        token: `str`
+            irc token of the user
+        processes: `int`
+            count of worker processes. Default: 2.
+        on_recconect_callback: Callable[[], Coroutine]
+            is called in the parent process when a connection of any worker is restarted
+        irc_msg_class: `Type[TwitchIRCMsg]`
+            class messages are parsed with in workers. Default: :class:`FastTwitchIRCMsg`.
+            Messages are yielded as :class:`TwitchIRCMsg` anyway.
+        **kwargs:
+            passed to :class:`ShardedTTVIRCClient` of each worker, must be picklable.
+            Each worker gets its own copy of `rate_limits`, so they should be divided by the count of workers.
+
+    Notes:
+        Workers are started by the `spawn` method, so a script using it must be guarded by
+        `if __name__ == '__main__':`.
+    """
+
+    def __init__(
+            self,
+            login: str,
+            token: str,
+            *,
+            processes: int = 2,
+            on_recconect_callback: Callable[[], Coroutine] = None,
+            irc_msg_class: Type[TwitchIRCMsg] = FastTwitchIRCMsg,
+            **kwargs
+    ):
+        self.login: str = login
+        self.token: str = 'oauth:' + token if not token.startswith('oauth:') else token
+        self.processes_count: int = processes
+        self.on_recconect_callback: Callable[[], Coroutine] = on_recconect_callback or empty_coroutine
+        self.is_running: bool = False
+        self._worker_kwargs: Dict[str, Any] = dict(kwargs, irc_msg_class=irc_msg_class)
+        self._line_filter: Optional[LineFilter] = None
+        self.metrics: Optional[Metrics] = None
+        self._processes: List[multiprocessing.Process] = []
+        self._command_conns: List[Connection] = []
+        self._received: Optional[Queue] = None  # is created by `connect()`, within a running loop
+        self._free_places: Semaphore = Semaphore(processes * 16)  # limits items received but not handled yet
+        self._running_workers: set = set()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def is_anon(self) -> bool:
+        return self.login.startswith('justinfan') and not self.login == 'justinfan'
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self._running_workers)
+
+    @property
+    def is_restarting(self) -> bool:
+        return False  # workers restart their connections by themselves
+
+    def get_worker_index(
+            self,
+            channel: str
+    ) -> int:
+        """Returns index of the worker the channel is joined by"""
+        return zlib.crc32(channel.encode()) % self.processes_count
+
+    async def connect(self) -> TwitchIRCMsg:
+        """
+        Starts the workers, waits until each of them has connected.
+        Returns GLOBALUSERSTATE (or an empty message for an anon user) got by the first worker.
+        """
+        loop = asyncio.get_running_loop()
+        self._received = Queue()
+        context = multiprocessing.get_context('spawn')
+        # spawned workers don't inherit the policy, they run the same loop as the parent
+        event_loop = 'uvloop' if type(loop).__module__.startswith('uvloop') else 'asyncio'
+        for index in range(self.processes_count):
+            commands_receiver, commands_sender = context.Pipe(duplex=False)
+            items_receiver, items_sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_run_worker,
+                args=(index, self.login, self.token, self._worker_kwargs, commands_receiver, items_sender, event_loop),
+                name=f'ttv-irc-worker-{index}',
+                daemon=True
+            )
+            process.start()
+            commands_receiver.close()
+            items_sender.close()
+            self._processes.append(process)
+            self._command_conns.append(commands_sender)
+            if self._line_filter is not None:  # is executed before any channel is joined
+                self._command(index, 'set_line_filter', self._line_filter)
+            Thread(target=self._receive, args=(index, items_receiver, loop), daemon=True).start()
+            self._running_workers.add(index)
+        global_states: Dict[int, TwitchIRCMsg] = {}
+        while len(global_states) < self.processes_count:
+            index, (kind, payload) = await self._get_item()
+            if kind == _ERROR:
+                await self.stop()
+                raise payload
+            elif kind == _READY:
+                global_states[index] = _unpack_irc_msg(payload)
+        self._logger.info(f'{self.__repr__()} has connected')
+        return global_states[0]
+
+    async def send(self, irc_msg: Union[IRCMsg, str]):
+        self._command(0, 'send', str(irc_msg))
+
+    async def send_msg(self, channel: str, msg: str, *, priority: int = OutboundScheduler.NORMAL):
+        self._command(self.get_worker_index(channel), 'send_msg', channel, msg, priority=priority)
+
+    def set_line_filter(self, line_filter: Optional[LineFilter]):
+        """Sets the filter of lines received by the workers, lines are dropped before they are parsed"""
+        self._line_filter = line_filter
+        for index in range(len(self._command_conns)):
+            self._command(index, 'set_line_filter', line_filter)
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """
+        Sets the registry received messages and reconnects are counted in.
+        Frames are received and parsed by the workers, their size and parse time aren't measured.
+        """
+        self.metrics = metrics
+
+    def set_channel_moderated(self, channel: str, is_moderated: bool):
+        self._command(self.get_worker_index(channel), 'set_channel_moderated', channel, is_moderated)
+
+    async def send_whisper(self, target: str, msg: str, *, through: str = None):
+        self._command(0, 'send_whisper', target, msg, through=through)
+
+    async def assign_channels(self, *channels: str):
+        for index, worker_channels in self._group_by_worker(channels).items():
+            self._command(index, 'assign_channels', *worker_channels)
+
+    async def join_channels(self, *channels: str):
+        for index, worker_channels in self._group_by_worker(channels).items():
+            self._command(index, 'join_channels', *worker_channels)
+
+    async def part_channels(self, *channels: str):
+        for index, worker_channels in self._group_by_worker(channels).items():
+            self._command(index, 'part_channels', *worker_channels)
+
+    async def stop(self, code: int = 1000, reason: str = 'no reason'):
+        for index in range(len(self._command_conns)):
+            self._command(index, 'stop', code, reason)
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, 5)
+            if process.is_alive():
+                process.kill()
+        for command_conn in self._command_conns:
+            command_conn.close()
+        self._processes.clear()
+        self._command_conns.clear()
+
+    async def iter_batches(self) -> AsyncGenerator[List[TwitchIRCMsg], None]:
+        """
+        Same as :meth:`TTVIRCClient.iter_batches` but yields batches of all the workers.
+        Ends when all the workers are stopped.
+        """
+        self.is_running = True
+        try:
+            while self._running_workers:
+                index, (kind, payload) = await self._get_item()
+                if kind == _BATCH:
+                    irc_msgs = [_unpack_irc_msg(packed_irc_msg) for packed_irc_msg in payload]
+                    if (metrics := self.metrics) is not None:
+                        for irc_msg in irc_msgs:
+                            metrics.count(metrics.MESSAGES, irc_msg.command)
+                    yield irc_msgs
+                elif kind == _RECONNECT:
+                    if self.metrics is not None:
+                        self.metrics.count(self.metrics.RECONNECTS)
+                    create_task(self.on_recconect_callback())
+                elif kind == _STOPPED:
+                    self._running_workers.discard(index)
+                elif kind == _ERROR:
+                    raise payload
+        finally:
+            self.is_running = False
+
+    async def _get_item(self) -> Tuple[int, Tuple[str, Any]]:
+        item = await self._received.get()
+        self._free_places.release()
+        return item
+
+    def _group_by_worker(
+            self,
+            channels: Tuple[str, ...]
+    ) -> Dict[int, List[str]]:
+        channels_by_worker: Dict[int, List[str]] = {}
+        for channel in channels:
+            channels_by_worker.setdefault(self.get_worker_index(channel), []).append(channel)
+        return channels_by_worker
+
+    def _command(
+            self,
+            index: int,
+            name: str,
+            *args,
+            **kwargs
+    ) -> None:
+        """Makes the worker call the method of its :class:`ShardedTTVIRCClient`"""
+        try:
+            self._command_conns[index].send((name, args, kwargs))
+        except (OSError, ValueError):  # the worker is stopped, its pipe is closed
+            self._logger.warning(f'{self.__repr__()} skipped {name} for stopped worker {index}')
+
+    def _receive(
+            self,
+            index: int,
+            items_conn: Connection,
+            loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Passes items sent by the worker to the loop. Runs in a thread"""
+        while True:
+            try:
+                item = items_conn.recv()
+            except (EOFError, OSError):  # the worker has exited
+                item = (_STOPPED, None)
+            self._free_places.acquire()  # a slow parent slows down reading of the workers
+            loop.call_soon_threadsafe(self._received.put_nowait, (index, item))
+            if item[0] == _STOPPED:
+                items_conn.close()
+                return
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} ({self.processes_count} processes):({self.login})'
+
+
+def _run_worker(
+        index: int,
+        login: str,
+        token: str,
+        kwargs: Dict[str, Any],
+        commands_conn: Connection,
+        items_conn: Connection,
+        event_loop: str = 'asyncio'
+) -> None:
+    """Entry point of a worker process"""
+    install_event_loop_policy(event_loop)
+    asyncio.run(_work(index, login, token, kwargs, commands_conn, items_conn))
+
+
+async def _work(
+        index: int,
+        login: str,
+        token: str,
+        kwargs: Dict[str, Any],
+        commands_conn: Connection,
+        items_conn: Connection
+) -> None:
+    loop = asyncio.get_running_loop()
+    sender = ThreadPoolExecutor(1)  # keeps the order of items, sending mustn't block the loop
+    sending = deque()
+
+    async def send(kind: str, payload: Any = None):
+        sending.append(loop.run_in_executor(sender, items_conn.send, (kind, payload)))
+        if len(sending) > 16:  # the parent is slower than the connections
+            await sending.popleft()
+
+    async def on_reconnect():
+        await send(_RECONNECT)
+
+    irc_conn = ShardedTTVIRCClient(login, token, on_recconect_callback=on_reconnect, **kwargs)
+    try:
+        global_state = await irc_conn.connect()
+    except Exception as e:
+        await send(_ERROR, e)
+    else:
+        if not isinstance(global_state, TwitchIRCMsg):  # an empty :class:`IRCMsg` for an anon user
+            global_state = TwitchIRCMsg.create_empty()
+        await send(_READY, _pack_irc_msg(global_state))
+        commands: Queue = Queue()
+        Thread(target=_receive_commands, args=(commands_conn, commands, loop), daemon=True).start()
+        executing = create_task(_execute_commands(irc_conn, commands))
+        try:
+            async for irc_msgs in irc_conn.iter_batches():
+                if index:  # messages without a channel come only from the first worker
+                    packed_irc_msgs = [_pack_irc_msg(irc_msg) for irc_msg in irc_msgs if irc_msg.channel is not None]
+                else:
+                    packed_irc_msgs = [_pack_irc_msg(irc_msg) for irc_msg in irc_msgs]
+                if packed_irc_msgs:
+                    await send(_BATCH, packed_irc_msgs)
+        except Exception as e:
+            await send(_ERROR, e)
+        executing.cancel()
+    await send(_STOPPED)
+    for sent in sending:
+        await sent
+    sender.shutdown()
+    items_conn.close()
+
+
+def _receive_commands(
+        commands_conn: Connection,
+        commands: Queue,
+        loop: asyncio.AbstractEventLoop
+) -> None:
+    """Passes commands sent by the parent to the loop. Runs in a thread"""
+    while True:
+        try:
+            command = commands_conn.recv()
+        except (EOFError, OSError):  # the parent has exited
+            command = ('stop', (), {})
+        loop.call_soon_threadsafe(commands.put_nowait, command)
+        if command[0] == 'stop':
+            return
+
+
+async def _execute_commands(
+        irc_conn: ShardedTTVIRCClient,
+        commands: Queue
+) -> None:
+    """Calls commanded methods one by one, in received order"""
+    logger = logging.getLogger(__name__)
+    while True:
+        name, args, kwargs = await commands.get()
+        if name not in _COMMANDS:
+            logger.error(f'Unknown command of a worker: {name}')
+            continue
+        try:
+            if asyncio.iscoroutine(result := getattr(irc_conn, name)(*args, **kwargs)):
+                await result
+        except Exception:
+            logger.exception(f'Exception while executing {name} in a worker')
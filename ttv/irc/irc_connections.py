@@ -1,8 +1,8 @@
 import asyncio
 import logging
-from asyncio import Task, create_task
-from time import time
-from typing import Optional, Union, AsyncGenerator, Callable, Coroutine, Generator, Iterable
+from asyncio import Task, Queue, create_task
+from time import perf_counter, time
+from typing import Optional, Union, AsyncGenerator, Callable, Coroutine, Generator, Iterable, Type, List, Dict, Set
 
 import websockets
 from websockets.exceptions import ConnectionClosed, ConnectionClosedOK
@@ -10,8 +10,13 @@ from websockets.legacy.client import WebSocketClientProtocol
 
 from .exceptions import CapReqError, LoginFailed
 from .irc_messages import IRCMsg, TwitchIRCMsg
+from .line_filters import LineFilter
+from .metrics import Metrics
+from .rate_limits import RateLimits, OutboundScheduler
+from .recording import FrameRecorder
+from .utils import split_channels
 
-__all__ = ('IRCClient', 'irc_connect', 'TTVIRCClient', 'ttv_connect', 'ANON_LOGIN')
+__all__ = ('IRCClient', 'irc_connect', 'TTVIRCClient', 'ttv_connect', 'ShardedTTVIRCClient', 'ANON_LOGIN')
 
 
 ANON_LOGIN = 'justinfan0'
@@ -20,13 +25,19 @@ ANON_LOGIN = 'justinfan0'
 class IRCClient:
     def __init__(
             self,
-            uri: str
+            uri: str,
+            *,
+            irc_msg_class: Type[TwitchIRCMsg] = TwitchIRCMsg
     ):
         self.is_running: bool = False
         self._uri = uri
+        self.irc_msg_class: Type[TwitchIRCMsg] = irc_msg_class
+        self.line_filter: Optional[LineFilter] = None  # drops received lines before they are parsed
+        self.metrics: Optional[Metrics] = None  # nothing is measured without it
+        self.recorder: Optional[FrameRecorder] = None  # writes received frames to replay them
         self._ws: WebSocketClientProtocol = WebSocketClientProtocol()
         self._logger = logging.getLogger(__name__)
-        self._logger.debug(f'Created {self.__class__.__name__} for uri:{self._uri}')
+        self._logger.debug('Created %s for uri:%s', self.__class__.__name__, self._uri)
 
     @property
     def is_connected(self):
@@ -36,47 +47,101 @@ class IRCClient:
         self._ws = await websockets.connect(self._uri)
         self._logger.info(f'{self.__repr__()} has connected')
 
+    def set_line_filter(self, line_filter: Optional[LineFilter]):
+        """Sets the filter received lines must be accepted by to be parsed, None - to parse all the lines"""
+        self.line_filter = line_filter
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """Sets the registry received frames and messages are counted in, None - to not measure anything"""
+        self.metrics = metrics
+
+    def set_recorder(self, recorder: Optional[FrameRecorder]):
+        """Sets the recorder raw received frames are written by, None - to stop recording"""
+        self.recorder = recorder
+
     async def send(self, irc_msg: Union[IRCMsg, str]):
         """ Sends <irc_msg> """
         irc_msg = str(irc_msg) + '\r\n'
         await self._ws.send(irc_msg)
-        self._logger.debug(f'[{self.__repr__()}] Sending {irc_msg}')
+        self._logger.debug('[%r] Sending %s', self, irc_msg)
 
     async def send_msg(self, channel: str, msg: str):
         await self.send(f'PRIVMSG #{channel} :{msg}')
 
     async def join_channels(self, *channels: str):
-        self._logger.debug(f'{self.__repr__()} join {len(channels)} channels')
-        if channels:
-            logins_str = ',#'.join(channels)
+        """Joins the channels, sends as many JOIN lines as needed to not exceed the line length limit"""
+        self._logger.debug('%r join %d channels', self, len(channels))
+        for chunk in split_channels('JOIN', channels):
+            logins_str = ',#'.join(chunk)
             await self.send(f'JOIN #{logins_str}')
 
     async def part_channels(self, *channels: str):
-        self._logger.debug(f'{self.__repr__()} part {len(channels)} channels')
-        if channels:
-            logins_str = ',#'.join(channels)
+        """Parts the channels, sends as many PART lines as needed to not exceed the line length limit"""
+        self._logger.debug('%r part %d channels', self, len(channels))
+        for chunk in split_channels('PART', channels):
+            logins_str = ',#'.join(chunk)
             await self.send(f'PART #{logins_str}')
 
     async def stop(self, code: int = 1000, reason: str = 'no reason'):
         await self._ws.close(code, reason)
         self._logger.info(f'Connection stoped with code: {code} and reason: {reason}')
 
-    async def __aiter__(self) -> AsyncGenerator[TwitchIRCMsg, None]:
+    async def iter_batches(self) -> AsyncGenerator[List[TwitchIRCMsg], None]:
+        """
+        Yields all the parsed messages of a received frame as one list. Frames without messages are skipped.
+        Answers PINGs itself. Lines not accepted by :attr:`line_filter` are dropped.
+        """
         self.is_running = True
         self._logger.info(f'{self.__repr__()} is running')
         async for raw_irc_msgs in self._ws:
+            if self.recorder is not None:
+                self.recorder.record(raw_irc_msgs)
+            irc_msgs = []
+            line_filter = self.line_filter
+            if (metrics := self.metrics) is not None:
+                started_at = perf_counter()
+                dropped = 0
             for raw_irc_msg in raw_irc_msgs.split('\r\n'):
                 if not raw_irc_msg:  # skip empty ones
                     continue
                 elif raw_irc_msg.startswith('PING'):
                     await self.send(raw_irc_msg.replace('PING', 'PONG', 1))  # saving parts such servername
-                    self._logger.debug(f'{self.__repr__()} PING requested. PONG sent')
+                    self._logger.debug('%r PING requested. PONG sent', self)
+                elif line_filter is not None and not line_filter.accepts(raw_irc_msg):
+                    if metrics is not None:
+                        dropped += 1
                 else:
-                    self._logger.debug(f'{self.__repr__()} got raw_msg: {raw_irc_msg}')
-                    yield TwitchIRCMsg(raw_irc_msg)
+                    self._logger.debug('%r got raw_msg: %s', self, raw_irc_msg)
+                    irc_msgs.append(self.irc_msg_class(raw_irc_msg))
+            if metrics is not None:
+                self._measure_frame(metrics, raw_irc_msgs, irc_msgs, dropped, perf_counter() - started_at)
+            if irc_msgs:
+                yield irc_msgs
         self._logger.info(f'{self.__repr__()} successfully stoped')
         self.is_running = False
 
+    @staticmethod
+    def _measure_frame(
+            metrics: Metrics,
+            raw_irc_msgs: str,
+            irc_msgs: List[TwitchIRCMsg],
+            dropped: int,
+            parse_seconds: float
+    ) -> None:
+        # text frames are decoded already, their bytes are counted again only if they have non-ASCII symbols
+        size = len(raw_irc_msgs) if raw_irc_msgs.isascii() else len(raw_irc_msgs.encode())
+        metrics.count(metrics.RECEIVED_BYTES, amount=size)
+        metrics.observe(metrics.PARSE_SECONDS, parse_seconds)
+        if dropped:
+            metrics.count(metrics.DROPPED_LINES, amount=dropped)
+        for irc_msg in irc_msgs:
+            metrics.count(metrics.MESSAGES, irc_msg.command)
+
+    async def __aiter__(self) -> AsyncGenerator[TwitchIRCMsg, None]:
+        async for irc_msgs in self.iter_batches():
+            for irc_msg in irc_msgs:
+                yield irc_msg
+
     def __repr__(self):
         return f'{self.__class__.__name__} ({self._uri})'
 
@@ -96,9 +161,11 @@ class TTVIRCClient(IRCClient):
             uri: str = 'wss://irc-ws.chat.twitch.tv:443',
             keep_alive: bool = True,
             whisper_agent: str = 'ananonymousgifter',
-            on_recconect_callback: Callable[[], Coroutine] = None
+            on_recconect_callback: Callable[[], Coroutine] = None,
+            irc_msg_class: Type[TwitchIRCMsg] = TwitchIRCMsg,
+            rate_limits: Optional[RateLimits] = None
     ):
-        super().__init__(uri)
+        super().__init__(uri, irc_msg_class=irc_msg_class)
         self.login: str = login
         self.token: str = 'oauth:' + token if not token.startswith('oauth:') else token
         self.whisper_agent = whisper_agent
@@ -108,6 +175,10 @@ class TTVIRCClient(IRCClient):
         self._restarting_task: Optional[Task] = None
         self.on_recconect_callback: Callable[[], Coroutine] = on_recconect_callback or empty_coroutine
         self._joined_channel_logins: set = set()
+        # messages and JOINs are sent right away without limits
+        self.scheduler: Optional[OutboundScheduler] = None
+        if rate_limits is not None:
+            self.scheduler = OutboundScheduler(self.send, rate_limits)
 
     @property
     def is_restarting(self):
@@ -165,31 +236,61 @@ class TTVIRCClient(IRCClient):
                 else:
                     raise
 
+    async def send_msg(self, channel: str, msg: str, *, priority: int = OutboundScheduler.NORMAL):
+        """
+        Sends :arg:`msg` into the channel.
+        If self.scheduler is set waits for the budget of the channel, moderation commands should be sent with
+        :attr:`OutboundScheduler.HIGH` priority to be sent before waiting messages.
+        """
+        if self.scheduler is None:
+            await super().send_msg(channel, msg)
+        else:
+            await self.scheduler.schedule(self.scheduler.get_msg_lane(channel), f'PRIVMSG #{channel} :{msg}', priority)
+
     async def send_whisper(self, target: str, msg: str, *, through: str = None):
         through = through or self.whisper_agent
-        await self.send_msg(through, f'/w {target} {msg}')
+        if self.scheduler is None:
+            await self.send_msg(through, f'/w {target} {msg}')
+        else:
+            await self.scheduler.schedule(self.scheduler.WHISPER, f'PRIVMSG #{through} :/w {target} {msg}')
+
+    def set_channel_moderated(self, channel: str, is_moderated: bool):
+        """Sets whether the user is a moderator or the broadcaster of the channel, defines budget of its messages"""
+        if self.scheduler is not None:
+            self.scheduler.set_moderated(channel, is_moderated)
 
     async def join_channels(self, *channels: str):
         self._joined_channel_logins.update(channels)
-        await super().join_channels(*channels)
-        self._logger.debug(f'actual channels for [{self.__repr__()}] are: {self._joined_channel_logins}')
+        if self.scheduler is None:
+            await super().join_channels(*channels)
+        else:  # each channel spends a unit of the JOIN budget
+            for chunk in split_channels('JOIN', channels, max_channels=self.scheduler.max_joins):
+                await self.scheduler.schedule(self.scheduler.JOIN, 'JOIN #' + ',#'.join(chunk), units=len(chunk))
+        self._logger.debug('actual channels for [%r] are: %s', self, self._joined_channel_logins)
 
     async def part_channels(self, *channels: str):
         self._joined_channel_logins.difference_update(channels)
+        for channel in channels:
+            self.set_channel_moderated(channel, False)
         await super().part_channels(*channels)
-        self._logger.debug(f'actual channels for [{self.__repr__()}] are: {self._joined_channel_logins}')
+        self._logger.debug('actual channels for [%r] are: %s', self, self._joined_channel_logins)
+
+    async def stop(self, code: int = 1000, reason: str = 'no reason'):
+        if self.scheduler is not None:
+            await self.scheduler.close()
+        await super().stop(code, reason)
 
     async def req_caps(self, *caps: str):
         if caps:
             caps_str = ' '.join(caps)
             await self.send(f'CAP REQ :{caps_str}')
-            self._logger.debug(f'[{self.__repr__()}] cappabilities requested: {caps_str}')
+            self._logger.debug('[%r] cappabilities requested: %s', self, caps_str)
 
     async def log_in(self):
         if not self.is_anon:  # no PASS for an anon user
             await self.send(f'PASS {self.token}')
         await self.send(f'NICK {self.login}')
-        self._logger.debug(f'logging in as {self.login} (anon:{self.is_anon})')
+        self._logger.debug('logging in as %s (anon:%s)', self.login, self.is_anon)
 
     async def restart(self):
         if not self.is_restarting:
@@ -202,8 +303,10 @@ class TTVIRCClient(IRCClient):
         await asyncio.sleep(next(self._delay_gen))  # realisation of recommended reconnect delays
         await self.connect()
         await self.join_channels(*self._joined_channel_logins)
+        if self.metrics is not None:
+            self.metrics.count(self.metrics.RECONNECTS)
         asyncio.create_task(self.on_recconect_callback())
-        self._running_restart_task = None
+        self._restarting_task = None
         self._logger.warning(f'{self.__repr__()} restarted')
 
     @classmethod
@@ -218,18 +321,21 @@ class TTVIRCClient(IRCClient):
             if time() - last_delayed > 60:
                 delay = 0  # resetting overwrites the increasing that done anyway
 
-    async def __aiter__(self):
-        agen = super().__aiter__()
+    async def iter_batches(self) -> AsyncGenerator[List[TwitchIRCMsg], None]:
+        """
+        Same as :meth:`IRCClient.iter_batches`.
+        If self.keep_alive restarts the connection when it's closed and goes on yielding.
+        """
         while True:
             try:
-                yield await agen.__anext__()
+                async for irc_msgs in super().iter_batches():
+                    yield irc_msgs
+                return
             except ConnectionClosed:
                 if self.keep_alive:
                     await self.restart()
                 else:
                     raise
-            except StopAsyncIteration:
-                return
 
     def __repr__(self):
         return f'{super().__repr__()}:({self.login}:{self.token[6:9]})'
@@ -241,5 +347,331 @@ async def ttv_connect(login, token, *args, **kwards):
     return connection
 
 
+class ShardedTTVIRCClient:
+    """
+    Spreads joined channels across several :class:`TTVIRCClient` connections (shards) of the same user
+    and merges messages of all the shards into one stream. Has the same interface as :class:`TTVIRCClient`.
+
+    A channel is joined by the first shard that has less than `channels_per_shard` channels,
+    a new shard is connected if there is no such one. A shard left without channels is closed.
+    If channels of the least loaded shard fit into free places of the others, they are moved there
+    and the shard is closed. A moved channel is parted by its old shard only after the new one
+    has got ROOMSTATE of the channel, the channel's messages come only from its current shard meanwhile.
+    Messages without a channel (e.g. WHISPER) come only from the first shard, it's never closed.
+
+    Args:
+        login: `str`
+            login of the user
+        token: `str`
+            irc token of the user
+        channels_per_shard: `int`
+            max count of channels joined by one shard. Default: 100.
+        max_shards: Optional[`int`]
+            max count of shards. If all of them are full, channels are joined by the least loaded one.
+            Default: None (no limit).
+        **kwargs:
+            passed to each :class:`TTVIRCClient`
+
+    Examples:
+        >>> irc_conn = ShardedTTVIRCClient(login, token, channels_per_shard=50)
+        >>> await irc_conn.connect()
+        >>> await irc_conn.join_channels(*logins)
+        >>> async for irc_msgs in irc_conn.iter_batches():
+        >>>     ...
+    """
+
+    def __init__(
+            self,
+            login: str,
+            token: str,
+            *,
+            channels_per_shard: int = 100,
+            max_shards: Optional[int] = None,
+            max_queued_batches: int = 64,
+            **kwargs
+    ):
+        self.login: str = login
+        self._token: str = token
+        self._shard_kwargs: dict = kwargs
+        self._line_filter: Optional[LineFilter] = None
+        self._metrics: Optional[Metrics] = None
+        self._recorder: Optional[FrameRecorder] = None
+        self.channels_per_shard: int = channels_per_shard
+        self.max_shards: Optional[int] = max_shards
+        self.is_running: bool = False
+        self._shards: List[TTVIRCClient] = [self._create_shard()]  # the first one is connected by `connect()`
+        self._channels_by_shard: Dict[TTVIRCClient, Set[str]] = {self._shards[0]: set()}  # includes moving ones
+        self._shard_by_channel: Dict[str, TTVIRCClient] = {}
+        self._moving: Dict[str, TTVIRCClient] = {}  # channel: shard the channel is being moved to
+        self._draining: Set[TTVIRCClient] = set()  # shards whose channels are being moved to the others
+        self._max_queued_batches: int = max_queued_batches
+        self._batches: Optional[Queue] = None  # is created by `iter_batches()`, within a running loop
+        self._readers: Dict[TTVIRCClient, Task] = {}
+        self._tasks: Set[Task] = set()  # parting of moved channels
+        self._shards_lock = asyncio.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def shards(self) -> List[TTVIRCClient]:
+        return self._shards.copy()
+
+    @property
+    def token(self) -> str:
+        return self._shards[0].token
+
+    @property
+    def is_anon(self) -> bool:
+        return self._shards[0].is_anon
+
+    @property
+    def is_connected(self) -> bool:
+        return self._shards[0].is_connected
+
+    @property
+    def is_restarting(self) -> bool:
+        return any(shard.is_restarting for shard in self._shards)
+
+    def get_shard(
+            self,
+            channel: str
+    ) -> Optional[TTVIRCClient]:
+        """Returns the shard messages of the channel come from, None if the channel isn't joined"""
+        return self._shard_by_channel.get(channel)
+
+    async def connect(self) -> TwitchIRCMsg:
+        """Connects the first shard, the others are connected when they are needed"""
+        return await self._shards[0].connect()
+
+    async def send(self, irc_msg: Union[IRCMsg, str]):
+        await self._shards[0].send(irc_msg)
+
+    async def send_msg(self, channel: str, msg: str, *, priority: int = OutboundScheduler.NORMAL):
+        await self._shard_by_channel.get(channel, self._shards[0]).send_msg(channel, msg, priority=priority)
+
+    def set_channel_moderated(self, channel: str, is_moderated: bool):
+        if (shard := self._shard_by_channel.get(channel)) is not None:
+            shard.set_channel_moderated(channel, is_moderated)
+
+    async def send_whisper(self, target: str, msg: str, *, through: str = None):
+        await self._shards[0].send_whisper(target, msg, through=through)
+
+    async def assign_channels(
+            self,
+            *channels: str
+    ) -> Dict[TTVIRCClient, List[str]]:
+        """
+        Chooses a shard for each of the channels that hasn't got one yet, connects new shards if needed.
+        Messages sent into the channels go through the chosen shards since then.
+
+        Returns:
+            Dict[:class:`TTVIRCClient`, List[`str`]]: channels by their shards
+        """
+        channels_by_shard = {}
+        async with self._shards_lock:  # only one new shard is connected at once
+            for channel in channels:
+                if (shard := self._shard_by_channel.get(channel)) is None:
+                    shard = self._get_free_shard() or await self._add_shard()
+                    self._shard_by_channel[channel] = shard
+                    self._channels_by_shard[shard].add(channel)
+                channels_by_shard.setdefault(shard, []).append(channel)
+        return channels_by_shard
+
+    async def join_channels(self, *channels: str):
+        for shard, shard_channels in (await self.assign_channels(*channels)).items():
+            await shard.join_channels(*shard_channels)
+
+    async def part_channels(self, *channels: str):
+        channels_by_shard: Dict[TTVIRCClient, List[str]] = {}
+        for channel in channels:
+            for shard in (self._shard_by_channel.pop(channel, None), self._moving.pop(channel, None)):
+                if shard is not None:
+                    self._channels_by_shard[shard].discard(channel)
+                    channels_by_shard.setdefault(shard, []).append(channel)
+        for shard, shard_channels in channels_by_shard.items():
+            await shard.part_channels(*shard_channels)
+        await self._shrink()
+
+    async def stop(self, code: int = 1000, reason: str = 'no reason'):
+        for task in self._tasks:
+            task.cancel()
+        for shard in self._shards:
+            await shard.stop(code, reason)
+
+    async def iter_batches(self) -> AsyncGenerator[List[TwitchIRCMsg], None]:
+        """
+        Same as :meth:`TTVIRCClient.iter_batches` but yields batches of all the shards.
+        A batch contains messages of one frame of one shard. Ends when all the shards are stopped.
+        """
+        self.is_running = True
+        self._batches = Queue(self._max_queued_batches)
+        for shard in self._shards:
+            self._start_reading(shard)
+        try:
+            while (batch := await self._batches.get()) is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            for reader in self._readers.values():
+                reader.cancel()
+            self._readers.clear()
+            self.is_running = False
+
+    def set_line_filter(self, line_filter: Optional[LineFilter]):
+        """Sets the filter of received lines for all the shards, see :meth:`IRCClient.set_line_filter`"""
+        self._line_filter = line_filter
+        for shard in self._shards:
+            shard.set_line_filter(line_filter)
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """Sets the registry of all the shards, see :meth:`IRCClient.set_metrics`"""
+        self._metrics = metrics
+        for shard in self._shards:
+            shard.set_metrics(metrics)
+
+    def set_recorder(self, recorder: Optional[FrameRecorder]):
+        """Sets the recorder of all the shards, frames of the shards are written into the same recording"""
+        self._recorder = recorder
+        for shard in self._shards:
+            shard.set_recorder(recorder)
+
+    def _create_shard(self) -> TTVIRCClient:
+        shard = TTVIRCClient(self.login, self._token, **self._shard_kwargs)
+        shard.set_line_filter(self._line_filter)
+        shard.set_metrics(self._metrics)
+        shard.set_recorder(self._recorder)
+        return shard
+
+    def _get_free_shard(self) -> Optional[TTVIRCClient]:
+        shards = [shard for shard in self._shards if shard not in self._draining]
+        for shard in shards:
+            if len(self._channels_by_shard[shard]) < self.channels_per_shard:
+                return shard
+        if self.max_shards is not None and len(self._shards) >= self.max_shards:
+            return min(shards, key=lambda shard: len(self._channels_by_shard[shard]))
+        return None
+
+    async def _add_shard(self) -> TTVIRCClient:
+        shard = self._create_shard()
+        await shard.connect()
+        self._shards.append(shard)
+        self._channels_by_shard[shard] = set()
+        if self.is_running:
+            self._start_reading(shard)
+        self._logger.info(f'{self.__repr__()} added shard {len(self._shards)}')
+        return shard
+
+    async def _remove_shard(
+            self,
+            shard: TTVIRCClient
+    ) -> None:
+        self._shards.remove(shard)
+        del self._channels_by_shard[shard]
+        self._draining.discard(shard)
+        await shard.stop(reason='no channels left')  # the reader ends by itself
+        self._logger.info(f'{self.__repr__()} removed a shard, {len(self._shards)} left')
+
+    async def _shrink(self) -> None:
+        """Closes empty shards, moves channels of the least loaded shard if the others have enough free places"""
+        for shard in self._shards[1:]:
+            if not self._channels_by_shard[shard]:
+                await self._remove_shard(shard)
+        candidates = [shard for shard in self._shards[1:] if shard not in self._draining]
+        if not candidates:
+            return
+        shard = min(candidates, key=lambda candidate: len(self._channels_by_shard[candidate]))
+        free_places = sum(
+            self.channels_per_shard - len(self._channels_by_shard[other])
+            for other in self._shards if other is not shard and other not in self._draining
+        )
+        if len(self._channels_by_shard[shard]) <= free_places:
+            await self._drain(shard)
+
+    async def _drain(
+            self,
+            shard: TTVIRCClient
+    ) -> None:
+        """Moves all the channels of the shard to the others"""
+        self._draining.add(shard)
+        for channel in list(self._channels_by_shard[shard]):
+            if channel in self._moving:  # is being moved from the shard already
+                continue
+            if (target := self._get_free_shard()) is None:
+                break
+            self._moving[channel] = target
+            self._channels_by_shard[target].add(channel)  # the place is taken until the move is completed
+            await target.join_channels(channel)
+
+    def _complete_move(
+            self,
+            channel: str,
+            shard: TTVIRCClient
+    ) -> None:
+        del self._moving[channel]
+        old_shard = self._shard_by_channel[channel]
+        self._shard_by_channel[channel] = shard
+        self._channels_by_shard[old_shard].discard(channel)
+        self._create_task(self._part_moved_channel(old_shard, channel))
+
+    async def _part_moved_channel(
+            self,
+            shard: TTVIRCClient,
+            channel: str
+    ) -> None:
+        await shard.part_channels(channel)
+        if shard in self._draining and not self._channels_by_shard[shard]:
+            await self._remove_shard(shard)
+
+    def _own_irc_msgs(
+            self,
+            shard: TTVIRCClient,
+            irc_msgs: List[TwitchIRCMsg]
+    ) -> List[TwitchIRCMsg]:
+        """Returns messages of the batch that must come from the shard, completes moves of channels to the shard"""
+        is_first = shard is self._shards[0]
+        own_irc_msgs = []
+        for irc_msg in irc_msgs:
+            if (channel := irc_msg.channel) is None:
+                if is_first:
+                    own_irc_msgs.append(irc_msg)
+            elif self._shard_by_channel.get(channel) is shard:
+                own_irc_msgs.append(irc_msg)
+            elif self._moving.get(channel) is shard and irc_msg.command == 'ROOMSTATE':
+                self._complete_move(channel, shard)  # the ROOMSTATE repeats the known state, is skipped
+        return own_irc_msgs
+
+    def _start_reading(
+            self,
+            shard: TTVIRCClient
+    ) -> None:
+        self._readers[shard] = create_task(self._read(shard))
+
+    async def _read(
+            self,
+            shard: TTVIRCClient
+    ) -> None:
+        try:
+            async for irc_msgs in shard.iter_batches():
+                if irc_msgs := self._own_irc_msgs(shard, irc_msgs):
+                    await self._batches.put(irc_msgs)
+        except Exception as e:  # is raised by `iter_batches()` of the shard
+            await self._batches.put(e)
+        self._readers.pop(shard, None)
+        if not self._readers:
+            await self._batches.put(None)  # all the shards are stopped
+
+    def _create_task(
+            self,
+            coro: Coroutine
+    ) -> Task:
+        task = create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} ({len(self._shards)} shards):({self.login})'
+
+
 async def empty_coroutine(*args, **kwargs):
     pass
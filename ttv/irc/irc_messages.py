@@ -1,12 +1,17 @@
+import re
 from copy import copy
 from typing import Tuple, Optional, Dict, Union
 
+from ..utils import USE_SLOTS
 from .utils import escape_tag_value, unescape_tag_value
 
-__all__ = ('IRCMsg', 'TwitchIRCMsg')
+__all__ = ('IRCMsg', 'TwitchIRCMsg', 'FastTwitchIRCMsg', 'LazyTwitchIRCMsg')
 
 
 class IRCMsg:
+    if USE_SLOTS:
+        __slots__ = ('command', 'tags', 'servername', 'nickname', 'user', 'host', 'middles', 'trailing')
+
     def __init__(
             self,
             raw_irc_msg: str
@@ -221,12 +226,21 @@ class IRCMsg:
     def __str__(self):
         return self.__repr__()
 
+    @property
+    def raw_irc_msg(self) -> str:
+        """The message as a raw line, is joined from the parsed parts"""
+        return self.__repr__()
+
 
 class TwitchIRCMsg(IRCMsg):
+    if USE_SLOTS:
+        __slots__ = ('channel', 'msg_id', 'received_at')
+
     def __init__(self, raw_irc_msg: str):
         super().__init__(raw_irc_msg)
         self.channel: Optional[str] = self._get_channel()
         self.msg_id: Optional[str] = self.tags.get('msg-id')
+        self.received_at: Optional[float] = None  # :func:`time.perf_counter` time, is set only if it's measured
 
     def _get_channel(self) -> Optional[str]:
         for middle in self.middles:
@@ -234,3 +248,233 @@ class TwitchIRCMsg(IRCMsg):
                 return middle[1:]
         else:
             return None
+
+
+class FastTwitchIRCMsg(TwitchIRCMsg):
+    """
+    :class:`TwitchIRCMsg` parsed by a single-pass tokenizer.
+
+    Sections are taken by one precompiled regex, each tag is split once by `str.partition`,
+    only values containing a backslash are unescaped, params are split only before the trailing.
+    Gives the same results as :class:`TwitchIRCMsg`.
+    """
+    __slots__ = ()
+
+    def _parse_raw_irc_msg(
+            self,
+            raw_irc_msg: str
+    ):
+        raw_tags, prefix, command, raw_params = _IRC_MSG_RE.match(raw_irc_msg).groups()
+
+        self.command: str = command
+
+        self._parse_raw_tags(raw_tags)  # tags
+        self._parse_prefix(prefix)  # servername, nickname, user, host
+        self._parse_raw_params(raw_params)  # middles, trailing
+
+        return raw_tags, prefix, raw_params
+
+    def _parse_raw_tags(
+            self,
+            raw_tags: Optional[str]
+    ):
+        tags = {}
+        if raw_tags:
+            for raw_tag in raw_tags.split(';'):
+                key, has_value, value = raw_tag.partition('=')
+                tags[key] = value if has_value else None
+            if '\\' in raw_tags:  # unescape only values with escaped symbols
+                for key, value in tags.items():
+                    if value and '\\' in value:
+                        tags[key] = unescape_tag_value(value)
+        self.tags: Dict[str, Optional[str]] = tags
+
+    def _parse_raw_params(
+            self,
+            raw_params: Optional[str]
+    ):
+        middles = ()
+        trailing = None
+
+        if raw_params:
+            if raw_params.startswith(':'):
+                raw_middles = None
+                trailing = raw_params[1:]
+            else:
+                trailing_start = raw_params.find(' :')
+                if trailing_start == -1:
+                    raw_middles = raw_params
+                else:
+                    raw_middles = raw_params[:trailing_start]
+                    trailing = raw_params[trailing_start + 2:]
+            if raw_middles is not None:
+                middles = raw_middles.split(' ', 14)
+                # the 15th param is trailing even if it starts without ':'
+                if len(middles) == 15:
+                    last_middle = middles.pop()
+                    trailing = last_middle if trailing is None else f'{last_middle} :{trailing}'
+
+        self.middles: Tuple[str] = tuple(middles)
+        self.trailing: Optional[str] = trailing
+
+
+# @tags :prefix command params
+_IRC_MSG_RE = re.compile(r'(?:@([^ ]*) )?(?::([^ ]*) )?([^ ]*)(?: (.*))?', re.DOTALL)
+
+
+class LazyTwitchIRCMsg(FastTwitchIRCMsg):
+    """
+    Lazy version of :class:`TwitchIRCMsg`.
+
+    Keeps the raw message and offsets of its sections. Only `command` is taken on creation,
+    `tags`, prefix parts (`servername`, `nickname`, `user`, `host`), `middles`, `trailing`, `channel` and `msg_id`
+    are parsed on first access. Single tag values (:meth:`get`, `in`, `[]`) are found in the raw tags
+    without parsing all of them.
+    """
+    # NOTE: `tags` is a property over `_tags` here, so with `USE_SLOTS` the `tags` slot inherited from :class:`IRCMsg`
+    #  stays unused (8 bytes per message). Unlike an unset slot, `_tags` can be checked for None on every single tag
+    #  lookup without raising and catching AttributeError, which is much more expensive than the slot.
+    if USE_SLOTS:
+        __slots__ = (
+            '_raw_irc_msg', '_tags', '_tag_overrides', '_tags_end', '_prefix_start', '_prefix_end', '_params_start'
+        )
+
+    def __init__(self, raw_irc_msg: str):
+        # super().__init__() isn't called, it would parse everything
+        self._raw_irc_msg: str = raw_irc_msg
+        self._tags: Optional[Dict[str, Optional[str]]] = None
+        self._tag_overrides: Optional[Dict[str, Optional[str]]] = None  # tags set before `tags` are parsed
+        self.received_at: Optional[float] = None
+        self._parse_offsets()
+
+    def __copy__(self):
+        new = self.__class__.__new__(self.__class__)
+        # slot descriptors are used directly: getattr() would parse unparsed parts, the `tags` property shadows its slot
+        for cls in self.__class__.__mro__:
+            for slot_name in cls.__dict__.get('__slots__', ()):
+                slot = cls.__dict__[slot_name]
+                try:
+                    slot.__set__(new, slot.__get__(self))
+                except AttributeError:  # not parsed yet
+                    pass
+        if hasattr(self, '__dict__'):  # subclasses without `__slots__`
+            new.__dict__.update(self.__dict__)
+        if self._tag_overrides is not None:
+            new._tag_overrides = self._tag_overrides.copy()
+        return new
+
+    @property
+    def raw_irc_msg(self) -> str:
+        """The message as it's received, tags set after that aren't in it"""
+        return self._raw_irc_msg
+
+    def _parse_offsets(self):
+        raw_irc_msg = self._raw_irc_msg
+        tags_end = prefix_start = prefix_end = 0
+        start = 0
+        if raw_irc_msg.startswith('@'):
+            tags_end = raw_irc_msg.index(' ')  # raw tags are raw_irc_msg[1:tags_end]
+            start = tags_end + 1
+        if raw_irc_msg.startswith(':', start):
+            prefix_start = start + 1
+            prefix_end = raw_irc_msg.index(' ', start)  # prefix is raw_irc_msg[prefix_start:prefix_end]
+            start = prefix_end + 1
+        command_end = raw_irc_msg.find(' ', start)
+        if command_end == -1:  # if has not params
+            self.command: str = raw_irc_msg[start:]
+            self._params_start: int = -1
+        else:
+            self.command: str = raw_irc_msg[start:command_end]
+            self._params_start: int = command_end + 1
+        self._tags_end: int = tags_end
+        self._prefix_start: int = prefix_start
+        self._prefix_end: int = prefix_end
+
+    @property
+    def tags(self) -> Dict[str, Optional[str]]:
+        if self._tags is None:
+            self._parse_raw_tags(self._raw_irc_msg[1:self._tags_end] if self._tags_end else None)
+            if self._tag_overrides is not None:
+                self._tags.update(self._tag_overrides)
+                self._tag_overrides = None
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: Dict[str, Optional[str]]):
+        self._tags = tags
+
+    def __getattr__(self, name: str):
+        # is called only if the attribute has not been parsed (set) yet
+        if name in ('servername', 'nickname', 'user', 'host'):
+            self._parse_prefix(self._raw_irc_msg[self._prefix_start:self._prefix_end] if self._prefix_start else None)
+        elif name in ('middles', 'trailing'):
+            self._parse_raw_params(self._raw_irc_msg[self._params_start:] if self._params_start != -1 else None)
+        elif name == 'channel':
+            self.channel = self._get_raw_channel()
+        elif name == 'msg_id':
+            self.msg_id = self.get('msg-id')
+        else:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        return object.__getattribute__(self, name)
+
+    def _get_raw_channel(self) -> Optional[str]:
+        params_start = self._params_start
+        # the channel is usually the first middle, no need to parse params
+        if params_start != -1 and self._raw_irc_msg.startswith('#', params_start):
+            channel_end = self._raw_irc_msg.find(' ', params_start)
+            return self._raw_irc_msg[params_start + 1:channel_end if channel_end != -1 else None]
+        return self._get_channel()
+
+    def _find_raw_tag(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Finds the tag with given `key` within the raw tags without parsing the others.
+
+        Returns:
+            (is_found, unescaped_value)
+        """
+        raw_irc_msg = self._raw_irc_msg
+        tags_end = self._tags_end
+        if self._tag_overrides is not None and key in self._tag_overrides:
+            return True, self._tag_overrides[key]
+        if not tags_end:
+            return False, None
+        # the first tag goes right after '@', others - after ';'. ';' can't be within an escaped value
+        start = 1 if raw_irc_msg.startswith(key, 1, tags_end) else raw_irc_msg.find(';' + key, 1, tags_end) + 1
+        while start:
+            key_end = start + len(key)
+            if key_end == tags_end or raw_irc_msg[key_end] == ';':  # if has not value
+                return True, None
+            elif raw_irc_msg[key_end] == '=':
+                value_end = raw_irc_msg.find(';', key_end, tags_end)
+                value = raw_irc_msg[key_end + 1:value_end if value_end != -1 else tags_end]
+                return True, unescape_tag_value(value)
+            # found key is just a prefix of another key
+            start = raw_irc_msg.find(';' + key, key_end, tags_end) + 1
+        return False, None
+
+    def get(self, key, default=None) -> Optional[str]:
+        if (tags := self._tags) is not None:
+            return tags.get(key, default)
+        is_found, value = self._find_raw_tag(key)
+        return value if is_found else default
+
+    def __getitem__(self, item) -> Optional[str]:
+        if (tags := self._tags) is not None:
+            return tags[item]
+        is_found, value = self._find_raw_tag(item)
+        if not is_found:
+            raise KeyError(item)
+        return value
+
+    def __setitem__(self, key, value):
+        if (tags := self._tags) is not None:
+            tags[key] = value
+        else:
+            if self._tag_overrides is None:
+                self._tag_overrides = {}
+            self._tag_overrides[key] = value
+
+    def __contains__(self, item) -> bool:
+        if (tags := self._tags) is not None:
+            return item in tags
+        return self._find_raw_tag(item)[0]
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from asyncio import Task
+from collections import deque
+from typing import Callable, Deque, Optional, Set, Tuple
+
+from .channels_accumulators import ChannelsAccumulator
+from .events import OnJoinProgress
+from .irc_connections import TTVIRCClient
+from .rate_limits import TokenBucket
+from .utils import split_channels
+
+__all__ = ('JoinPlanner', )
+
+
+class JoinPlanner:
+    """
+    Joins channels in the background:
+        - channels are split into JOIN lines that don't exceed the line length limit;
+        - the lines are sent within the JOIN budget;
+        - accumulation of a channel starts when its JOIN is sent, so its timeout doesn't run out in the queue;
+        - commands, mods and vips of joined channels are requested within a separate budget, one channel after another.
+
+    Args:
+        irc_conn: :class:`TTVIRCClient`
+            connection to send JOINs through
+        channels_accumulator: :class:`ChannelsAccumulator`
+            accumulator of joined channels
+        progress_callback: Callable[[:class:`OnJoinProgress`], None]
+            is called after each sent JOIN
+        joins: Tuple[`int`, `float`]
+            joined channels per seconds. Default: 20 per 10 (Twitch's limit of a regular account).
+        requests: Tuple[`int`, `float`]
+            commands, mods and vips requests per seconds, each channel takes three. Default: 20 per 30.
+    """
+
+    def __init__(
+            self,
+            *,
+            irc_conn: TTVIRCClient,
+            channels_accumulator: ChannelsAccumulator,
+            progress_callback: Callable[[OnJoinProgress], None],
+            joins: Tuple[int, float] = (20, 10),
+            requests: Tuple[int, float] = (20, 30)
+    ) -> None:
+        self._irc_conn: TTVIRCClient = irc_conn
+        self._chnls_accum: ChannelsAccumulator = channels_accumulator
+        self._progress_callback: Callable[[OnJoinProgress], None] = progress_callback
+        self._joins_bucket: TokenBucket = TokenBucket(*joins)
+        self._requests_bucket: TokenBucket = TokenBucket(*requests)
+        self._planned: Deque[str] = deque()
+        self._planned_set: Set[str] = set()  # parted channels are removed from it, not from the deque
+        self._requests: Deque[str] = deque()
+        self._joining_task: Optional[Task] = None
+        self._requesting_task: Optional[Task] = None
+        self.joined: int = 0
+        self.total: int = 0
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def planned(self) -> int:
+        """Count of channels whose JOIN isn't sent yet"""
+        return len(self._planned_set)
+
+    def plan(
+            self,
+            *channels: str
+    ) -> None:
+        """Plans joining of the channels, returns at once"""
+        for channel in channels:
+            if channel not in self._planned_set:
+                self._planned_set.add(channel)
+                self._planned.append(channel)
+                self.total += 1
+        if self._planned and self._joining_task is None:
+            self._joining_task = asyncio.create_task(self._join())
+
+    def cancel(
+            self,
+            *channels: str
+    ) -> None:
+        """Removes the channels from the plan, if they aren't joined yet"""
+        for channel in channels:
+            if channel in self._planned_set:
+                self._planned_set.discard(channel)
+                self.total -= 1
+
+    async def close(self) -> None:
+        """Stops joining and requesting, the plan is cleared"""
+        for task in (self._joining_task, self._requesting_task):
+            if task is not None:
+                task.cancel()
+        self._planned.clear()
+        self._planned_set.clear()
+        self._requests.clear()
+
+    def _next_chunk(self) -> Tuple[str, ...]:
+        """Pops planned channels fitting into one JOIN line and into the JOIN budget"""
+        channels = []
+        taken = set()  # a channel planned again after cancelling is in the deque twice
+        # parted channels are skipped, a line may take up to `capacity` channels
+        while self._planned and len(channels) < self._joins_bucket.capacity:
+            if (channel := self._planned.popleft()) in self._planned_set and channel not in taken:
+                taken.add(channel)
+                channels.append(channel)
+        chunk, *rest = split_channels('JOIN', channels, max_channels=self._joins_bucket.capacity) or [[]]
+        for channel in reversed([channel for chunk_rest in rest for channel in chunk_rest]):
+            self._planned.appendleft(channel)  # doesn't fit into the line
+        return tuple(chunk)
+
+    def _requeue(
+            self,
+            chunk: Tuple[str, ...]
+    ) -> None:
+        """Puts channels of a failed JOIN back to the head of the plan, ones planned again meanwhile aren't doubled"""
+        for channel in reversed(chunk):
+            if channel not in self._planned_set:
+                self._planned_set.add(channel)
+                self._planned.appendleft(channel)
+
+    async def _join(self) -> None:
+        try:
+            while chunk := self._next_chunk():
+                await self._joins_bucket.acquire(len(chunk))
+                # channels parted while waiting for the budget are skipped
+                chunk = tuple(channel for channel in chunk if channel in self._planned_set)
+                self._planned_set.difference_update(chunk)
+                if not chunk:
+                    continue
+                self._chnls_accum.start_accumulations(*chunk)
+                try:
+                    await self._irc_conn.join_channels(*chunk)
+                except Exception:  # e.g. the connection is closed, the chunk is joined again after a delay
+                    self._logger.exception('Failed to join %d channels, retrying in %.1f s',
+                                           len(chunk), self._joins_bucket.period)
+                    self._chnls_accum.abort_accumulations(*chunk)
+                    self._requeue(chunk)
+                    await asyncio.sleep(self._joins_bucket.period)
+                    continue
+                self.joined += len(chunk)
+                self._logger.debug('Joined %d/%d channels', self.joined, self.total)
+                self._progress_callback(OnJoinProgress(self.joined, self.total, chunk))
+                if not self._chnls_accum.is_anon:
+                    self._requests.extend(chunk)
+                    if self._requesting_task is None:
+                        self._requesting_task = asyncio.create_task(self._request())
+        finally:
+            self._joining_task = None
+
+    async def _request(self) -> None:
+        try:
+            while self._requests:
+                channel = self._requests.popleft()
+                if not self._chnls_accum.is_accumulating(channel):  # is parted or ready by timeout
+                    continue
+                await self._requests_bucket.acquire(3)
+                await self._chnls_accum.request_channel_parts(channel)
+        finally:
+            self._requesting_task = None
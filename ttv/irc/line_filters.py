@@ -0,0 +1,83 @@
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+__all__ = ('LineFilter', 'read_command', 'read_tag')
+
+
+def read_command(raw_irc_msg: str) -> Tuple[str, int]:
+    """
+    Reads the command of a raw line without parsing the rest.
+
+    Returns:
+        the command and index of the space after the tags, 0 - if the line has no tags
+    """
+    tags_end = raw_irc_msg.find(' ') if raw_irc_msg.startswith('@') else 0
+    start = tags_end + 1 if tags_end else 0
+    if raw_irc_msg.startswith(':', start):  # prefix
+        start = raw_irc_msg.find(' ', start) + 1
+    end = raw_irc_msg.find(' ', start)
+    return raw_irc_msg[start:end] if end != -1 else raw_irc_msg[start:], tags_end
+
+
+def read_tag(
+        raw_irc_msg: str,
+        key: str,
+        tags_end: int
+) -> Optional[str]:
+    """Reads the raw (escaped) value of the tag without parsing the others, None - if there isn't the tag"""
+    pattern = key + '='
+    start = 1
+    while (start := raw_irc_msg.find(pattern, start, tags_end)) != -1:
+        if raw_irc_msg[start - 1] in '@;':  # not a suffix of another key or a part of a value
+            start += len(pattern)
+            end = raw_irc_msg.find(';', start, tags_end)
+            return raw_irc_msg[start:end if end != -1 else tags_end]
+        start += len(pattern)
+    return None
+
+
+class LineFilter:
+    """
+    Decides if a received line must be parsed, reading only its command and the msg-id tag.
+    Lines that are dropped cost neither parsing nor handling.
+
+    Args:
+        skipped_commands: Iterable[`str`]
+            lines of these commands are dropped
+        msg_ids: Dict[`str`, Iterable[`str`]]
+            lines of a command are dropped unless their msg-id is one of the given ones
+
+    Examples:
+        >>> line_filter = LineFilter(skipped_commands=('JOIN', 'PART'), msg_ids={'USERNOTICE': ('sub', 'resub')})
+        >>> line_filter.accepts(':username!username@username.tmi.twitch.tv JOIN #target')
+        False
+    """
+    __slots__ = ('skipped_commands', 'msg_ids')
+
+    def __init__(
+            self,
+            *,
+            skipped_commands: Iterable[str] = (),
+            msg_ids: Dict[str, Iterable[str]] = None
+    ) -> None:
+        self.skipped_commands: FrozenSet[str] = frozenset(skipped_commands)
+        self.msg_ids: Dict[str, FrozenSet[str]] = {
+            command: frozenset(ids) for command, ids in (msg_ids or {}).items()
+        }
+
+    def accepts(
+            self,
+            raw_irc_msg: str
+    ) -> bool:
+        command, tags_end = read_command(raw_irc_msg)
+        if command in self.skipped_commands:
+            return False
+        elif (msg_ids := self.msg_ids.get(command)) is not None:
+            return read_tag(raw_irc_msg, 'msg-id', tags_end) in msg_ids
+        return True
+
+    def __eq__(self, other):
+        return (isinstance(other, LineFilter) and self.skipped_commands == other.skipped_commands
+                and self.msg_ids == other.msg_ids)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(skipped_commands={set(self.skipped_commands)}, msg_ids={self.msg_ids})'
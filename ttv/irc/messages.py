@@ -1,7 +1,7 @@
 from abc import ABC
-from functools import cached_property
 from typing import Optional, Tuple
 
+from ..utils import USE_SLOTS, slotted_cached_property
 from .channel import Channel
 from .emotes import Emote
 from .flags import Flag
@@ -18,6 +18,11 @@ __all__ = (
 
 
 class BaseMessage(ABC):
+    if USE_SLOTS:
+        __slots__ = (
+            'author', 'content', 'id', 'timestamp', 'emote_only', '_raw_flags', '_flags', '_raw_emotes', '_emotes'
+        )
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -31,11 +36,11 @@ class BaseMessage(ABC):
         self.emote_only: bool = irc_msg.get('emote-only') == '1'
         self._raw_emotes: str = irc_msg.get('emotes', '')
 
-    @cached_property
+    @slotted_cached_property
     def flags(self) -> Tuple[Flag]:
         return parse_raw_flags(self._raw_flags, self.content)
 
-    @cached_property
+    @slotted_cached_property
     def emotes(self) -> Tuple[Emote]:
         return parse_raw_emotes(self._raw_emotes, self.content)
 
@@ -44,6 +49,9 @@ class BaseMessage(ABC):
 
 
 class ParentMessage:
+    if USE_SLOTS:
+        __slots__ = ('channel', 'author', 'content', 'id')
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -63,6 +71,9 @@ class ParentMessage:
 
 
 class ChannelMessage(BaseMessage):
+    if USE_SLOTS:
+        __slots__ = ('channel', 'bits', 'msg_id', 'custom_reward_id', '_irc_msg', '_parent_message')
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -81,7 +92,7 @@ class ChannelMessage(BaseMessage):
     async def delete(self):
         await self.channel.send(f'/delete {self.id}')
 
-    @cached_property
+    @slotted_cached_property
     def parent_message(self) -> Optional[ParentMessage]:
         return self._crate_parent_message(self._irc_msg)
 
@@ -105,6 +116,9 @@ class ChannelMessage(BaseMessage):
 
 
 class Whisper(BaseMessage):
+    if USE_SLOTS:
+        __slots__ = ('thread_id',)
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -0,0 +1,186 @@
+from bisect import bisect_left
+from typing import Dict, List, Tuple, Union
+
+__all__ = ('Histogram', 'Metrics')
+
+
+class Histogram:
+    """
+    Counts observed values by buckets (upper bounds), keeps their count and sum.
+
+    Attributes:
+        buckets: Tuple[`float`, ...]
+            sorted upper bounds of the buckets, values over the last one are counted only in `count`
+        counts: List[`int`]
+            count of values of each bucket (not cumulative)
+    """
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(
+            self,
+            buckets: Tuple[float, ...]
+    ) -> None:
+        self.buckets: Tuple[float, ...] = buckets
+        self.counts: List[int] = [0] * len(buckets)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(
+            self,
+            value: float
+    ) -> None:
+        if (index := bisect_left(self.buckets, value)) < len(self.buckets):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(count={self.count}, sum={self.sum})'
+
+
+class Metrics:
+    """
+    Registry of counters and histograms of the IRC client, :meth:`to_prometheus` renders them in Prometheus format.
+
+    Collected by :class:`Client` and its connection if the registry is passed as `metrics`:
+        :attr:`MESSAGES`: received messages by command
+        :attr:`RECEIVED_BYTES`: bytes (UTF-8) of received frames
+        :attr:`DROPPED_LINES`: lines dropped by the line filter before parsing
+        :attr:`PARSE_SECONDS`: parsing of a frame
+        :attr:`DISPATCH_SECONDS`: from receiving of a message to start of its handling
+        :attr:`HANDLER_SECONDS`: duration of event handlers by event name
+        :attr:`RECONNECTS`: restarts of connections
+        :attr:`PENDING_REPLAYED`: messages of not ready channels handled when the channels are ready
+        :attr:`PENDING_DROPPED`: messages of not ready channels dropped by reason, see :class:`PendingMessages`
+
+    Nothing is collected and measured without the registry.
+
+    Args:
+        prefix: `str`
+            prefix of names of rendered metrics. Default: 'ttv_irc_'.
+        buckets: Tuple[`float`, ...]
+            upper bounds (seconds) of buckets of the histograms. Default: from 10us to 10s.
+
+    Examples:
+        >>> metrics = Metrics()
+        >>> client = Client(token, login, metrics=metrics)
+        >>> ...
+        >>> text = metrics.to_prometheus()  # e.g. the body of a /metrics response
+    """
+    MESSAGES = 'messages_total'
+    RECEIVED_BYTES = 'received_bytes_total'
+    DROPPED_LINES = 'dropped_lines_total'
+    PARSE_SECONDS = 'parse_seconds'
+    DISPATCH_SECONDS = 'dispatch_seconds'
+    HANDLER_SECONDS = 'handler_seconds'
+    RECONNECTS = 'reconnects_total'
+    PENDING_REPLAYED = 'pending_replayed_total'
+    PENDING_DROPPED = 'pending_dropped_total'
+
+    # name: (type, label, help)
+    _FAMILIES: Dict[str, Tuple[str, str, str]] = {
+        MESSAGES: ('counter', 'command', 'Received messages by command'),
+        RECEIVED_BYTES: ('counter', '', 'Bytes of received frames'),
+        DROPPED_LINES: ('counter', '', 'Lines dropped by the line filter before parsing'),
+        PARSE_SECONDS: ('histogram', '', 'Seconds of parsing of a frame'),
+        DISPATCH_SECONDS: ('histogram', '', 'Seconds from receiving of a message to start of its handling'),
+        HANDLER_SECONDS: ('histogram', 'event', 'Seconds of event handlers by event'),
+        RECONNECTS: ('counter', '', 'Restarts of connections'),
+        PENDING_REPLAYED: ('counter', '', 'Messages of not ready channels handled when the channels are ready'),
+        PENDING_DROPPED: ('counter', 'reason', 'Messages of not ready channels dropped by reason'),
+    }
+    DEFAULT_BUCKETS = (
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    )
+
+    def __init__(
+            self,
+            *,
+            prefix: str = 'ttv_irc_',
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.prefix: str = prefix
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[str, float]] = {}  # name: {label value: value}
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}  # name: {label value: histogram}
+
+    def count(
+            self,
+            name: str,
+            label: str = '',
+            amount: float = 1
+    ) -> None:
+        """Increases the counter, `label` is the value of the family's label (e.g. a command)"""
+        try:
+            counters = self._counters[name]
+        except KeyError:
+            counters = self._counters[name] = {}
+        counters[label] = counters.get(label, 0) + amount
+
+    def observe(
+            self,
+            name: str,
+            value: float,
+            label: str = ''
+    ) -> None:
+        """Adds the value to the histogram, `label` is the value of the family's label (e.g. an event name)"""
+        try:
+            histogram = self._histograms[name][label]
+        except KeyError:
+            histogram = self._histograms.setdefault(name, {})[label] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def get(
+            self,
+            name: str,
+            label: str = ''
+    ) -> Union[float, Histogram, None]:
+        """Returns the counter's value or the histogram, None if nothing has been collected"""
+        if name in self._histograms:
+            return self._histograms[name].get(label)
+        return self._counters.get(name, {}).get(label)
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Renders the collected metrics in Prometheus text exposition format"""
+        lines = []
+        for name, (kind, label_name, help_text) in self._FAMILIES.items():
+            values = self._counters.get(name) if kind == 'counter' else self._histograms.get(name)
+            if not values:
+                continue
+            full_name = self.prefix + name
+            lines.append(f'# HELP {full_name} {help_text}')
+            lines.append(f'# TYPE {full_name} {kind}')
+            for label, value in values.items():
+                labels = f'{label_name}="{_escape_label(label)}"' if label_name else ''
+                if kind == 'counter':
+                    lines.append(f'{full_name}{_braces(labels)} {value}')
+                    continue
+                cumulative = 0
+                for upper_bound, bucket_count in zip(value.buckets, value.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{full_name}_bucket{_braces(labels, _le(upper_bound))} {cumulative}')
+                lines.append(f'{full_name}_bucket{_braces(labels, _le("+Inf"))} {value.count}')
+                lines.append(f'{full_name}_sum{_braces(labels)} {value.sum}')
+                lines.append(f'{full_name}_count{_braces(labels)} {value.count}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(prefix={self.prefix!r})'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _le(upper_bound: Union[float, str]) -> str:
+    return f'le="{upper_bound}"'
+
+
+def _braces(*labels: str) -> str:
+    labels = ','.join(label for label in labels if label)
+    return f'{{{labels}}}' if labels else ''
@@ -0,0 +1,170 @@
+import logging
+from collections import deque
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .irc_messages import TwitchIRCMsg
+from .metrics import Metrics
+
+__all__ = ('PendingMessages',)
+
+
+def _get_size(irc_msg: TwitchIRCMsg) -> int:
+    """Count of bytes of the raw line of the message, tags of lazy messages aren't parsed for that"""
+    raw_irc_msg = irc_msg.raw_irc_msg
+    return len(raw_irc_msg) if raw_irc_msg.isascii() else len(raw_irc_msg.encode())
+
+
+class _PendingChannel:
+    __slots__ = ('irc_msgs', 'size', 'is_dropping')
+
+    def __init__(self) -> None:
+        self.irc_msgs: Deque[Tuple[float, int, TwitchIRCMsg]] = deque()  # (received at, size, irc_msg)
+        self.size: int = 0
+        self.is_dropping: bool = False  # if dropping is already logged
+
+
+class PendingMessages:
+    """
+    Buffers messages of channels that are being accumulated, so they are handled when the channels are ready.
+
+    A channel's buffer is limited by count of messages, their total size and age of the oldest message.
+    The oldest messages are dropped first when any limit is exceeded.
+
+    Args:
+        max_messages: `int`
+            max count of buffered messages of a channel. Default: 1000.
+        max_bytes: `int`
+            max total size (bytes of raw lines) of buffered messages of a channel. Default: 512 KiB.
+        max_age: `float`
+            seconds a message may wait for its channel. Default: 60.
+
+    Attributes:
+        delayed: `int`
+            count of buffered messages, in total
+        replayed: `int`
+            count of messages handed over to their ready channels, in total
+        dropped_by_reason: Dict[`str`, `int`]
+            count of dropped messages by the exceeded limit: :attr:`COUNT`, :attr:`BYTES`, :attr:`AGE`,
+            or :attr:`DISCARDED` if the channel is parted before it's ready
+        metrics: Optional[:class:`Metrics`]
+            registry the replayed and dropped messages are also counted in, see :meth:`set_metrics`
+
+    Examples:
+        >>> pending = PendingMessages(max_messages=5000, max_age=30)
+        >>> client = Client(token, login, pending_messages=pending)
+        >>> ...
+        >>> print(pending.pending, pending.replayed, pending.dropped_by_reason)
+    """
+    COUNT = 'COUNT'
+    BYTES = 'BYTES'
+    AGE = 'AGE'
+    DISCARDED = 'DISCARDED'
+
+    def __init__(
+            self,
+            *,
+            max_messages: int = 1000,
+            max_bytes: int = 512 * 1024,
+            max_age: float = 60
+    ) -> None:
+        self.max_messages: int = max_messages
+        self.max_bytes: int = max_bytes
+        self.max_age: float = max_age
+        self._channels: Dict[str, _PendingChannel] = {}
+        self.delayed: int = 0
+        self.replayed: int = 0
+        self.dropped_by_reason: Dict[str, int] = {}
+        self.metrics: Optional[Metrics] = None
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def pending(self) -> int:
+        """Count of messages waiting for their channels"""
+        return sum(len(channel.irc_msgs) for channel in self._channels.values())
+
+    @property
+    def dropped(self) -> int:
+        """Count of all dropped messages"""
+        return sum(self.dropped_by_reason.values())
+
+    def __contains__(self, channel_login: str) -> bool:
+        return channel_login in self._channels
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """Sets the registry replayed and dropped messages are counted in, None - to not count them there"""
+        self.metrics = metrics
+
+    def add(
+            self,
+            irc_msg: TwitchIRCMsg
+    ) -> None:
+        """Buffers the message of a channel that isn't ready yet, drops the oldest messages over the limits"""
+        try:
+            channel = self._channels[irc_msg.channel]
+        except KeyError:
+            channel = self._channels[irc_msg.channel] = _PendingChannel()
+        now = monotonic()
+        size = _get_size(irc_msg)
+        channel.irc_msgs.append((now, size, irc_msg))
+        channel.size += size
+        self.delayed += 1
+        self._drop_expired(irc_msg.channel, channel, now)
+        while len(channel.irc_msgs) > self.max_messages:
+            self._drop_oldest(irc_msg.channel, channel, self.COUNT)
+        while channel.size > self.max_bytes:
+            self._drop_oldest(irc_msg.channel, channel, self.BYTES)
+
+    def pop(
+            self,
+            channel_login: str
+    ) -> List[TwitchIRCMsg]:
+        """Returns buffered messages of the ready channel in received order and forgets them"""
+        if (channel := self._channels.get(channel_login)) is None:
+            return []
+        self._drop_expired(channel_login, channel, monotonic())
+        del self._channels[channel_login]
+        self.replayed += len(channel.irc_msgs)
+        if self.metrics is not None and channel.irc_msgs:
+            self.metrics.count(Metrics.PENDING_REPLAYED, amount=len(channel.irc_msgs))
+        return [irc_msg for _, _, irc_msg in channel.irc_msgs]
+
+    def discard(
+            self,
+            channel_login: str
+    ) -> None:
+        """Drops buffered messages of the channel, e.g. if it's parted before it's ready"""
+        if (channel := self._channels.pop(channel_login, None)) is not None and channel.irc_msgs:
+            self._count_dropped(self.DISCARDED, len(channel.irc_msgs))
+
+    def _drop_expired(
+            self,
+            channel_login: str,
+            channel: _PendingChannel,
+            now: float
+    ) -> None:
+        expired_at = now - self.max_age
+        while channel.irc_msgs and channel.irc_msgs[0][0] < expired_at:
+            self._drop_oldest(channel_login, channel, self.AGE)
+
+    def _drop_oldest(
+            self,
+            channel_login: str,
+            channel: _PendingChannel,
+            reason: str
+    ) -> None:
+        _, size, _ = channel.irc_msgs.popleft()
+        channel.size -= size
+        self._count_dropped(reason)
+        if not channel.is_dropping:
+            channel.is_dropping = True
+            self._logger.warning(f'#{channel_login} is not ready yet, its pending messages are dropped ({reason})')
+
+    def _count_dropped(
+            self,
+            reason: str,
+            count: int = 1
+    ) -> None:
+        self.dropped_by_reason[reason] = self.dropped_by_reason.get(reason, 0) + count
+        if self.metrics is not None:
+            self.metrics.count(Metrics.PENDING_DROPPED, reason, count)
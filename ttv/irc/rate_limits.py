@@ -0,0 +1,298 @@
+import asyncio
+import heapq
+from asyncio import Task, Future
+from itertools import count
+from time import monotonic
+from typing import Callable, Awaitable, Dict, List, Optional, Set, Tuple
+
+__all__ = ('TokenBucket', 'RateLimits', 'LaneStats', 'OutboundScheduler')
+
+
+class TokenBucket:
+    """
+    Allows `capacity` units per `period` seconds. Spent units are refilled continuously,
+    so a burst of `capacity` units is allowed after `period` seconds of silence.
+
+    Args:
+        capacity: `int`
+            max count of units
+        period: `float`
+            seconds to refill all the units
+    """
+
+    def __init__(
+            self,
+            capacity: int,
+            period: float
+    ) -> None:
+        self.capacity: int = capacity
+        self.period: float = period
+        self._tokens: float = capacity
+        self._updated_at: float = monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Count of units available now"""
+        self._refill()
+        return self._tokens
+
+    def delay(
+            self,
+            units: int = 1
+    ) -> float:
+        """Returns seconds until `units` units are available, 0 - if they are available now"""
+        if units > self.capacity:
+            raise ValueError(f'{units} units never fit into a bucket of {self.capacity}')
+        self._refill()
+        return max(0.0, (units - self._tokens) * self.period / self.capacity)
+
+    def take(
+            self,
+            units: int = 1
+    ) -> None:
+        """Spends `units` units, even if they aren't available (the bucket goes into debt then)"""
+        self._refill()
+        self._tokens -= units
+
+    async def acquire(
+            self,
+            units: int = 1
+    ) -> None:
+        """
+        |Coroutine|
+        Waits until `units` units are available and spends them.
+        """
+        while (delay := self.delay(units)) > 0:
+            await asyncio.sleep(delay)
+        self._tokens -= units
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.capacity / self.period)
+        self._updated_at = now
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.capacity}/{self.period}s, tokens={self.tokens:.2f})'
+
+
+class RateLimits:
+    """
+    Budgets of outgoing commands of one Twitch account. May be shared by several connections of the account.
+    Defaults are Twitch's limits for a regular account, see :meth:`verified` for a verified bot.
+
+    Args:
+        privmsg: Tuple[`int`, `float`]
+            messages per seconds into channels where the user is neither a moderator nor the broadcaster.
+            Default: 20 per 30.
+        moderator_privmsg: Tuple[`int`, `float`]
+            messages per seconds into channels where the user is a moderator or the broadcaster.
+            Default: 100 per 30.
+        joins: Tuple[`int`, `float`]
+            joined channels per seconds. Default: 20 per 10.
+        whispers: Tuple[Tuple[`int`, `float`], ...]
+            whispers per seconds, each of the limits must be met. Default: 3 per 1 and 100 per 60.
+    """
+
+    def __init__(
+            self,
+            *,
+            privmsg: Tuple[int, float] = (20, 30),
+            moderator_privmsg: Tuple[int, float] = (100, 30),
+            joins: Tuple[int, float] = (20, 10),
+            whispers: Tuple[Tuple[int, float], ...] = ((3, 1), (100, 60))
+    ) -> None:
+        self.privmsg: TokenBucket = TokenBucket(*privmsg)
+        self.moderator_privmsg: TokenBucket = TokenBucket(*moderator_privmsg)
+        self.joins: TokenBucket = TokenBucket(*joins)
+        self.whispers: Tuple[TokenBucket, ...] = tuple(TokenBucket(*limit) for limit in whispers)
+
+    @classmethod
+    def verified(cls) -> 'RateLimits':
+        """Limits of a verified bot"""
+        return cls(privmsg=(7500, 30), moderator_privmsg=(7500, 30), joins=(2000, 10))
+
+
+class LaneStats:
+    """
+    Metrics of a lane of :class:`OutboundScheduler`
+
+    Attributes:
+        queued: `int`
+            count of commands waiting to be sent
+        sent: `int`
+            count of sent commands
+        total_wait: `float`
+            seconds sent commands have waited in the lane, in total
+        max_wait: `float`
+            the longest wait of a sent command, in seconds
+    """
+    __slots__ = ('queued', 'sent', 'total_wait', 'max_wait')
+
+    def __init__(self) -> None:
+        self.queued: int = 0
+        self.sent: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.sent if self.sent else 0.0
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(queued={self.queued}, sent={self.sent}, '
+                f'avg_wait={self.avg_wait:.3f}, max_wait={self.max_wait:.3f})')
+
+
+class _Lane:
+    """Commands limited by the same buckets, ordered by priority and then by scheduling order"""
+    __slots__ = ('buckets', 'heap', 'stats', 'task')
+
+    def __init__(self, buckets: Tuple[TokenBucket, ...]) -> None:
+        self.buckets: Tuple[TokenBucket, ...] = buckets
+        self.heap: List[Tuple[int, int, str, int, float, Future]] = []
+        self.stats: LaneStats = LaneStats()
+        self.task: Optional[Task] = None
+
+
+class OutboundScheduler:
+    """
+    Sends commands of a connection within :class:`RateLimits`.
+
+    Each kind of commands has its own lane, so e.g. waiting JOINs don't delay messages.
+    Commands of a lane are sent in order of priority (:attr:`HIGH`, :attr:`NORMAL`, :attr:`LOW`),
+    commands of the same priority - in scheduling order. A lane's task exists only while the lane isn't empty.
+
+    Args:
+        send: Callable[[`str`], Awaitable]
+            sends a raw command
+        rate_limits: :class:`RateLimits`
+            budgets to spend
+    """
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+    PRIVMSG = 'PRIVMSG'
+    MODERATOR_PRIVMSG = 'MODERATOR_PRIVMSG'
+    JOIN = 'JOIN'
+    WHISPER = 'WHISPER'
+
+    def __init__(
+            self,
+            send: Callable[[str], Awaitable],
+            rate_limits: RateLimits
+    ) -> None:
+        self._send: Callable[[str], Awaitable] = send
+        self.rate_limits: RateLimits = rate_limits
+        self._lanes: Dict[str, _Lane] = {
+            self.PRIVMSG: _Lane((rate_limits.privmsg,)),
+            self.MODERATOR_PRIVMSG: _Lane((rate_limits.moderator_privmsg,)),
+            self.JOIN: _Lane((rate_limits.joins,)),
+            self.WHISPER: _Lane(rate_limits.whispers),
+        }
+        self._moderated_channels: Set[str] = set()
+        self._counter = count()  # keeps scheduling order within a priority
+
+    @property
+    def stats(self) -> Dict[str, LaneStats]:
+        """Metrics by lanes"""
+        return {name: lane.stats for name, lane in self._lanes.items()}
+
+    @property
+    def queued(self) -> int:
+        """Count of commands waiting in all the lanes"""
+        return sum(len(lane.heap) for lane in self._lanes.values())
+
+    def set_moderated(
+            self,
+            channel: str,
+            is_moderated: bool
+    ) -> None:
+        """Sets whether the user is a moderator or the broadcaster of the channel, it defines the channel's lane"""
+        if is_moderated:
+            self._moderated_channels.add(channel)
+        else:
+            self._moderated_channels.discard(channel)
+
+    def get_msg_lane(
+            self,
+            channel: str
+    ) -> str:
+        return self.MODERATOR_PRIVMSG if channel in self._moderated_channels else self.PRIVMSG
+
+    @property
+    def max_joins(self) -> int:
+        """Max count of channels in one JOIN"""
+        return self.rate_limits.joins.capacity
+
+    async def schedule(
+            self,
+            lane_name: str,
+            raw_command: str,
+            priority: int = NORMAL,
+            *,
+            units: int = 1
+    ) -> None:
+        """
+        |Coroutine|
+        Puts the command into the lane, waits until it's sent.
+
+        Args:
+            lane_name: `str`
+                one of :attr:`PRIVMSG`, :attr:`MODERATOR_PRIVMSG`, :attr:`JOIN`, :attr:`WHISPER`
+            raw_command: `str`
+                command to send
+            priority: `int`
+                one of :attr:`HIGH`, :attr:`NORMAL`, :attr:`LOW`. Default: :attr:`NORMAL`.
+            units: `int`
+                units of the lane's buckets the command spends, e.g. count of channels in a JOIN. Default: 1.
+        """
+        lane = self._lanes[lane_name]
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.heap, (priority, next(self._counter), raw_command, units, monotonic(), future))
+        lane.stats.queued += 1
+        if lane.task is None:
+            lane.task = asyncio.create_task(self._drain(lane))
+        await future
+
+    async def close(self) -> None:
+        """Cancels waiting commands"""
+        for lane in self._lanes.values():
+            if lane.task is not None:
+                lane.task.cancel()
+            for *_, future in lane.heap:
+                future.cancel()
+            lane.heap.clear()
+            lane.stats.queued = 0
+
+    async def _drain(
+            self,
+            lane: _Lane
+    ) -> None:
+        try:
+            while lane.heap:
+                _, _, raw_command, units, queued_at, future = lane.heap[0]
+                # the head is peeked again after waiting, a command of a higher priority may have come meanwhile
+                if (delay := max(bucket.delay(units) for bucket in lane.buckets)) > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                heapq.heappop(lane.heap)
+                lane.stats.queued -= 1
+                if future.cancelled():  # the caller doesn't wait anymore
+                    continue
+                for bucket in lane.buckets:
+                    bucket.take(units)
+                try:
+                    await self._send(raw_command)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(None)
+                wait = monotonic() - queued_at
+                lane.stats.sent += 1
+                lane.stats.total_wait += wait
+                lane.stats.max_wait = max(lane.stats.max_wait, wait)
+        finally:
+            lane.task = None
@@ -0,0 +1,68 @@
+import gzip
+import struct
+from time import monotonic
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+__all__ = ('FrameRecorder', 'read_frames')
+
+_HEADER = struct.Struct('<dI')  # seconds since the first frame, length of the encoded frame
+
+
+class FrameRecorder:
+    """
+    Writes raw received frames with their receive time into a gzip-compressed file, to replay them later.
+    Is set to a connection by :meth:`IRCClient.set_recorder`, the file is read by :func:`read_frames`.
+
+    Args:
+        path: `str`
+            path of the recording, an existing file is overwritten
+
+    Examples:
+        >>> with FrameRecorder('traffic.rec.gz') as recorder:
+        >>>     irc_conn.set_recorder(recorder)
+        >>>     async for irc_msgs in irc_conn.iter_batches():
+        >>>         ...
+    """
+
+    def __init__(
+            self,
+            path: str
+    ) -> None:
+        self.path: str = path
+        self.frames: int = 0
+        self._file: BinaryIO = gzip.open(path, 'wb')
+        self._started_at: Optional[float] = None
+
+    def record(
+            self,
+            frame: str,
+            received_at: Optional[float] = None
+    ) -> None:
+        """Writes the frame, `received_at` is :func:`time.monotonic` time it's received at. Default: now."""
+        received_at = monotonic() if received_at is None else received_at
+        if self._started_at is None:
+            self._started_at = received_at
+        data = frame.encode()
+        self._file.write(_HEADER.pack(received_at - self._started_at, len(data)))
+        self._file.write(data)
+        self.frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path!r}, frames={self.frames})'
+
+
+def read_frames(path: str) -> Iterator[Tuple[float, str]]:
+    """Yields (seconds since the first frame, frame) of the recording written by :class:`FrameRecorder`"""
+    with gzip.open(path, 'rb') as file:
+        while header := file.read(_HEADER.size):
+            offset, length = _HEADER.unpack(header)
+            yield offset, file.read(length).decode()
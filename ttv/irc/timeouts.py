@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from asyncio import TimerHandle
+from typing import Callable, Dict, Hashable, Optional
+
+__all__ = ('TimeoutQueue',)
+
+
+class TimeoutQueue:
+    """
+    Calls `callback(key)` when `timeout` seconds pass after the key is added, unless the key is removed before.
+
+    All the keys share one timer of the loop. Since the timeout is the same for every key, keys expire
+    in order of adding, so the queue is just an ordered dict: adding, removing and expiring a key are O(1).
+    The timer is set to the earliest deadline, a removed key doesn't reset it - the timer finds the next
+    deadline when it fires.
+
+    Args:
+        timeout: `float`
+            seconds a key waits until it expires
+        callback: Callable[[Hashable], None]
+            is called with an expired key
+
+    Examples:
+        >>> timeouts = TimeoutQueue(5, lambda login: print(f'{login} is expired'))
+        >>> timeouts.add('target')
+        >>> timeouts.remove('target')  # is removed in time, nothing is printed
+    """
+
+    def __init__(
+            self,
+            timeout: float,
+            callback: Callable[[Hashable], None]
+    ) -> None:
+        self.timeout: float = timeout
+        self._callback: Callable[[Hashable], None] = callback
+        self._deadlines: Dict[Hashable, float] = {}  # key: deadline, ordered by deadlines
+        self._timer: Optional[TimerHandle] = None
+        self._logger = logging.getLogger(__name__)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def add(
+            self,
+            key: Hashable
+    ) -> None:
+        """Adds the key, an already added key is restarted"""
+        self._deadlines.pop(key, None)  # a restarted key goes to the end
+        loop = asyncio.get_running_loop()
+        self._deadlines[key] = deadline = loop.time() + self.timeout
+        if self._timer is None:
+            self._timer = loop.call_at(deadline, self._expire)
+
+    def remove(
+            self,
+            key: Hashable
+    ) -> bool:
+        """Removes the key, returns False if it isn't added or is already expired"""
+        if self._deadlines.pop(key, None) is None:
+            return False
+        if not self._deadlines:
+            self._cancel_timer()
+        return True
+
+    def clear(self) -> None:
+        """Removes all the keys"""
+        self._deadlines.clear()
+        self._cancel_timer()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expire(self) -> None:
+        # the loop may call the timer a bit before its time, keys due by then are expired too
+        now = max(asyncio.get_running_loop().time(), self._timer.when())
+        self._timer = None
+        expired = []
+        for key, deadline in self._deadlines.items():
+            if deadline > now:
+                break
+            expired.append(key)
+        for key in expired:
+            del self._deadlines[key]
+        if self._deadlines:
+            self._timer = asyncio.get_running_loop().call_at(next(iter(self._deadlines.values())), self._expire)
+        for key in expired:
+            try:
+                self._callback(key)
+            except Exception:  # one broken callback must not break the others
+                self._logger.exception(f'Exception in timeout callback of {key}')
@@ -1,6 +1,6 @@
 from abc import ABC
-from functools import cached_property
 
+from ..utils import USE_SLOTS, slotted_cached_property
 from .utils import parse_raw_badges
 from .irc_messages import TwitchIRCMsg
 
@@ -11,6 +11,8 @@ __all__ = ('BaseState', 'GlobalState', 'LocalState')
 
 class BaseState(ABC):
     """Base class for user states and users"""
+    if USE_SLOTS:
+        __slots__ = ('id', 'login', 'display_name', 'color', '_raw_badges', '_badges')
 
     def __init__(self, irc_msg: TwitchIRCMsg):
         self.id: str = irc_msg.get('user-id')
@@ -19,7 +21,7 @@ class BaseState(ABC):
         self.color: str = irc_msg.get('color')
         self._raw_badges = irc_msg.get('badges', '')
 
-    @cached_property
+    @slotted_cached_property
     def badges(self) -> Dict[str, str]:
         return parse_raw_badges(self._raw_badges)
 
@@ -40,12 +42,15 @@ class BaseState(ABC):
 
 class BaseStateExt(BaseState, ABC):
     """Extension class for :class:`BaseState` adds emote_sets and badge_info attrs"""
+    if USE_SLOTS:
+        __slots__ = ('emote_sets', '_raw_badge_info', '_badge_info')
+
     def __init__(self, irc_msg: TwitchIRCMsg):
         super().__init__(irc_msg)
         self.emote_sets: Tuple[str] = tuple(irc_msg.get('emote-sets', '').split(','))
         self._raw_badge_info = irc_msg.get('badge-info', '')
 
-    @cached_property
+    @slotted_cached_property
     def badge_info(self) -> Dict[str, str]:
         return parse_raw_badges(self._raw_badge_info)
 
@@ -64,10 +69,12 @@ class BaseStateExt(BaseState, ABC):
 
 class GlobalState(BaseStateExt):
     """Class represents global state of a twitch-user"""
+    __slots__ = ()
 
 
 class LocalState(BaseStateExt):
     """Class represents local state of a user in a :class:`Channel`"""
+    __slots__ = ()
 
     @property
     def is_broadcaster(self) -> bool:
@@ -1,9 +1,11 @@
 from abc import ABC
 from typing import Callable, Coroutine
 
+from ..utils import USE_SLOTS
 from .channel import Channel
 from .irc_connections import TTVIRCClient
 from .irc_messages import TwitchIRCMsg
+from .rate_limits import OutboundScheduler
 from .user_states import BaseState, LocalState, GlobalState
 
 __all__ = ('BaseUser', 'ChannelUser', 'GlobalUser', 'ParentMessageUser')
@@ -13,6 +15,8 @@ SendWhisperCallable = Callable[[str, str], Coroutine]
 
 class BaseUser(BaseState, ABC):
     """TODO"""
+    __slots__ = ()  # `_irc_conn` is declared by subclasses to not conflict with :class:`LocalState`'s layout
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -30,6 +34,9 @@ class BaseUser(BaseState, ABC):
 
 class ChannelUser(BaseUser, LocalState):
     """TODO"""
+    if USE_SLOTS:
+        __slots__ = ('_irc_conn', 'channel')
+
     def __init__(
             self, 
             irc_msg: TwitchIRCMsg,
@@ -40,16 +47,16 @@ class ChannelUser(BaseUser, LocalState):
         self.channel: Channel = channel
 
     async def ban(self, reason: str = ''):
-        await self.channel.send(f'/ban {self.login} {reason}')
+        await self.channel.send(f'/ban {self.login} {reason}', priority=OutboundScheduler.HIGH)
 
     async def unban(self):
-        await self.channel.send(f'/unban {self.login}')
+        await self.channel.send(f'/unban {self.login}', priority=OutboundScheduler.HIGH)
 
     async def timeout(self, seconds: int):
-        await self.channel.send(f'/timeout {self.login} {seconds}')
+        await self.channel.send(f'/timeout {self.login} {seconds}', priority=OutboundScheduler.HIGH)
 
     async def untimeout(self):
-        await self.channel.send(f'/untimeout  {self.login}')
+        await self.channel.send(f'/untimeout  {self.login}', priority=OutboundScheduler.HIGH)
 
     async def vip(self):
         await self.channel.send(f'/vip {self.login}')
@@ -66,10 +73,15 @@ class ChannelUser(BaseUser, LocalState):
 
 class GlobalUser(BaseUser, GlobalState):
     """TODO"""
+    if USE_SLOTS:
+        __slots__ = ('_irc_conn',)
 
 
 class ParentMessageUser:
     """TODO"""
+    if USE_SLOTS:
+        __slots__ = ('id', 'login', 'display_name', '_irc_conn')
+
     def __init__(
             self,
             irc_msg: TwitchIRCMsg,
@@ -1,3 +1,4 @@
+import re
 from typing import Dict, Tuple, List, Iterable
 from .flags import Flag
 from .emotes import Emote
@@ -9,9 +10,13 @@ __all__ = (
     'parse_raw_flags',
     'parse_raw_badges',
     'escape_tag_value',
-    'unescape_tag_value'
+    'unescape_tag_value',
+    'split_channels',
+    'MAX_LINE_LENGTH'
 )
 
+MAX_LINE_LENGTH = 512  # including '\r\n'
+
 
 def parse_raw_emotes(
         raw_emotes: str,
@@ -82,7 +87,45 @@ def escape_tag_value(value: str):
 
 def unescape_tag_value(value: str) -> str:
     r"""
-    Unescapes escaped value: '\s' -> ' ', '\:' -> ';', '\\' -> '\'.
-    '\r' and '\n' (CR and LF) don't need to be unescaped.
+    Unescapes escaped value in a single pass: '\s' -> ' ', '\:' -> ';', '\\' -> '\', '\r' -> CR, '\n' -> LF.
+    A backslash before any other symbol is dropped, so is a trailing backslash.
+    """
+    if '\\' not in value:
+        return value
+    return _ESCAPED_SYMBOL_RE.sub(_unescape_symbol, value)
+
+
+_ESCAPED_SYMBOL_RE = re.compile(r'\\(.?)', re.DOTALL)
+_UNESCAPED_SYMBOLS: Dict[str, str] = {':': ';', 's': ' ', '\\': '\\', 'r': '\r', 'n': '\n'}
+
+
+def _unescape_symbol(match: re.Match) -> str:
+    symbol = match[1]
+    return _UNESCAPED_SYMBOLS.get(symbol, symbol)
+
+
+def split_channels(
+        command: str,
+        channels: Iterable[str],
+        *,
+        max_channels: int = None,
+        max_length: int = MAX_LINE_LENGTH
+) -> List[List[str]]:
+    """
+    Splits channels into chunks, each chunk fits into one `{command} #{channel},#{channel}...` line
+    of `max_length` (including '\r\n') and has no more than `max_channels` channels.
     """
-    return value.replace(r'\:', ';').replace(r'\s', ' ').replace('\\\\', '\\')
+    chunks = []
+    chunk = []
+    length = len(command) + 2  # ' ', '\r\n' and no ',' after the last channel
+    for channel in channels:
+        channel_length = len(channel) + 2  # '#' and ','
+        if chunk and (length + channel_length > max_length or len(chunk) == max_channels):
+            chunks.append(chunk)
+            chunk = []
+            length = len(command) + 2
+        chunk.append(channel)
+        length += channel_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
@@ -1,17 +1,64 @@
 import hmac
+import os
 from datetime import datetime
 from hashlib import sha256
 
-from typing import Iterable
+from typing import Iterable, Callable, Any
 
 
 __all__ = (
+    'USE_SLOTS',
+    'slotted_cached_property',
     'calc_sha256',
     'str_to_datetime',
     'normalize_ms',
     'remove_not_valid_postfix'
 )
 
+# Messages, users, states, emotes, flags and events of `ttv.irc` declare `__slots__` only if `TTV_USE_SLOTS=1`
+# is set before `ttv` is imported. Slotted objects take less memory, but have no `__dict__`: `vars()` fails on them
+# and arbitrary attributes (e.g. `message.handled = True`) can't be attached to them.
+USE_SLOTS: bool = os.getenv('TTV_USE_SLOTS') == '1'
+
+
+class slotted_cached_property:
+    """
+    Same as :func:`functools.cached_property` but for classes with `__slots__`.
+    The value is cached in the slot with the name of the property prefixed by '_', the slot must be declared
+    (or the object must have a `__dict__`).
+
+    Examples:
+        >>> class Message:
+        ...     __slots__ = ('_raw_badges', '_badges')
+        ...
+        ...     @slotted_cached_property
+        ...     def badges(self):
+        ...         return self._raw_badges.split(',')
+    """
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.slot_name: str = '_' + func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name: str):
+        self.slot_name = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot_name)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot_name, value)
+            return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot_name, value)
+
+    def __delete__(self, instance):
+        delattr(instance, self.slot_name)
+
 
 def calc_sha256(
         text: str,